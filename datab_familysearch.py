@@ -1,6 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import weakref
+
+_COLUMNS = (
+    "p_handle, fsid, is_root, status_ts, confirmed_ts, "
+    "gramps_modified_ts, fs_modified_ts, essential_conflict, conflict"
+)
+
+# Rows of statistics_grampsfs_sync per database, see preload_status()
+_preloaded: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
 
 def create_status_schema(db) -> None:
     # Ensure the 'statistics_grampsfs_sync' table exists 
@@ -20,6 +30,31 @@ def create_status_schema(db) -> None:
         )
 
 
+def preload_status(db) -> int:
+    """
+    Read the whole status table into memory; FSStatusDB.get() then answers
+    from it and commit() keeps it current. Returns the number of rows.
+    """
+    db.dbapi.execute("SELECT " + _COLUMNS + " FROM statistics_grampsfs_sync")
+    rows = {row[0]: tuple(row) for row in db.dbapi.fetchall()}
+    _preloaded[db] = rows
+    return len(rows)
+
+
+def status_ts(db, p_handle: str) -> int | None:
+    """status_ts of one person (None if never compared)."""
+    rows = _preloaded.get(db)
+    if rows is not None:
+        row = rows.get(p_handle)
+        return row[3] if row else None
+    db.dbapi.execute(
+        "SELECT status_ts FROM statistics_grampsfs_sync WHERE p_handle=?",
+        [p_handle],
+    )
+    row = db.dbapi.fetchone()
+    return row[0] if row else None
+
+
 class FSStatusDB:
     """
     Row object for statistics_grampsfs_sync
@@ -90,6 +125,9 @@ class FSStatusDB:
                 ") VALUES (?,?,?,?,?,?,?,?,?)"
             )
             self.db.dbapi.execute(sql, [self.p_handle] + vals)
+        rows = _preloaded.get(self.db)
+        if rows is not None:
+            rows[self.p_handle] = tuple([self.p_handle] + vals)
 
     def get(self, person_handle: str | None = None) -> None:
         """
@@ -101,13 +139,15 @@ class FSStatusDB:
             print("datab_familysearch.FSStatusDB.get: missing person_handle")
             return
 
-        self.db.dbapi.execute(
-            "SELECT p_handle, fsid, is_root, status_ts, confirmed_ts, "
-            "gramps_modified_ts, fs_modified_ts, essential_conflict, conflict "
-            "FROM statistics_grampsfs_sync WHERE p_handle=?",
-            [person_handle],
-        )
-        row = self.db.dbapi.fetchone()
+        rows = _preloaded.get(self.db)
+        if rows is not None:
+            row = rows.get(person_handle)
+        else:
+            self.db.dbapi.execute(
+                "SELECT " + _COLUMNS + " FROM statistics_grampsfs_sync WHERE p_handle=?",
+                [person_handle],
+            )
+            row = self.db.dbapi.fetchone()
         if row:
             (
                 self.p_handle,
@@ -128,4 +168,4 @@ class FSStatusDB:
             # others remain defaults
 
 
-__all__ = ["create_status_schema", "FSStatusDB"]
+__all__ = ["create_status_schema", "preload_status", "status_ts", "FSStatusDB"]
@@ -418,17 +418,17 @@ def compare_fs_to_gramps(fs_person, gr_person: Person, db, model=None, dupdoc=Fa
     ):
         path = "/platform/tree/persons/" + fs_person.id
         r = tree._fs_session.head_url(path)
-        while r.status_code == 301 and "X-Entity-Forwarded-Id" in r.headers:
+        while r and r.status_code == 301 and "X-Entity-Forwarded-Id" in r.headers:
             fsid = r.headers["X-Entity-Forwarded-Id"]
             fs_utilities.link_gramps_fs_id(db, gr_person, fsid)
             fs_person.id = fsid
             path = "/platform/tree/persons/" + fs_person.id
             r = tree._fs_session.head_url(path)
-        if "Last-Modified" in r.headers:
+        if r and "Last-Modified" in r.headers:
             fs_person._last_modified = int(
                 time.mktime(email.utils.parsedate(r.headers["Last-Modified"]))
             )
-        if "Etag" in r.headers:
+        if r and "Etag" in r.headers:
             fs_person._etag = r.headers["Etag"]
 
     if not hasattr(fs_person, "_last_modified"):
@@ -455,7 +455,7 @@ def compare_fs_to_gramps(fs_person, gr_person: Person, db, model=None, dupdoc=Fa
         r = tree._fs_session.get_url(path, {"Accept": "application/json"})
         if r and r.status_code == 200:
             try:
-                js = r.json()
+                js = tree._fs_session.response_json(r)
                 if (
                     js
                     and "data" in js
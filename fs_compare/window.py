@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import email.utils
 import time
@@ -13,12 +14,18 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.db import DbTxn
 
 import tree
+import gedcomx_v1
+from gedcomx_v1 import fs_scheduler
+from gedcomx_v1.fs_async import run_sync
 import FSG_Sync
 import datab_familysearch
 import fs_utilities
 
 logger = logging.getLogger(__name__)
 
+# Persons loaded concurrently ahead of the compare loop
+PREFETCH_CHUNK = 64
+
 try:
     _trans = glocale.get_addon_translator(__file__)
 except ValueError:
@@ -39,6 +46,11 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
         return _trans.gettext("Options")
 
     def run(self):
+        # Batch class: requests from the gramplet stay ahead of this run
+        with fs_scheduler.priority(fs_scheduler.BATCH):
+            self._run()
+
+    def _run(self):
         logger.info("FSCompareWindow.run: starting")
 
         # Ensure FamilySearch session
@@ -46,6 +58,8 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
             WarningDialog(_(u"Not connected to FamilySearch"))
             return
 
+        tree._fs_session.reset_stats()
+
         progress = ProgressMeter(
             _(u"FamilySearch: Compare"),
             _trans.gettext("Starting"),
@@ -87,14 +101,10 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
             fsid = fs_utilities.get_fsftid(person)
             if fsid == "":
                 continue
-            self.db.dbapi.execute(
-                "select status_ts from statistics_grampsfs_sync where p_handle=?",
-                [handle],
-            )
-            row = self.db.dbapi.fetchone()
-            if row and row[0]:
-                if force or row[0] < max_date:
-                    ordered.append([row[0], handle, fsid])
+            ts = datab_familysearch.status_ts(self.db, handle)
+            if ts:
+                if force or ts < max_date:
+                    ordered.append([ts, handle, fsid])
             else:
                 ordered.append([0, handle, fsid])
 
@@ -107,6 +117,25 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
         progress.set_pass(_(u"Processing list (2/2)"), len(ordered))
         logger.debug("Sorted list size: %d", len(ordered))
 
+        def _load_cached(fsid_local):
+            # Deserialize the CacheMixin disk copy of a person, if any
+            cache = getattr(FSG_Sync.FSG_Sync, "_cache", None)
+            disk = cache.read_json(fsid_local) if cache else None
+            if not disk:
+                return None
+            fs_tree = FSG_Sync.FSG_Sync.fs_Tree
+            try:
+                gedcomx_v1.deserialize_json(fs_tree, disk[0])
+            except Exception as e:
+                logger.warning("FS cache deserialize failed for %s: %s", fsid_local, e)
+                return None
+            p = gedcomx_v1.Person._index.get(fsid_local)
+            if p:
+                p._etag = disk[1]
+                p._last_modified = disk[2]
+                fs_tree._persons[fsid_local] = p
+            return p
+
         def _prime_fetch(pair):
             # Ensure FS person header metadata (Last-Modified/Etag) and add to cache
             fsid_local = pair[2]
@@ -117,6 +146,14 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
             if fsid_local in FSG_Sync.FSG_Sync.fs_Tree._persons:
                 fs_person = FSG_Sync.FSG_Sync.fs_Tree._persons.get(fsid_local)
 
+            if not fs_person and tree._fs_session.offline:
+                # FamilySearch unreachable: compare against the disk copy
+                fs_person = _load_cached(fsid_local)
+            if fs_person:
+                # already loaded (prefetch, disk copy): keep its validators
+                date_mod = getattr(fs_person, "_last_modified", None)
+                etag = getattr(fs_person, "_etag", None)
+
             if (
                 not fs_person
                 or not hasattr(fs_person, "_last_modified")
@@ -136,14 +173,30 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
                     )
                 if r and "Etag" in r.headers:
                     etag = r.headers["Etag"]
-                FSG_Sync.FSG_Sync.fs_Tree.add_persono(fsid_local)
+                FSG_Sync.FSG_Sync.fs_Tree.add_person(fsid_local)
                 fs_person = FSG_Sync.FSG_Sync.fs_Tree._persons.get(fsid_local)
+                if not fs_person and r is None:
+                    fs_person = _load_cached(fsid_local)
 
             if not fs_person:
                 logger.warning(_(u"FS ID %s not found"), fsid_local)
                 return
-            fs_person._datemod = date_mod
-            fs_person._etag = etag
+            # the HEAD may have run without returning both validators
+            fs_person._datemod = date_mod or getattr(fs_person, "_last_modified", None)
+            fs_person._etag = etag or getattr(fs_person, "_etag", None)
+
+        async def _load_all(fsids):
+            fs_tree = FSG_Sync.FSG_Sync.fs_Tree
+            await asyncio.gather(*(fs_tree.add_person_async(f) for f in fsids))
+
+        def _prefetch(chunk):
+            # Load the coming persons concurrently (GETs carry Etag and
+            # Last-Modified), so _prime_fetch finds them without a HEAD each
+            if tree._fs_session.offline:
+                return
+            fsids = [p[2] for p in chunk if p[2] not in FSG_Sync.FSG_Sync.fs_Tree._persons]
+            if fsids:
+                run_sync(_load_all(fsids))
 
         def _compare_pair(pair):
             person = self.db.get_person_from_handle(pair[1])
@@ -159,15 +212,18 @@ class FSCompareWindow(PluginWindows.ToolManagedWindowBatch):
             else:
                 logger.warning("FS ID %s not found in cache", fsid_local)
 
-        for pair in ordered:
+        for n, pair in enumerate(ordered):
             if progress.get_cancelled():
                 self._cleanup(progress)
                 return
+            if n % PREFETCH_CHUNK == 0:
+                _prefetch(ordered[n : n + PREFETCH_CHUNK])
             progress.step()
             _prime_fetch(pair)
             _compare_pair(pair)
 
         self._cleanup(progress)
+        FSG_Sync.FSG_Sync.dump_session_stats("compare")
         logger.info("FSCompareWindow.run: done")
 
     def _cleanup(self, progress):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 from urllib.parse import unquote
 
 from gramps.gen.lib import Event, Attribute
@@ -10,12 +12,14 @@ from .notes import add_note
 from fs_utilities import fs_date_to_gramps_date, get_fsftid
 from constants import GEDCOMX_TO_GRAMPS_FACTS
 
+logger = logging.getLogger(__name__)
+
 
 def update_event(db, txn, fs_fact, gr_event):
     # Update a Gramps Event from a FS fact (place/date/description). Commits event
     if fs_fact.place:
         if not hasattr(fs_fact.place, "normalized"):
-            print("place not normalized: " + fs_fact.place.original)
+            logger.debug("place not normalized: %s", fs_fact.place.original)
         gr_place = get_place_by_id(db, fs_fact.place)
         if gr_place:
             gr_handle = gr_place.handle
@@ -44,7 +48,7 @@ def add_event(db, txn, fs_fact, obj):
     place_handle = None
     if fs_fact.place:
         if not hasattr(fs_fact.place, "normalized"):
-            print("place not normalized: " + fs_fact.place.original)
+            logger.debug("place not normalized: %s", fs_fact.place.original)
         gr_place = get_place_by_id(db, fs_fact.place)
         if gr_place:
             place_handle = gr_place.handle
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 from gramps.gen.db import DbTxn
 from gramps.gen.lib import (
     Person,
@@ -21,6 +23,7 @@ import FSG_Sync
 import gedcomx_v1
 
 from fs_utilities import get_fsftid
+from constants import MAX_PERSONS
 from .names import add_names
 from .events import add_event
 from .notes import add_note
@@ -29,6 +32,8 @@ from .places import add_place
 
 import fs_compare
 
+logger = logging.getLogger(__name__)
+
 
 class FSToGrampsImporter:
     """
@@ -41,6 +46,8 @@ class FSToGrampsImporter:
         include_spouses (bool)    — include spouses (default False)
         include_notes (bool)      — include notes
         include_sources (bool)    — include sources
+        use_pedigree (bool)       — crawl with the ancestry/descendancy endpoints
+        max_persons (int)         — download budget (0 = unlimited)
         verbosity (int 0..3)      — log verbosity
         refresh_signals (bool)    — disable/enable db signals during import
     """
@@ -55,6 +62,8 @@ class FSToGrampsImporter:
         self.include_spouses = False  # never auto-import spouses
         self.include_notes = False
         self.include_sources = False
+        self.use_pedigree = True
+        self.max_persons = MAX_PERSONS
         self.verbosity = 0
         self.added_person = False
         self.refresh_signals = True
@@ -224,7 +233,7 @@ class FSToGrampsImporter:
         db.commit_person(gr_person, txn)
 
     def import_tree(self, caller, FSFTID):
-        print("import ID :" + FSFTID)
+        logger.info("import ID: %s", FSFTID)
         self.FS_ID = FSFTID
         self.dbstate = caller.dbstate
 
@@ -250,18 +259,20 @@ class FSToGrampsImporter:
                 caller.uistate.set_active(active_handle, "Person")
             return
 
+        tree._fs_session.reset_stats()
+
         # Build FS→Gramps index if needed
         if not fs_utilities.FS_INDEX_PEOPLE:
             fs_utilities.build_fs_index(caller, progress, 11)
 
-        print("download")
+        logger.debug("download")
         if self.fs_TreeImp:
             del self.fs_TreeImp
         self.fs_TreeImp = tree.Tree()
 
         # 3/11 — person
         progress.set_pass(_("Downloading persons… (3/11)"), mode=ProgressMeter.MODE_ACTIVITY)
-        print(_("Downloading person…"))
+        logger.info(_("Downloading person…"))
         if self.FS_ID:
             self.fs_TreeImp.add_persons([self.FS_ID])
         else:
@@ -271,36 +282,36 @@ class FSToGrampsImporter:
                 caller.uistate.set_active(active_handle, "Person")
             return
 
-        # 4/11 — ancestors (limit by self.asc)
-        progress.set_pass(_("Downloading ancestors… (4/11)"), self.asc)
-        todo = set(self.fs_TreeImp._persons.keys())
-        done = set()
-        for i in range(self.asc):
-            progress.step()
-            if not todo:
-                break
-            done |= todo
-            print(_("Downloading %d generations of ancestors…") % (i + 1))
-            todo = self.fs_TreeImp.add_parents(todo) - done
-
-        # 5/11 — descendants (limit by self.desc)
-        progress.set_pass(_("Downloading descendants… (5/11)"), self.desc)
-        todo = set(self.fs_TreeImp._persons.keys())
-        done = set()
-        for i in range(self.desc):
-            progress.step()
-            if not todo:
-                break
-            done |= todo
-            print(_("Downloading %d generations of descendants…") % (i + 1))
-            todo = self.fs_TreeImp.add_children(todo) - done
+        # 4/11 + 5/11 — ancestors (self.asc) and descendants (self.desc)
+        roots = set(self.fs_TreeImp._persons.keys())
+        if self.use_pedigree:
+            progress.set_pass(
+                _("Downloading ancestors… (4/11)"), mode=ProgressMeter.MODE_ACTIVITY
+            )
+            logger.info(_("Downloading %d generations of ancestors…"), self.asc)
+            self.fs_TreeImp.add_ancestry(roots, self.asc, self.max_persons)
+
+            progress.set_pass(
+                _("Downloading descendants… (5/11)"), mode=ProgressMeter.MODE_ACTIVITY
+            )
+            logger.info(_("Downloading %d generations of descendants…"), self.desc)
+            self.fs_TreeImp.add_descendancy(
+                set(self.fs_TreeImp._persons.keys()), self.desc, self.max_persons
+            )
+        else:
+            progress.set_pass(
+                _("Downloading ancestors and descendants… (4-5/11)"),
+                mode=ProgressMeter.MODE_ACTIVITY,
+            )
+            logger.info(_("Downloading ancestors and descendants…"))
+            self.fs_TreeImp.crawl(roots, self.asc, self.desc, self.max_persons)
 
         # 6/11 — spouses (only if explicitly requested)
         if self.include_spouses:
             progress.set_pass(
                 _("Downloading spouses… (6/11)"), mode=ProgressMeter.MODE_ACTIVITY
             )
-            print(_("Downloading spouses…"))
+            logger.info(_("Downloading spouses…"))
             todo = set(self.fs_TreeImp._persons.keys())
             self.fs_TreeImp.add_spouses(todo)
 
@@ -310,43 +321,29 @@ class FSToGrampsImporter:
                 _("Downloading notes… (7/11)"),
                 len(self.fs_TreeImp.persons) + len(self.fs_TreeImp.relationships),
             )
-            print(_("Downloading notes and sources…"))
+            logger.info(_("Downloading notes and sources…"))
+
+            # Lists are read page by page, so long ones never sit in memory whole
+            add_list = self.fs_TreeImp.add_list
 
             # Persons
-            for fs_person in self.fs_TreeImp.persons:
+            for fs_person in list(self.fs_TreeImp.persons):
                 progress.step()
-                data = tree._fs_session.get_jsonurl(
-                    f"/platform/tree/persons/{fs_person.id}/notes"
-                )
-                self._strip_unknowns(data)
-                gedcomx_v1.deserialize_json(self.fs_TreeImp, data)
-
-                data = tree._fs_session.get_jsonurl(
-                    f"/platform/tree/persons/{fs_person.id}/sources"
-                )
-                self._strip_unknowns(data)
-                gedcomx_v1.deserialize_json(self.fs_TreeImp, data)
-
-                data = tree._fs_session.get_jsonurl(
-                    f"/platform/tree/persons/{fs_person.id}/memories"
+                base = f"/platform/tree/persons/{fs_person.id}"
+                add_list(base + "/notes", prepare=self._strip_unknowns)
+                add_list(base + "/sources", prepare=self._strip_unknowns)
+                add_list(
+                    base + "/memories",
+                    tree.MEMORIES_PAGE_SIZE,
+                    prepare=self._strip_unknowns,
                 )
-                self._strip_unknowns(data)
-                gedcomx_v1.deserialize_json(self.fs_TreeImp, data)
 
             # Couple relationships
-            for fs_fam in self.fs_TreeImp.relationships:
+            for fs_fam in list(self.fs_TreeImp.relationships):
                 progress.step()
-                data = tree._fs_session.get_jsonurl(
-                    f"/platform/tree/couple-relationships/{fs_fam.id}/notes"
-                )
-                self._strip_unknowns(data)
-                gedcomx_v1.deserialize_json(self.fs_TreeImp, data)
-
-                data = tree._fs_session.get_jsonurl(
-                    f"/platform/tree/couple-relationships/{fs_fam.id}/sources"
-                )
-                self._strip_unknowns(data)
-                gedcomx_v1.deserialize_json(self.fs_TreeImp, data)
+                base = f"/platform/tree/couple-relationships/{fs_fam.id}"
+                add_list(base + "/notes", prepare=self._strip_unknowns)
+                add_list(base + "/sources", prepare=self._strip_unknowns)
 
             # Enrich all SourceDescriptions once, after all sources are loaded
             fetch_source_dates(self.fs_TreeImp)
@@ -358,7 +355,7 @@ class FSToGrampsImporter:
 
                 json.dump(res, f, indent=2)
 
-        print(_("Importing…"))
+        logger.info(_("Importing…"))
 
         self.added_person = False
         if caller.dbstate.db.transaction is not None:
@@ -371,14 +368,14 @@ class FSToGrampsImporter:
 
         # 8/11 — places
         progress.set_pass(_("Importing places… (8/11)"), len(self.fs_TreeImp.places))
-        print(_("Importing places…"))
+        logger.info(_("Importing places…"))
         for pl in self.fs_TreeImp.places:
             progress.step()
             add_place(caller.dbstate.db, self.txn, pl)
 
         # 9/11 — persons
         progress.set_pass(_("Importing persons… (9/11)"), len(self.fs_TreeImp.persons))
-        print(_("Importing persons…"))
+        logger.info(_("Importing persons…"))
         for fs_person in self.fs_TreeImp.persons:
             progress.step()
             self.add_person(caller.dbstate.db, self.txn, fs_person)
@@ -387,7 +384,7 @@ class FSToGrampsImporter:
         progress.set_pass(
             _("Importing families… (10/11)"), len(self.fs_TreeImp.relationships)
         )
-        print(_("Importing families…"))
+        logger.info(_("Importing families…"))
         for fs_fam in self.fs_TreeImp.relationships:
             progress.step()
             if fs_fam.type == "http://gedcomx.org/Couple":
@@ -397,7 +394,7 @@ class FSToGrampsImporter:
         progress.set_pass(
             _("Importing children… (11/11)"), len(self.fs_TreeImp.relationships)
         )
-        print(_("Importing children…"))
+        logger.info(_("Importing children…"))
         for fs_cpr in getattr(self.fs_TreeImp, "childAndParentsRelationships", []):
             progress.step()
             self.add_child(fs_cpr)
@@ -410,7 +407,8 @@ class FSToGrampsImporter:
             del self.txn
         self.txn = None
 
-        print("import done.")
+        logger.info("import done.")
+        FSG_Sync.FSG_Sync.dump_session_stats("import")
         caller.uistate.set_busy_cursor(False)
         progress.close()
 
@@ -439,12 +437,12 @@ class FSToGrampsImporter:
             else None
         )
         if child_h and (child_h == father_h or child_h == mother_h):
-            print(_("Skipping invalid relationship: child equals a parent"))
+            logger.warning(_("Skipping invalid relationship: child equals a parent"))
             return
 
         # Need at least one known parent locally
         if not (father_h or mother_h):
-            print(_("Possibly parentless family - Need at least one known parent locally"))
+            logger.warning(_("Possibly parentless family - Need at least one known parent locally"))
             return
 
         # Reuse or create the correct family (works with one- or two-parent)
@@ -488,7 +486,7 @@ class FSToGrampsImporter:
 
         # Reject impossible couple
         if father_h and mother_h and father_h == mother_h:
-            print(_("Skipping invalid couple: same person as both parents"))
+            logger.warning(_("Skipping invalid couple: same person as both parents"))
             return
 
         # Try to reuse an existing couple family
@@ -523,7 +521,7 @@ class FSToGrampsImporter:
                         break
 
         if not father_h and not mother_h:
-            print(_("Possible parentless family?"))
+            logger.warning(_("Possible parentless family?"))
             return
 
         # Ensure both sides are linked if family already exists
@@ -5,6 +5,7 @@ from gramps.gui.plug import MenuToolOptions
 
 from . import _
 import FSG_Sync
+from constants import MAX_PERSONS
 
 
 class FSImportOptions(MenuToolOptions):
@@ -28,6 +29,20 @@ class FSImportOptions(MenuToolOptions):
         self._gui_desc.set_help(_("Number of generations to fetch downwards"))
         menu.add_option(category, "gui_desc", self._gui_desc)
 
+        self._gui_pedigree = BooleanOption(
+            _("Use ancestry/descendancy endpoints"), True
+        )
+        self._gui_pedigree.set_help(
+            _("Fetch several generations per request instead of one generation at a time")
+        )
+        menu.add_option(category, "gui_pedigree", self._gui_pedigree)
+
+        self._gui_max_persons = NumberOption(
+            _("Maximum persons to download"), MAX_PERSONS, 0, 1000000
+        )
+        self._gui_max_persons.set_help(_("Stop the crawl at this many persons (0 = no limit)"))
+        menu.add_option(category, "gui_max_persons", self._gui_max_persons)
+
         self._gui_noreimport = BooleanOption(
             _("Do not re-import existing persons"), True
         )
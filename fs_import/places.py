@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 from gramps.gen.lib import Place, PlaceName, PlaceType, Url, UrlType, PlaceRef
 
 from . import _
@@ -10,6 +12,8 @@ from constants import GEDCOMX_TO_GRAMPS_PLACES
 
 import gedcomx_v1
 
+logger = logging.getLogger(__name__)
+
 
 def create_place(db, txn, fs_place, parent):
     # Create a Gramps Place from a FamilySearch PlaceDescription (fs_place),
@@ -108,7 +112,7 @@ def get_place_by_id(db, fs_place):
 
     # Build FSID map on first use
     if not fs_utilities.FS_INDEX_PLACES:
-        print(_("Building FSID list for places"))
+        logger.info(_("Building FSID list for places"))
         fs_utilities.FS_INDEX_PLACES = {}
         for handle in db.get_place_handles():
             place = db.get_place_from_handle(handle)
@@ -140,19 +144,19 @@ def add_place(db, txn, fs_place):
     if not getattr(fs_place, "id", None):
         return None
 
-    print("add_place:" + fs_place.id)
+    logger.debug("add_place: %s", fs_place.id)
     endpoint = f"/platform/places/description/{fs_place.id}"
     r = tree._fs_session.get_url(endpoint, {"Accept": "application/json,*/*"})
     if not (r and r.status_code == 200):
         if r:
-            print("WARNING: Status code:", r.status_code)
+            logger.warning("Status code %s from %s", r.status_code, endpoint)
         return None
 
     try:
-        data = r.json()
-    except Exception as e:
-        print(f"WARNING: corrupted file from {endpoint}, error: {e}")
-        print(r.content)
+        data = gedcomx_v1.FsSession.response_json(r)
+    except ValueError as e:
+        logger.warning("corrupted file from %s, error: %s", endpoint, e)
+        logger.debug("response body: %r", r.content)
         return None
 
     if "places" not in data:
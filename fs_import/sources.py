@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+
 from gramps.gen.lib import (
     Citation,
     Note,
@@ -23,10 +26,28 @@ import fs_utilities
 import tree
 
 import gedcomx_v1
+from gedcomx_v1.fs_async import run_sync
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_source_links(sds):
+    aio = tree._fs_session.aio
+    return await asyncio.gather(
+        *(
+            aio.get(
+                f"https://www.familysearch.org/service/tree/links/source/{sd.id}",
+                {"Accept": "application/json"},
+            )
+            for sd in sds
+        )
+    )
 
 
 def fetch_source_dates(fs_tree):
     # SourceDescriptions in fs_tree with event dates and collection info, using the /service/tree/links/source/{id} endpoint.
+    # The lookups run concurrently on the FS event loop (the session's adaptive limit sets the pace).
+    todo = []
     for sd in fs_tree.sourceDescriptions:
         if sd.id[:2] == "SD":
             continue
@@ -35,13 +56,14 @@ def fetch_source_dates(fs_tree):
         sd._date = None
         sd._collectionUri = None
         sd._collection = None
+        todo.append(sd)
+    if not todo:
+        return
 
-        r = tree._fs_session.get_url(
-            f"https://www.familysearch.org/service/tree/links/source/{sd.id}",
-            {"Accept": "application/json"},
-        )
-        if r and r.text:
-            data = r.json()
+    responses = run_sync(_fetch_source_links(todo))
+    for sd, r in zip(todo, responses):
+        if r and r != "error" and not gedcomx_v1.fs_json.is_blank(r.content):
+            data = gedcomx_v1.FsSession.response_json(r)
             e = data.get("event")
             if e:
                 str_formal = e.get("eventDate")
@@ -116,7 +138,7 @@ class IntermediateSource:
             fs_citation_value = next(iter(fs_sd.citations)).value
 
         if fs_sd.resourceType not in ("FSREADONLY", "LEGACY", "DEFAULT", "IGI"):
-            print("Unknown resourceType !!! :", str(fs_sd.resourceType))
+            logger.warning("Unknown resourceType: %s", fs_sd.resourceType)
         if fs_sd.resourceType == "LEGACY":
             self.source_title = "Legacy NFS Sources"
 
@@ -309,13 +331,13 @@ class IntermediateSource:
                 if attr.get_type() == "_FSFTID" and attr.get_value() == self.id:
                     found = True
                     citation = c
-                    print(" citation found _FSFTID=" + self.id)
+                    logger.debug("citation found _FSFTID=%s", self.id)
                     break
             if found:
                 break
 
         if not citation:
-            print(" citation not found _FSFTID=" + self.id)
+            logger.debug("citation not found _FSFTID=%s", self.id)
             citation = Citation()
             attr = SrcAttribute()
             attr.set_type("_FSFTID")
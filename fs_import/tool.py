@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from gramps.gui.plug import PluginWindows
 
+from gedcomx_v1 import fs_scheduler
+
 from . import _
 from .options import FSImportOptions
 from .importer import FSToGrampsImporter
@@ -33,7 +35,9 @@ class FSImportTool(PluginWindows.ToolManagedWindowBatch):
         self._apply_menu_options(importer)
 
         active_handle = self.uistate.get_active("Person")
-        importer.import_tree(self, self.FS_ID)
+        # Batch class: requests from the gramplet stay ahead of the import
+        with fs_scheduler.priority(fs_scheduler.BATCH):
+            importer.import_tree(self, self.FS_ID)
         self.window.hide()
         if active_handle:
             self.uistate.set_active(active_handle, "Person")
@@ -53,5 +57,7 @@ class FSImportTool(PluginWindows.ToolManagedWindowBatch):
         importer.include_sources = menu.get_option_by_name(
             "gui_include_sources"
         ).get_value()
+        importer.use_pedigree = menu.get_option_by_name("gui_pedigree").get_value()
+        importer.max_persons = menu.get_option_by_name("gui_max_persons").get_value()
         importer.noreimport = menu.get_option_by_name("gui_noreimport").get_value()
         importer.verbosity = menu.get_option_by_name("gui_verbosity").get_value()
@@ -4,6 +4,8 @@ from __future__ import annotations
 from gramps.gen.config import config
 from gramps.gen.plug import Gramplet
 
+from gedcomx_v1.fs_logging import SUBSYSTEMS, DEFAULT_LEVELS, setup_logging
+
 # Mixins 
 from .mixins.ui import UIMixin
 from .mixins.auth import AuthMixin
@@ -38,7 +40,17 @@ class FSG_Sync(
     CONFIG.register("preferences.fs_client_id", "")
     CONFIG.register("preferences.fs_image_download_dir", "")
     CONFIG.register("preferences.fs_web_compare_url", "")
+    CONFIG.register("preferences.fs_metrics_file", "")  # JSON telemetry dump; "" = off
+    CONFIG.register("preferences.fs_cassette", "")  # record/replay archive; "" = live
+    CONFIG.register("preferences.fs_cassette_mode", "replay")  # "record" or "replay"
+    CONFIG.register("preferences.fs_cassette_latency", "")  # seconds, "recorded" or ""
+    CONFIG.register("preferences.fs_standin", "")  # e.g. "http://127.0.0.1:8800"; "" = live
+    CONFIG.register("preferences.fs_warmup", True)  # connect and check the token at startup
+    for _sub in SUBSYSTEMS:
+        # Log level per subsystem (DEBUG, INFO, WARNING, ...)
+        CONFIG.register("logging." + _sub, DEFAULT_LEVELS[_sub])
     CONFIG.load()
+    setup_logging({_sub: CONFIG.get("logging." + _sub) for _sub in SUBSYSTEMS})
 
     fs_Tree = None
     fs_TreeSearch = None
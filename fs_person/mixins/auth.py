@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import os
+import threading
+
 # GTK
 from gi.repository import Gtk
 
@@ -13,6 +16,35 @@ import tree
 from .constants import APP_KEY, REDIRECT, has_minibrowser
 
 import gedcomx_v1
+from gedcomx_v1.fs_token import TokenStore
+
+try:
+    from gramps.gen.const import USER_DATA as _USER_DATA
+except ImportError:  # Gramps 5.1
+    from gramps.gen.const import HOME_DIR as _USER_DATA
+
+# Persisted access token (owner-only file, see gedcomx_v1.fs_token), kept in
+# the Gramps user data directory, not next to the plugin sources
+TOKEN_PATH = os.path.join(_USER_DATA, "FSG_Sync", "fs_token.json")
+# Where earlier versions kept it
+_OLD_TOKEN_PATH = os.path.join(os.path.dirname(__file__), "fs_token.json")
+
+
+def _token_store() -> TokenStore:
+    TokenStore(_OLD_TOKEN_PATH).clear()
+    return TokenStore(TOKEN_PATH)
+
+
+# Read timeout of endpoints not measured yet; measured endpoints get their
+# own from observed latency (gedcomx_v1.fs_timeouts)
+REQUEST_TIMEOUT = 15
+
+# Serializes session creation between the UI and the warm-up thread
+_session_lock = threading.Lock()
+# Cleared while a thread probes the stored token; the probe runs outside
+# _session_lock, so the GTK thread never waits on the network for the lock
+_probe_idle = threading.Event()
+_probe_idle.set()
 
 try:
     _trans = glocale.get_addon_translator(__file__)
@@ -22,24 +54,106 @@ _ = _trans.gettext
 
 
 class AuthMixin:
-    def _ensure_session(self) -> bool:
+    def _ensure_session(self, wait: bool = True) -> bool:
+        """
+        Create the global session and try the stored token. When another
+        thread is already probing the token, wait for its result, or with
+        `wait=False` return False at once (see _connecting()).
+        """
+        with _session_lock:
+            ok = self._ensure_session_locked()
+            if ok is None:
+                _probe_idle.clear()
+                fs = tree._fs_session
+        if ok is None:
+            try:
+                return fs.resume()
+            finally:
+                _probe_idle.set()
+        if not ok and wait and _probe_idle.wait(REQUEST_TIMEOUT):
+            return bool(tree._fs_session and tree._fs_session.logged)
+        return ok
+
+    @staticmethod
+    def _connecting() -> bool:
+        """True while a thread checks the stored token."""
+        return not _probe_idle.is_set()
+
+    def _ensure_session_locked(self) -> bool | None:
+        """Returns None when the new session's stored token must be probed."""
         if tree._fs_session and tree._fs_session.logged:
             return True
         fs_username = self.CONFIG.get("preferences.fs_username")
         fs_pass = self.CONFIG.get("preferences.fs_pass") or ""
+        fs = tree._fs_session
+        if (
+            fs is not None
+            and fs.token_store is not None
+            and not fs.resume_pending
+            and (fs.username, fs.password) == (fs_username, fs_pass)
+        ):
+            # Same credentials, stored token already tried or being tried
+            # (e.g. by the warm-up): keep the session and its connections.
+            # A token that could not be checked (offline) is tried again.
+            return False
         lang = getattr(self, "lang", "en")
         tree._fs_session = gedcomx_v1.FsSession(
             fs_username,
             fs_pass,
             False,
             False,
-            2,
+            REQUEST_TIMEOUT,
             lang,
         )
         client_id = self.CONFIG.get("preferences.fs_client_id")
         if client_id:
             tree._fs_session.client_id = client_id
-        return False
+        if self._apply_cassette(tree._fs_session):
+            return True  # replaying: no network, no login
+        if self._apply_standin(tree._fs_session):
+            return True  # local stand-in server: no real credentials
+        # Reuse a stored token (one probe request) before any login dance
+        tree._fs_session.token_store = _token_store()
+        return None
+
+    @classmethod
+    def _apply_cassette(cls, fs) -> bool:
+        """
+        Attach the record/replay cassette from preferences.fs_cassette
+        (mode preferences.fs_cassette_mode, latency
+        preferences.fs_cassette_latency). Returns True when replaying.
+        """
+        path = cls.CONFIG.get("preferences.fs_cassette") or ""
+        if not path:
+            return False
+        mode = cls.CONFIG.get("preferences.fs_cassette_mode") or "replay"
+        latency = cls.CONFIG.get("preferences.fs_cassette_latency") or None
+        if latency and latency != "recorded":
+            try:
+                latency = float(latency)
+            except ValueError:
+                latency = None
+        try:
+            fs.use_cassette(path, mode, latency)
+        except (OSError, ValueError) as e:
+            WarningDialog(_("Could not open cassette %s: %s") % (path, e))
+            return False
+        return fs.cassette.replaying
+
+    @classmethod
+    def _apply_standin(cls, fs) -> bool:
+        """
+        Send all traffic to the local API stand-in at preferences.fs_standin
+        (gedcomx_v1.fs_standin, for load tests). Returns True when in use.
+        """
+        url = cls.CONFIG.get("preferences.fs_standin") or ""
+        if not url:
+            return False
+        fs.use_standin(url)
+        fs.logged = True
+        fs.status = gedcomx_v1.fs_session.STATUS_CONNECTED
+        fs.set_current()
+        return True
 
     def _login_minibrowser(self) -> bool:
         Browser = None
@@ -80,6 +194,7 @@ class AuthMixin:
             j = None
         if j and j.get("access_token"):
             tree._fs_session.access_token = j["access_token"]
+            tree._fs_session.save_token(j)
             tree._fs_session.logged = True
             tree._fs_session.status = gedcomx_v1.fs_session.STATUS_CONNECTED
             return True
@@ -118,18 +233,40 @@ class AuthMixin:
                 pw,
                 verbosity >= 3,
                 False,
-                2,
+                REQUEST_TIMEOUT,
                 (lang or "en")[:2],
             )
             client_id = cls.CONFIG.get("preferences.fs_client_id") or ""
             if client_id:
                 tree._fs_session.client_id = client_id
+            if not cls._apply_cassette(tree._fs_session) and not cls._apply_standin(tree._fs_session):
+                tree._fs_session.token_store = _token_store()
+                tree._fs_session.resume()
 
         # If we got here, at least a session object exists
         return bool(tree._fs_session)
 
+    @classmethod
+    def dump_session_stats(cls, run: str) -> None:
+        """
+        Write FsSession telemetry as JSON when preferences.fs_metrics_file is
+        set; `run` ("import", "compare", ...) is inserted before the extension.
+        """
+        path = cls.CONFIG.get("preferences.fs_metrics_file") or ""
+        if not path or not getattr(tree, "_fs_session", None):
+            return
+        root, ext = os.path.splitext(path)
+        tree._fs_session.dump_stats("%s-%s%s" % (root, run, ext or ".json"))
+
     def _on_login(self, _btn):
-        self._ensure_session()
+        if not self._ensure_session(wait=False) and self._connecting():
+            # the warm-up is checking the stored token and refreshes the
+            # status when done
+            self.lbl_status.set_text(_("Connecting to FamilySearch…"))
+            return
+        if tree._fs_session:
+            # An explicit login retries the network even if the breaker is open
+            tree._fs_session.breaker.reset()
         ok = self._login_minibrowser()
         if ok:
             OkDialog(_("Logged in to FamilySearch."))
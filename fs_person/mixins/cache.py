@@ -3,8 +3,7 @@ from __future__ import annotations
 
 import os
 import json
-import time
-import email.utils
+import logging
 from typing import Optional, Tuple
 
 # Gramps
@@ -22,6 +21,8 @@ except ValueError:
     _trans = glocale.translation
 _ = _trans.gettext
 
+logger = logging.getLogger(__name__)
+
 
 class _FsCacheEntry:
     """In-memory metadata for an FSID cached on disk."""
@@ -86,13 +87,21 @@ class _FsCache:
             os.replace(tmp_path, path)
         except Exception as e:
             # Keep logs minimal; avoid breaking UI flows
-            print(f"[FS Cache] failed to write {fsid}: {e}")
+            logger.warning("[FS Cache] failed to write %s: %s", fsid, e)
             try:
                 if os.path.exists(tmp_path):
                     os.remove(tmp_path)
             except Exception:
                 pass
 
+    def drop(self, fsid: str) -> None:
+        """Forget the cached copy of FSID (memory and disk)."""
+        self.mem.pop(fsid, None)
+        try:
+            os.remove(self._path(fsid))
+        except OSError:
+            pass
+
     def read_json(self, fsid: str) -> Optional[Tuple[dict, Optional[str], Optional[int]]]:
         """
         Read cache file for FSID.
@@ -123,7 +132,7 @@ class _FsCache:
                     # Don't hard-fail if one file can't be deleted.
                     pass
         except Exception as e:
-            print(f"[FS Cache] failed to clear cache dir {self.base_dir}: {e}")
+            logger.warning("[FS Cache] failed to clear cache dir %s: %s", self.base_dir, e)
 
 
 class CacheMixin:
@@ -139,82 +148,81 @@ class CacheMixin:
         with_relatives: bool,
         force: bool = False,
     ) -> gedcomx_v1.Person:
-        etag: Optional[str] = None
-        last_mod: Optional[int] = None
-
-        # If we don't already have the person (or force refresh), probe headers.
-        if force or (fsid not in self.__class__.fs_Tree._persons):
-            r = tree._fs_session.head_url(f"/platform/tree/persons/{fsid}")
-            if r and r.status_code == 301 and "X-Entity-Forwarded-Id" in r.headers:
-                fsid = r.headers["X-Entity-Forwarded-Id"]
-            if r:
-                etag = r.headers.get("Etag")
-                lm = r.headers.get("Last-Modified")
-                last_mod = int(time.mktime(email.utils.parsedate(lm))) if lm else None
-
-        # Compare against in-memory metadata
-        ce = self._cache.get_meta(fsid) if getattr(self.__class__, "_cache", None) else None
-        up_to_date = (not force) and ce and (
-            (ce.etag and etag and ce.etag == etag)
-            or (ce.last_modified and last_mod and ce.last_modified == last_mod)
-        )
-
-        if not up_to_date:
-            # Try disk cache first
-            disk = None if force or not getattr(self.__class__, "_cache", None) else self._cache.read_json(fsid)
-            if disk and (etag is None or disk[1] == etag) and (last_mod is None or disk[2] == last_mod):
+        fs_tree = self.__class__.fs_Tree
+        cache = getattr(self.__class__, "_cache", None)
+
+        if force or (fsid not in fs_tree._persons):
+            # Send the disk copy's validators with the GET: a 304 turns the
+            # refresh into one small request and we deserialize from disk.
+            disk = None if force or not cache else cache.read_json(fsid)
+            etag: Optional[str] = disk[1] if disk else None
+            last_mod: Optional[int] = disk[2] if disk else None
+            status = fs_tree.add_person(fsid, etag=etag, last_modified=last_mod)
+            fsid = fs_tree._forwarded.get(fsid, fsid)
+
+            unreachable = False
+            if disk and status is None:
+                # None is also what a 404/410 gives: ask why nothing came back
+                gone = self._person_gone_status(fsid)
+                if gone in (404, 410):
+                    logger.warning("[FS Cache] %s is gone from FamilySearch (%s), dropping the disk copy", fsid, gone)
+                    cache.drop(fsid)
+                    disk = None
+                else:
+                    unreachable = gone is None
+
+            if disk and (status == 304 or unreachable):
+                # Not modified (or FamilySearch unreachable): serve the disk copy
                 try:
                     # disk[0] := {"persons":[ <person json> ]}
-                    gedcomx_v1.deserialize_json(self.__class__.fs_Tree, disk[0])
+                    gedcomx_v1.deserialize_json(fs_tree, disk[0])
                 except Exception as e:
-                    print(f"[FS Cache] deserialize (disk) failed for {fsid}: {e}")
+                    logger.warning("[FS Cache] deserialize (disk) failed for %s: %s", fsid, e)
                 p = gedcomx_v1.Person._index.get(fsid)
                 if p:
                     p._etag = disk[1]
                     p._last_modified = disk[2]
-                    self.__class__.fs_Tree._persons[fsid] = p
-                    self._cache.set_meta(fsid, disk[1], disk[2])
-
-            # If still missing, fetch and write cache
-            if fsid not in self.__class__.fs_Tree._persons:
-                self.__class__.fs_Tree.add_persons([fsid])
-                p = gedcomx_v1.Person._index.get(fsid)
-                if p:
-                    self.__class__.fs_Tree._persons[fsid] = p
-                    if getattr(self.__class__, "_cache", None):
-                        self._cache.set_meta(
-                            fsid,
-                            getattr(p, "_etag", None),
-                            getattr(p, "_last_modified", None),
-                        )
-                        # Serialize just the person (as a one-person GedcomX blob)
-                        try:
-                            full_tree = gedcomx_v1.serialize_json(self.__class__.fs_Tree)
-                            persons = []
-                            for pj in (full_tree.get("persons") or []):
-                                pid = pj.get("id") or pj.get("@id")
-                                if pid == fsid:
-                                    persons = [pj]
-                                    break
-                            if not persons and full_tree.get("persons"):
-                                persons = [full_tree["persons"][0]]
-                            person_only = {"persons": persons}
-                            self._cache.write_json(
-                                fsid,
-                                person_only,
-                                getattr(p, "_etag", None),
-                                getattr(p, "_last_modified", None),
-                            )
-                        except Exception as e:
-                            print(f"[FS Cache] serialize/write failed for {fsid}: {e}")
+                    fs_tree._persons[fsid] = p
+                    cache.set_meta(fsid, disk[1], disk[2])
+
+            elif fsid in fs_tree._persons and cache:
+                # Fresh download: remember validators and write cache
+                p = fs_tree._persons[fsid]
+                cache.set_meta(
+                    fsid,
+                    getattr(p, "_etag", None),
+                    getattr(p, "_last_modified", None),
+                )
+                # Serialize just the person (as a one-person GedcomX blob)
+                try:
+                    cache.write_json(
+                        fsid,
+                        gedcomx_v1.serialize_person(p),
+                        getattr(p, "_etag", None),
+                        getattr(p, "_last_modified", None),
+                    )
+                except Exception as e:
+                    logger.warning("[FS Cache] serialize/write failed for %s: %s", fsid, e)
 
         if with_relatives:
-            self.__class__.fs_Tree.add_spouses({fsid})
-            self.__class__.fs_Tree.add_children({fsid})
-            self.__class__.fs_Tree.add_parents({fsid})
+            fs_tree.add_spouses({fsid})
+            fs_tree.add_children({fsid})
+            fs_tree.add_parents({fsid})
 
         return gedcomx_v1.Person._index.get(fsid) or gedcomx_v1.Person()
 
+    @staticmethod
+    def _person_gone_status(fsid: str) -> Optional[int]:
+        """
+        Status of a HEAD of the person, or None when FamilySearch cannot be
+        reached (no session, breaker open, connection errors).
+        """
+        fs = tree._fs_session
+        if not fs or fs.offline:
+            return None
+        r = fs.head_url("/platform/tree/persons/" + fsid)
+        return r.status_code if r is not None else None
+
     def _ensure_notes_cached(self, fsid: str) -> None:
         _get_json = getattr(tree._fs_session, "get_jsonurl", None) or getattr(
             tree._fs_session, "get_json", None
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+import logging
 from typing import List, Tuple
 
 # Gramps
@@ -19,6 +20,8 @@ except ValueError:
     _trans = glocale.translation
 _ = _trans.gettext
 
+logger = logging.getLogger(__name__)
+
 class SourceImportMixin:
     def _normalize_attr_name(self, s: str) -> str:
         return (s or "").strip().lower().replace("_", " ")
@@ -51,7 +54,7 @@ class SourceImportMixin:
                 a.set_value(val)
                 cit.add_attribute(a)
         except Exception as e:
-            print(f"Failed to set citation attribute '{key}': {e}")
+            logger.warning("Failed to set citation attribute '%s': %s", key, e)
 
     def _import_fs_sources(self, gr, items: List[Tuple]) -> int:
         existing: set[str] = set()
@@ -95,7 +98,7 @@ class SourceImportMixin:
                 try:
                     fs_import.add_source(self.dbstate.db, txn, sdid, gr, gr.get_citation_list())
                 except Exception as e:
-                    print(f"fs_import.add_source failed for {sdid}: {e}")
+                    logger.warning("fs_import.add_source failed for %s: %s", sdid, e)
                     continue
 
                 new_targets = []
@@ -219,12 +222,12 @@ class SourceImportMixin:
                         pass
 
                 if not attached:
-                    print("WARN: Could not attach media to citation or source; leaving Media unattached.")
+                    logger.warning("Could not attach media to citation or source; leaving Media unattached.")
 
                 created_handles.append(m.handle)
 
             except Exception as e:
-                print(f"Failed to attach media '{p}': {e}")
+                logger.warning("Failed to attach media '%s': %s", p, e)
 
         return created_handles
 
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+import logging
+import threading
 from typing import Any, Optional
 
 # GTK
 import gi
 gi.require_version("Gtk", "3.0"); gi.require_version("Gdk", "3.0")
-from gi.repository import Gtk, Gdk
+from gi.repository import Gtk, Gdk, GLib
 
 # Gramps
 from gramps.gen.const import GRAMPS_LOCALE as glocale
@@ -24,6 +26,8 @@ import fs_tags
 
 import gedcomx_v1
 
+logger = logging.getLogger(__name__)
+
 try:
     _trans = glocale.get_addon_translator(__file__)
 except ValueError:
@@ -56,11 +60,47 @@ class UIMixin:
             self.__class__.fs_Tree._getsources = False
 
         self._refresh_status()
+        GLib.idle_add(self._preload_status)
+        self._start_warm_up()
+
+    def _preload_status(self):
+        # main loop, once the gramplet is drawn (the db is not thread-safe)
+        try:
+            n = datab_familysearch.preload_status(self.dbstate.db)
+        except Exception as e:
+            logger.debug("FS status preload skipped: %s", e)
+        else:
+            logger.debug("FS status preload: %d rows", n)
+        return False  # one-shot idle callback
+
+    def _start_warm_up(self):
+        """
+        Connect to FamilySearch in the background (preferences.fs_warmup):
+        check the stored token and open the api/www connections, so the
+        first button click starts on a hot session. Skipped when replaying
+        a cassette (no network) or already logged in.
+        """
+        if not self.CONFIG.get("preferences.fs_warmup") or self.CONFIG.get("preferences.fs_cassette"):
+            return
+        if tree._fs_session and tree._fs_session.logged:
+            return
+
+        def run():
+            try:
+                self._ensure_session()
+                if tree._fs_session:
+                    tree._fs_session.warm_up()
+            except Exception as e:
+                logger.info("FamilySearch warm-up failed: %s", e)
+            GLib.idle_add(self._refresh_status)
+
+        threading.Thread(target=run, name="fs-warm-up", daemon=True).start()
 
     def main(self):
         self._refresh_status()
 
     def db_changed(self):
+        GLib.idle_add(self._preload_status)
         self.update()
 
     def active_changed(self, handle):
@@ -19,7 +19,7 @@
 __version__ = "1.1.0" 
 
 from .gedcomx import *
-from .json import serialize_json, deserialize_json
+from .json import serialize_json, serialize_person, deserialize_json
 from .xml import to_xml, parse_xml, XmlGedcomx
 from .fs_session import FsSession
 
@@ -24,31 +24,121 @@ from __future__ import annotations
 from collections import ChainMap
 
 
-def all_annotations(klass) -> ChainMap:
+# Per-class caches: annotations never change once a class is defined
+_annotations: dict = {}
+_defaults: dict = {}
+
+
+def all_annotations(klass) -> dict:
     """
-    Return a ChainMap of type annotations for `klass`, including those
-    inherited from its MRO. Keys are attribute names; values are types.
+    Return the type annotations for `klass`, including those inherited
+    from its MRO (the most derived class wins). Keys are attribute names;
+    values are types. Built once per class; do not modify the result.
     """
-    return ChainMap(
-        *(k.__annotations__ for k in klass.__mro__ if "__annotations__" in k.__dict__)
-    )
+    ann = _annotations.get(klass)
+    if ann is None:
+        ann = _annotations[klass] = dict(
+            ChainMap(*(k.__annotations__ for k in klass.__mro__ if "__annotations__" in k.__dict__))
+        )
+    return ann
+
+
+class LazyContainer:
+    """
+    Class-level default of a set/dict field. Reading the field on an
+    instance that never set it creates the empty container in that
+    instance (and only then), so unused fields cost nothing.
+    """
+
+    __slots__ = ("name", "factory")
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self.factory = factory
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.factory()
+        return value
+
+
+# class -> names of the defaults prepare_class() installed on it
+_prepared: dict = {}
+_MISSING = object()
+
+
+def _factory(decl):
+    if decl in (set, dict):
+        return decl
+    text = str(decl)
+    if text.startswith("set["):
+        return set
+    if text.startswith("dict["):
+        return dict
+    return None
+
+
+def field_defaults(klass) -> tuple:
+    """
+    ((attribute, factory), ...) for every annotated attribute of `klass`:
+    factory is set or dict for container fields, None for plain ones.
+    """
+    fields = _defaults.get(klass)
+    if fields is None:
+        fields = _defaults[klass] = tuple((attr, _factory(decl)) for attr, decl in all_annotations(klass).items())
+    return fields
+
+
+def _owner(klass, attr: str):
+    for k in klass.__mro__:
+        if attr in k.__dict__:
+            return k
+    return None
+
+
+def prepare_class(klass) -> None:
+    """
+    Install the defaults of every annotated attribute on `klass` itself:
+    None for plain fields, a LazyContainer for set/dict fields. Attributes
+    a class really defines (e.g. Person._index, methods) are left alone.
+    """
+    installed = set()
+    for attr, factory in field_defaults(klass):
+        owner = _owner(klass, attr)
+        if owner is not None and attr not in _prepared.get(owner, ()):
+            continue  # defined by the class itself
+        current = owner.__dict__[attr] if owner is not None else _MISSING
+        if factory is None:
+            if current is None:
+                continue
+            setattr(klass, attr, None)
+        else:
+            if isinstance(current, LazyContainer) and current.factory is factory:
+                continue
+            setattr(klass, attr, LazyContainer(attr, factory))
+        installed.add(attr)
+    _prepared[klass] = installed
 
 
 def init_class(obj):
     """
-    Initialize all annotated attributes of `obj` to sensible defaults:
-    - set → empty set()
-    - dict → empty dict()
-    - set[T] → empty set()
-    - dict[K,V] → empty dict()
+    Give all annotated attributes of `obj` their defaults:
+    - set, set[T] → empty set()
+    - dict, dict[K,V] → empty dict()
     - everything else → None
+    The defaults live on the class (see prepare_class), so a new object
+    starts with an empty __dict__ and containers are created on first use.
     """
-    for attr, decl in all_annotations(obj.__class__).items():
-        if decl in (set, dict):
-            setattr(obj, attr, decl())
-        elif str(decl).startswith("set["):
-            setattr(obj, attr, set())
-        elif str(decl).startswith("dict["):
-            setattr(obj, attr, dict())
-        else:
-            setattr(obj, attr, None)
+    if obj.__class__ not in _prepared:
+        prepare_class(obj.__class__)
+
+
+def peek(obj, attr: str):
+    """getattr(obj, attr), but None for a container not created yet."""
+    d = getattr(obj, "__dict__", None)
+    if d is not None and attr in d:
+        return d[attr]
+    if isinstance(getattr(obj.__class__, attr, None), LazyContainer):
+        return None
+    return getattr(obj, attr)
@@ -0,0 +1,387 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+FamilySearch session, asyncio front-end
+
+AsyncFsSession wraps an FsSession and shares its login state, headers,
+rate limiter and counters. With aiohttp installed, requests run natively on
+the event loop (one connection pool, no thread per request); without it (or
+while a cassette or stand-in server is in use) they are handed to a bounded
+thread pool that calls the sync FsSession.
+
+run_sync() runs a coroutine on one long-lived background loop, so blocking
+code (Gramps callbacks, executor threads) can use the async API without
+creating a loop per call.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .fs_session import (
+    STATUS_INIT,
+    STATUS_ERROR,
+    NOT_MODIFIED,
+    MAX_THROTTLE_RETRIES,
+    FsSession,
+)
+from .fs_throttle import THROTTLE_STATUSES
+from .fs_breaker import CircuitOpenError, is_outage
+from . import fs_json
+
+try:
+    import aiohttp  # type: ignore
+except ImportError:
+    aiohttp = None
+
+WWW_URL = "https://www.familysearch.org"
+
+# ---- Shared background loop --------------------------------------
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="fs-async", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run `coro` on the shared FS event loop and block until it returns."""
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the FS event loop; await instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+class AsyncResponse:
+    """Fully-read response with the parts of requests.Response we use."""
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content or b""
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return fs_json.loads(self.content)
+
+    def __repr__(self) -> str:
+        return "<AsyncResponse [%s]>" % self.status_code
+
+
+class AsyncFsSession:
+    """
+    Asyncio API over an FsSession.
+
+    Args:
+        fs (FsSession): Session providing login, headers and limiter.
+        concurrency (int): Max requests in flight at once.
+
+    An instance is bound to the event loop it is first used on.
+    """
+
+    def __init__(self, fs: FsSession, concurrency: int = 32):
+        self.fs = fs
+        self.concurrency = max(1, int(concurrency))
+        self._sem: asyncio.Semaphore | None = None
+        self._client = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # ---- transport ----------------------------------------------------
+    @property
+    def _sync_transport(self) -> bool:
+        # Cassettes and the stand-in redirect live in the requests session
+        return self.fs.cassette is not None or self.fs.standin is not None
+
+    def _setup(self) -> None:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        if aiohttp is not None and not self._sync_transport:
+            if self._client is None:
+                self._client = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.concurrency, ssl=False),
+                    headers=dict(self.fs.session.headers),
+                )
+        elif self._executor is None:
+            self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="fs-aio")
+
+    async def _send(self, method: str, url: str, headers: dict, data=None):
+        self._setup()
+        async with self._sem:
+            if self._client is None or self._sync_transport:
+                loop = asyncio.get_running_loop()
+                call = functools.partial(
+                    self.fs._send, method, url,
+                    headers=headers, data=data, allow_redirects=False,
+                )
+                # carry the caller's priority class into the worker thread
+                ctx = contextvars.copy_context()
+                return await loop.run_in_executor(self._executor, ctx.run, call)
+
+            if not self.fs.breaker.allow():
+                raise CircuitOpenError(url)
+            delay = self.fs.throttle.reserve()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.fs.throttle.reserve()
+            self._client.cookie_jar.update_cookies(
+                {c.name: c.value for c in self.fs.session.cookies}
+            )
+            timeout = self.fs.request_timeout(method, url)
+            if isinstance(timeout, tuple):
+                timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+            else:
+                timeout = aiohttp.ClientTimeout(total=timeout)
+            await self.fs.scheduler.acquire_async()
+            start = time.monotonic()
+            try:
+                async with self._client.request(
+                    method,
+                    url,
+                    headers=headers,
+                    data=data,
+                    allow_redirects=False,
+                    timeout=timeout,
+                ) as resp:
+                    content = await resp.read()
+                    r = AsyncResponse(resp.status, resp.headers, content, str(resp.url))
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                # ClientError: connection, payload and disconnect errors alike
+                self.fs.metrics.record(method, url, None, time.monotonic() - start)
+                self.fs.observe_load(method, url, None, time.monotonic() - start)
+                if isinstance(e, asyncio.TimeoutError) and self.fs.timeouts is not None:
+                    self.fs.timeouts.timed_out(method, url)
+                self.fs.breaker.failure()
+                raise
+            finally:
+                self.fs.scheduler.release()
+            self.fs.observe_load(method, url, r.status_code, time.monotonic() - start)
+        self.fs.metrics.record(
+            method,
+            url,
+            r.status_code,
+            time.monotonic() - start,
+            len(data) if isinstance(data, (str, bytes)) else 0,
+            len(r.content),
+        )
+        if is_outage(r.status_code, r.headers):
+            self.fs.breaker.failure()
+        elif r.status_code not in THROTTLE_STATUSES:
+            self.fs.breaker.success()
+        if r.status_code not in THROTTLE_STATUSES:
+            self.fs.throttle.ok()
+        return r
+
+    async def _login(self) -> None:
+        # The login dance is sync-only (cookies, redirects); keep it off the loop.
+        await asyncio.get_running_loop().run_in_executor(None, self.fs.login)
+
+    async def _sleep_backoff(self, attempt: int, retry_after=None, throttled=False) -> None:
+        await asyncio.sleep(self.fs.throttle.backoff_delay(attempt, retry_after, throttled))
+
+    # ---- retry loop (mirrors FsSession.get_url/head_url/post_url) -----
+    async def _request(self, method: str, url: str, headers: dict, data=None):
+        fs = self.fs
+        if not fs.breaker.allow():
+            return None
+        if method == "HEAD":
+            if not fs.logged:
+                await self._login()
+        elif not fs.logged and fs.status == STATUS_INIT:
+            await self._login()
+
+        conn_errors: tuple = (ConnectionError, requests.exceptions.ConnectionError)
+        if aiohttp is not None:
+            conn_errors += (aiohttp.ClientError,)
+
+        attempts = 0
+        throttled = 0
+        while True:
+            attempts += 1
+            if attempts > 3:
+                fs.status = STATUS_ERROR
+                fs.logged = False
+                return None
+            try:
+                fs.write_log("Downloading: %s", url)
+                r = await self._send(method, url, headers, data)
+            except CircuitOpenError:
+                return None
+            except (asyncio.TimeoutError, requests.exceptions.ReadTimeout):
+                fs.write_log("Read timed out: %s", url, level=logging.INFO)
+                fs.metrics.retry("timeout")
+                continue
+            except conn_errors:
+                fs.write_log("Connection aborted: %s", url, level=logging.INFO)
+                fs.metrics.retry("connection")
+                await self._sleep_backoff(attempts)
+                continue
+
+            if r.status_code in THROTTLE_STATUSES and throttled < MAX_THROTTLE_RETRIES:
+                throttled += 1
+                attempts -= 1
+                fs.write_log("Throttled (%s): %s", r.status_code, url, level=logging.INFO)
+                fs.metrics.retry("throttled")
+                await self._sleep_backoff(throttled, r.headers.get("Retry-After"), throttled=True)
+                continue
+            if r.status_code == 401:
+                if method == "GET" and not fs._token_resumed:
+                    return r  # get_url hands 401 back to the caller
+                loop = asyncio.get_running_loop()
+                ok = await loop.run_in_executor(None, fs._on_unauthorized)
+                if method == "GET" and not ok:
+                    return r
+                headers = fs._reattach_headers(headers)
+                continue
+            if method == "HEAD" or r.status_code in (204, 301, 304):
+                return r
+            if r.status_code == 400:
+                fs.write_log("Status 400: %s", url, level=logging.WARNING)
+                return None
+            if r.status_code in {404, 405, 406, 410, 500}:
+                fs.write_log("Status %s: %s", r.status_code, url, level=logging.WARNING)
+                return None if method == "GET" else r
+            if r.status_code >= 400:
+                fs.write_log("HTTP error %s: %s", r.status_code, url, level=logging.WARNING)
+                if r.status_code == 403:
+                    try:
+                        msg = r.json()["errors"][0].get("message")
+                    except Exception:
+                        msg = None
+                    if msg == "Unable to get ordinances.":
+                        fs.write_log("Unable to get ordinances. Try LDS account or disable that option.", level=logging.WARNING)
+                        return "error"
+                    fs.write_log("Status 403 from %s %s", url, msg or "", level=logging.WARNING)
+                    return None if method == "GET" else r
+                fs.metrics.retry("http")
+                await self._sleep_backoff(attempts, r.headers.get("Retry-After"))
+                continue
+            return r
+
+    # ---- public API ---------------------------------------------------
+    async def get(
+        self,
+        url: str,
+        headers: dict | None = None,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ):
+        """Async FsSession.get_url(); identical concurrent GETs share one request."""
+        fs = self.fs
+        fs.count_call()  # not fs._lock: login() holds it across requests
+        headers = fs._attach_headers(headers, wants_json=True)
+        headers = fs._conditional_headers(headers, etag, last_modified)
+        url = fs._api_url(url)
+
+        key = (url, tuple(sorted(headers.items())))
+        fut = self._inflight.get(key)
+        if fut is not None:
+            fs.flights.note_coalesced()
+            return await asyncio.shield(fut)
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = fut
+        try:
+            r = await self._request("GET", url, headers)
+            fut.set_result(r)
+            return r
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def get_json(
+        self,
+        url: str,
+        headers: dict | None = None,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ):
+        """Async FsSession.get_jsonurl(); same return conventions."""
+        r = await self.get(url, headers, etag=etag, last_modified=last_modified)
+        if r is None or r == "error":
+            return r
+        if r.status_code == 304:
+            return NOT_MODIFIED
+        if FsSession._response_is_empty_json(r):
+            return {}
+        try:
+            return r.json()
+        except ValueError as e:
+            self.fs.write_log("JSON decode failed from %s, error: %s", url, e, level=logging.WARNING)
+            return None
+
+    async def head(self, url: str, headers: dict | None = None):
+        """Async FsSession.head_url()."""
+        fs = self.fs
+        fs.count_call()  # not fs._lock: login() holds it across requests
+        headers = fs._attach_headers(headers, wants_json=True)
+        full = url if url.startswith("http") else WWW_URL + url
+        return await self._request("HEAD", full, headers)
+
+    async def post(self, url: str, data: dict | str, headers: dict | None = None):
+        """Async FsSession.post_url()."""
+        headers = self.fs._attach_headers(headers, wants_json=True)
+        return await self._request("POST", self.fs._api_url(url), headers, data)
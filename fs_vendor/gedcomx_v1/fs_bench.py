@@ -0,0 +1,268 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks of the GedcomX object model.
+
+The corpus is either synthetic person batches from fs_standin, or every
+person response recorded in a cassette (fs_cassette). Run from fs_vendor:
+
+    python -m gedcomx_v1.fs_bench deserialize --persons 5000
+    python -m gedcomx_v1.fs_bench deserialize --cassette crawl.jsonl.gz
+    python -m gedcomx_v1.fs_bench merge --width 2000
+    python -m gedcomx_v1.fs_bench memory --cassette crawl.jsonl.gz
+    python -m gedcomx_v1.fs_bench construct --objects 1000000
+    python -m gedcomx_v1.fs_bench serialize --persons 5000
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import gzip
+import json
+import time
+import base64
+import argparse
+import tracemalloc
+
+from . import gedcomx
+from .json import deserialize_json, serialize_json
+from .fs_standin import SyntheticTree
+
+# the high-volume classes of a person document
+MIXED = (
+    gedcomx.Fact,
+    gedcomx.Name,
+    gedcomx.NameForm,
+    gedcomx.NamePart,
+    gedcomx.TextValue,
+    gedcomx.SourceReference,
+    gedcomx.Qualifier,
+    gedcomx.Attribution,
+    gedcomx.ResourceReference,
+    gedcomx.Date,
+    gedcomx.PlaceReference,
+    gedcomx.Note,
+)
+
+INDEXED = (
+    gedcomx.Person,
+    gedcomx.Relationship,
+    gedcomx.ChildAndParentsRelationship,
+    gedcomx.SourceDescription,
+    gedcomx.PlaceDescription,
+)
+
+
+def synthetic_corpus(persons: int = 2000, batch: int = 50) -> list[dict]:
+    """Person documents as the stand-in serves them, `batch` persons each."""
+    tree = SyntheticTree(persons)
+    return [tree.person_doc(range(i, min(i + batch, persons))) for i in range(0, persons, batch)]
+
+
+def cassette_corpus(path: str) -> list[dict]:
+    """Every 200 person document recorded in the cassette at `path`."""
+    docs = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            e = json.loads(line)
+            if e.get("status") != 200 or "/platform/tree/persons" not in e.get("url", ""):
+                continue
+            try:
+                doc = json.loads(base64.b64decode(e["body"]))
+            except ValueError:
+                continue
+            if isinstance(doc, dict) and doc.get("persons"):
+                docs.append(doc)
+    return docs
+
+
+def wide_person(width: int) -> dict:
+    """One person with `width` facts, sources and name forms (merge stress)."""
+    return {
+        "persons": [
+            {
+                "id": "WIDE-001",
+                "names": [
+                    {
+                        "id": "N-1",
+                        "nameForms": [{"lang": "x-%d" % k, "fullText": "Name %d" % k} for k in range(width)],
+                    }
+                ],
+                "facts": [
+                    {"id": "F-%d" % k, "type": "http://gedcomx.org/Residence", "value": str(k)} for k in range(width)
+                ],
+                "sources": [{"id": "S-%d" % k, "description": "#SD-%d" % k} for k in range(width)],
+            }
+        ]
+    }
+
+
+def count_persons(docs: list[dict]) -> int:
+    return sum(len(d.get("persons") or ()) for d in docs)
+
+
+def reset_indexes() -> None:
+    """Forget every indexed object, so a run starts from an empty tree."""
+    for klass in INDEXED:
+        klass._index.clear()
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        reset_indexes()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_deserialize(docs: list[dict], repeat: int = 3) -> dict:
+    """deserialize_json of the corpus into a fresh Gedcomx."""
+
+    def run():
+        g = gedcomx.Gedcomx()
+        for d in docs:
+            deserialize_json(g, d)
+
+    n = count_persons(docs)
+    seconds = _best(run, repeat)
+    return {"persons": n, "seconds": round(seconds, 3), "persons_per_s": round(n / seconds)}
+
+
+def bench_refetch(docs: list[dict], repeat: int = 3) -> dict:
+    """deserialize_json of the corpus into a tree that already holds it."""
+    g = gedcomx.Gedcomx()
+
+    def run():
+        for d in docs:
+            deserialize_json(g, d)
+
+    n = count_persons(docs)
+    reset_indexes()
+    run()  # first load, not timed
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return {"persons": n, "seconds": round(best, 3), "persons_per_s": round(n / best)}
+
+
+def bench_merge(width: int, repeat: int = 3) -> dict:
+    """Load, then re-load, one person with `width` facts/sources/name forms."""
+    doc = wide_person(width)
+
+    def run():
+        g = gedcomx.Gedcomx()
+        deserialize_json(g, doc)
+        deserialize_json(g, doc)
+
+    return {"width": width, "seconds": round(_best(run, repeat), 3)}
+
+
+def bench_memory(docs: list[dict], repeat: int = 1) -> dict:
+    """Memory held by the tree the corpus deserializes into."""
+    reset_indexes()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        g = gedcomx.Gedcomx()
+        for d in docs:
+            deserialize_json(g, d)
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    n = count_persons(docs)
+    return {"persons": n, "bytes": held, "bytes_per_person": round(held / n)}
+
+
+def bench_construct(objects: int, repeat: int = 3) -> dict:
+    """Construct `objects` empty objects, cycling through MIXED."""
+    classes = MIXED * (objects // len(MIXED)) + MIXED[: objects % len(MIXED)]
+
+    def run():
+        for klass in classes:
+            klass()
+
+    seconds = _best(run, repeat)
+    return {"objects": objects, "seconds": round(seconds, 3), "objects_per_s": round(objects / seconds)}
+
+
+def bench_serialize(docs: list[dict], repeat: int = 3) -> dict:
+    """serialize_json of the tree the corpus deserializes into."""
+    reset_indexes()
+    g = gedcomx.Gedcomx()
+    for d in docs:
+        deserialize_json(g, d)
+    n = len(g.persons)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize_json(g)
+        best = min(best, time.perf_counter() - start)
+    return {"persons": n, "seconds": round(best, 3), "persons_per_s": round(n / best)}
+
+
+# name: (function, input). The input is "corpus" (the person documents) or
+# the command-line option giving the benchmark its size.
+BENCHMARKS = {
+    "deserialize": (bench_deserialize, "corpus"),
+    "serialize": (bench_serialize, "corpus"),
+    "refetch": (bench_refetch, "corpus"),
+    "memory": (bench_memory, "corpus"),
+    "merge": (bench_merge, "width"),
+    "construct": (bench_construct, "objects"),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("bench", nargs="*", help="benchmarks to run: %s (default: all)" % ", ".join(sorted(BENCHMARKS)))
+    ap.add_argument("--persons", type=int, default=2000, help="synthetic corpus size")
+    ap.add_argument("--cassette", help="use the person responses of this cassette instead")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per benchmark (best is reported)")
+    ap.add_argument("--width", type=int, default=1000, help="items per list of the merge benchmark")
+    ap.add_argument("--objects", type=int, default=1000000, help="objects of the construct benchmark")
+    a = ap.parse_args(argv)
+    unknown = set(a.bench) - set(BENCHMARKS)
+    if unknown:
+        ap.error("unknown benchmark: %s" % ", ".join(sorted(unknown)))
+
+    docs = None
+    for name in a.bench or sorted(BENCHMARKS):
+        fn, source = BENCHMARKS[name]
+        if source == "corpus":
+            if docs is None:
+                docs = cassette_corpus(a.cassette) if a.cassette else synthetic_corpus(a.persons)
+                if not docs:
+                    sys.exit("no person documents in the corpus")
+            arg = docs
+        else:
+            arg = getattr(a, source)
+        print(name, json.dumps(fn(arg, a.repeat)))
+    reset_indexes()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Circuit breaker for FsSession.
+
+After `threshold` consecutive failures (connection errors, timeouts and
+the OUTAGE_STATUSES 502/503/504, see is_outage) the breaker opens: requests are refused
+immediately (allow() is False, FsSession._send raises CircuitOpenError)
+so callers can fall back to cached data. A background thread probes the
+server every `cooldown` seconds and closes the breaker once it answers.
+"""
+
+from __future__ import annotations
+
+import time
+import threading
+from typing import Callable, Optional
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+
+# Server-wide trouble; any other status (a 500 of one broken resource
+# included) means the server is answering
+OUTAGE_STATUSES = (502, 503, 504)
+
+
+def is_outage(status: int, headers) -> bool:
+    """
+    True for a response that counts as a breaker failure. A 503 with
+    Retry-After is throttling (FsSession backs off and retries it), not
+    an outage.
+    """
+    if status == 503 and "Retry-After" in headers:
+        return False
+    return status in OUTAGE_STATUSES
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Args:
+        threshold (int): Consecutive failures that open the breaker.
+        cooldown (float): Seconds between recovery probes.
+        probe (callable): Returns True when the server is reachable again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 15.0,
+        probe: Optional[Callable[[], bool]] = None,
+    ):
+        self._lock = threading.Lock()
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.probe = probe
+        self.state = CLOSED
+        self._failures = 0
+        self._probing = False
+
+        # counters
+        self.opened = 0        # times the breaker tripped
+        self.short_circuited = 0  # requests refused while open
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def allow(self) -> bool:
+        """Return False (and count it) if requests are currently refused."""
+        if self.state == OPEN:
+            with self._lock:
+                self.short_circuited += 1
+            return False
+        return True
+
+    def success(self) -> None:
+        if self._failures or self.state != CLOSED:
+            with self._lock:
+                self._failures = 0
+                self.state = CLOSED
+                self.opened_at = None
+
+    def failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == CLOSED and self._failures >= self.threshold:
+                self.state = OPEN
+                self.opened += 1
+                self.opened_at = time.time()
+                start_probe = self.probe is not None and not self._probing
+                self._probing = self._probing or start_probe
+            else:
+                start_probe = False
+        if start_probe:
+            threading.Thread(target=self._probe_loop, name="fs-breaker-probe", daemon=True).start()
+
+    def reset(self) -> None:
+        """Close the breaker by hand (e.g. the user pressed Login)."""
+        self.success()
+
+    def _probe_loop(self) -> None:
+        try:
+            while self.state == OPEN:
+                time.sleep(self.cooldown)
+                if self.state != OPEN:
+                    break
+                try:
+                    ok = self.probe()
+                except Exception:
+                    ok = False
+                if ok:
+                    self.success()
+        finally:
+            with self._lock:
+                self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "opened": self.opened,
+            "short_circuited": self.short_circuited,
+        }
@@ -0,0 +1,192 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Record/replay of FsSession traffic ("cassettes").
+
+A cassette is a gzip-compressed JSON-lines file, one request/response pair
+per line: method, url, Accept header, whether the request was conditional
+(If-None-Match/If-Modified-Since), status, response headers, base64 body
+and the elapsed time. In record mode FsSession._send appends every live
+exchange; in replay mode it answers from the cassette without touching the
+network, optionally sleeping a fixed or the recorded latency. Repeated
+requests replay their recorded responses in order (the last one repeats),
+and requests missing from the cassette get a 404. A recorded 304 only
+answers a conditional request; a conditional request with none recorded
+gets the unconditional response.
+
+Authorization and cookies are never written.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+import base64
+import atexit
+import logging
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Response headers not worth keeping (or not safe to keep). The body is
+# stored decoded, so its encoding and length headers would be wrong.
+_DROP_HEADERS = {
+    "set-cookie",
+    "authorization",
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "content-encoding",
+    "content-length",
+}
+
+_CONDITIONAL = ("If-None-Match", "If-Modified-Since")
+
+
+def _conditional(headers: dict | None) -> bool:
+    return any(h in (headers or {}) for h in _CONDITIONAL)
+
+
+def _key(method: str, url: str, accept: str | None, conditional: bool = False) -> str:
+    return "%s %s %s%s" % (method.upper(), url, accept or "", " (conditional)" if conditional else "")
+
+
+class Cassette:
+    """
+    Args:
+        path (str): Archive file (conventionally *.jsonl.gz).
+        mode (str): RECORD or REPLAY.
+        latency (float | str | None): Replay only; seconds to sleep per
+            request, or "recorded" to reproduce the recorded timings.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, latency: float | str | None = None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError("cassette mode must be %r or %r" % (RECORD, REPLAY))
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+        self._out = None
+
+        # counters
+        self.recorded = 0
+        self.played = 0
+        self.misses = 0
+
+        if mode == RECORD:
+            self._out = gzip.open(path, "wt", encoding="utf-8")
+            atexit.register(self.close)
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                # cassettes without the flag: only a conditional GET gets a 304
+                conditional = e.get("conditional", e["status"] == 304)
+                e["headers"] = {k: v for k, v in e["headers"].items() if k.lower() not in _DROP_HEADERS}
+                key = _key(e["method"], e["url"], e.get("accept"), conditional)
+                self._entries.setdefault(key, []).append(e)
+
+    # ---- record -------------------------------------------------------
+    def record(self, method: str, url: str, headers: dict | None, r, elapsed: float) -> None:
+        e = {
+            "method": method.upper(),
+            "url": url,
+            "accept": (headers or {}).get("Accept"),
+            "conditional": _conditional(headers),
+            "status": r.status_code,
+            "headers": {k: v for k, v in r.headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": base64.b64encode(r.content or b"").decode("ascii"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(e, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._out is not None:
+                self._out.write(line)
+                self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+
+    # ---- replay -------------------------------------------------------
+    def play(self, method: str, url: str, headers: dict | None) -> requests.Response:
+        """Return the next recorded response for this request (404 if none)."""
+        accept = (headers or {}).get("Accept")
+        key = _key(method, url, accept, _conditional(headers))
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries and _conditional(headers):
+                key = _key(method, url, accept)
+                entries = self._entries.get(key)
+            if entries:
+                i = self._cursor.get(key, 0)
+                self._cursor[key] = i + 1
+                e = entries[min(i, len(entries) - 1)]
+                self.played += 1
+            else:
+                e = None
+                self.misses += 1
+
+        r = requests.Response()
+        r.url = url
+        r.request = requests.Request(method, url, headers=headers).prepare()
+        if e is None:
+            logger.debug("cassette miss: %s", key)
+            r.status_code = 404
+            r.headers = CaseInsensitiveDict({"X-Cassette": "miss"})
+            r._content = b""
+            return r
+        r.status_code = e["status"]
+        r.headers = CaseInsensitiveDict(e["headers"])
+        r._content = base64.b64decode(e["body"])
+
+        if self.latency == "recorded":
+            time.sleep(e.get("elapsed") or 0)
+        elif self.latency:
+            time.sleep(float(self.latency))
+        return r
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "played": self.played,
+            "misses": self.misses,
+        }
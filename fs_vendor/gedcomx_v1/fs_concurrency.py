@@ -0,0 +1,200 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Concurrency helpers for FsSession.
+
+SingleFlight: concurrent calls with the same key share one execution.
+AdaptiveLimit: AIMD in-flight limit driven by response status and latency.
+"""
+
+from __future__ import annotations
+
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Hashable
+
+from .fs_metrics import endpoint_family
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls.
+
+    The first caller for a key (the leader) runs `fn`; callers arriving while
+    it is in flight block and receive the same result (or exception).
+    Nothing is cached once the leader finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.coalesced = 0  # calls answered by another thread's request
+
+    def note_coalesced(self) -> None:
+        """Count a call coalesced outside do() (e.g. by the asyncio front-end)."""
+        with self._lock:
+            self.coalesced += 1
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class AdaptiveLimit:
+    """
+    Additive-increase / multiplicative-decrease limit on requests in flight.
+
+    Every response is fed to observe(). While responses are 2xx-4xx and the
+    latency p95 stays near its baseline, the limit grows by about one per
+    `limit` responses (one step per round of requests). A 429/5xx, a
+    connection error or a p95 above `p95_factor` times the baseline cuts it
+    by `decrease` at once, at most once per `cooldown` seconds so one burst
+    of errors does not collapse it to the minimum.
+
+    Latencies are compared per endpoint family (a person GET and a 50-person
+    batch are not alike): each sample is divided by an endpoint baseline,
+    a slow moving average of that endpoint's latency.
+
+    Args:
+        initial (int): Starting limit.
+        minimum (int): Lower bound.
+        maximum (int): Upper bound.
+        decrease (float): Factor applied on congestion.
+        p95_factor (float): Latency ratio that counts as congestion.
+        window (int): Latency samples used for the p95.
+        cooldown (float): Min seconds between two decreases.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 2,
+        maximum: int = 32,
+        decrease: float = 0.5,
+        p95_factor: float = 2.0,
+        window: int = 100,
+        cooldown: float = 1.0,
+    ):
+        self._lock = threading.Lock()
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.decrease = decrease
+        self.p95_factor = p95_factor
+        self.cooldown = cooldown
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self._ratios: deque[float] = deque(maxlen=max(10, int(window)))
+        self._baseline: dict[str, float] = {}
+        self._cut_at = 0.0
+        self._since_cut = 0  # responses since the last decrease
+
+        # counters
+        self.increases = 0
+        self.decreases = 0
+        self.low = self.high = self.limit
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _p95(self) -> float:
+        ratios = sorted(self._ratios)
+        return ratios[int(0.95 * (len(ratios) - 1))] if ratios else 1.0
+
+    def observe(self, method: str, url: str, status: int | None, elapsed: float) -> int:
+        """Account for one response (status None = no response); return the limit."""
+        with self._lock:
+            congested = status is None or status == 429 or status >= 500
+            if not congested and elapsed > 0:
+                key = endpoint_family(method, url)
+                base = self._baseline.get(key)
+                if base is None:
+                    self._baseline[key] = elapsed
+                else:
+                    self._ratios.append(elapsed / base)
+                    self._baseline[key] = base + 0.02 * (elapsed - base)
+                # judge latency only once a few rounds have been sampled
+                if self._since_cut >= self._ratios.maxlen // 2 and self._p95() > self.p95_factor:
+                    congested = True
+            now = time.monotonic()
+            if congested:
+                if now - self._cut_at >= self.cooldown:
+                    self._cut_at = now
+                    self._since_cut = 0
+                    self._ratios.clear()
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self.decreases += 1
+            else:
+                self._since_cut += 1
+                if self._limit < self.maximum:
+                    before = self.limit
+                    self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+                    if self.limit > before:
+                        self.increases += 1
+            self.low = min(self.low, self.limit)
+            self.high = max(self.high, self.limit)
+            return self.limit
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.increases = self.decreases = 0
+            self.low = self.high = self.limit
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "min": self.low,
+                "max": self.high,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "p95_ratio": round(self._p95(), 2),
+            }
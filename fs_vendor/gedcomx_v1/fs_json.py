@@ -0,0 +1,79 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+JSON parser backend for response bodies.
+
+Bodies are parsed straight from bytes, once: no text decode first, no
+charset guessing. orjson is used when installed, the standard library
+otherwise; use() picks another registered backend (register() adds one).
+Every backend raises ValueError on invalid JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_BACKENDS: dict[str, Callable[[bytes | str], Any]] = {"json": json.loads}
+
+try:
+    import orjson  # type: ignore
+
+    _BACKENDS["orjson"] = orjson.loads  # orjson.JSONDecodeError is a ValueError
+except ImportError:
+    pass
+
+PREFERRED = ("orjson", "json")
+
+_name = next(n for n in PREFERRED if n in _BACKENDS)
+_loads = _BACKENDS[_name]
+
+
+def register(name: str, loads: Callable[[bytes | str], Any]) -> None:
+    """Add a backend: `loads` takes bytes and raises ValueError when invalid."""
+    _BACKENDS[name] = loads
+
+
+def use(name: str) -> str:
+    """Switch to backend `name`; returns the previous backend's name."""
+    global _name, _loads
+    if name not in _BACKENDS:
+        raise ValueError("JSON backend %r is not available (have: %s)" % (name, ", ".join(sorted(_BACKENDS))))
+    previous = _name
+    _name, _loads = name, _BACKENDS[name]
+    logger.debug("JSON backend: %s", name)
+    return previous
+
+
+def backend() -> str:
+    """Name of the backend in use."""
+    return _name
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document (UTF-8 bytes, or str)."""
+    return _loads(data)
+
+
+def is_blank(body: bytes) -> bool:
+    """True for an empty or whitespace-only body (stops at the first non-blank byte)."""
+    return not body or body.isspace()
@@ -0,0 +1,141 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Buffered logging for the plugin.
+
+Each subsystem logs to its own logger ("gedcomx_v1", "tree", "fs_import",
+"fs_compare", "fs_person"). Records go through a queue to one background
+listener thread that hands them to the root logger's handlers (Gramps'
+console and log file; a stderr handler when the root has none), so
+request threads never block on the console. ERROR and above skip the
+queue and reach the root handlers on the caller's thread, as propagated
+records do: Gramps' GtkHandler opens a dialog for them, which must not
+happen on the listener thread. Messages are formatted lazily: pass
+arguments (`logger.debug("GET %s", url)`), not pre-built strings.
+Records below a subsystem's level are dropped before they are even
+created.
+"""
+
+from __future__ import annotations
+
+import sys
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+SUBSYSTEMS = ("gedcomx_v1", "tree", "fs_import", "fs_compare", "fs_person")
+
+DEFAULT_LEVELS = {
+    "gedcomx_v1": "WARNING",  # per-request lines are DEBUG
+    "tree": "WARNING",
+    "fs_import": "INFO",      # import progress
+    "fs_compare": "INFO",
+    "fs_person": "WARNING",
+}
+
+LOG_FORMAT = "[%(asctime)s] %(name)s %(levelname)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_lock = threading.Lock()
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: QueueListener | None = None
+_root: _RootHandlers | None = None
+_installed = False
+
+# Records at or above this level are delivered synchronously
+SYNC_LEVEL = logging.ERROR
+
+
+class _LazyQueueHandler(QueueHandler):
+    """Enqueue the record untouched; the listener thread does the formatting."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        root = _root
+        if record.levelno >= SYNC_LEVEL and root is not None:
+            root.handle(record)
+        else:
+            super().emit(record)
+
+
+class _RootHandlers(logging.Handler):
+    """Pass dequeued records to the root logger's handlers, or to `fallback`."""
+
+    def __init__(self, fallback: logging.Handler):
+        super().__init__()
+        self.fallback = fallback
+
+    def emit(self, record: logging.LogRecord) -> None:
+        root = logging.getLogger()
+        if root.handlers:
+            root.handle(record)
+        else:
+            self.fallback.handle(record)
+
+
+def _level(value) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value or "").strip().upper())
+    return level if isinstance(level, int) else logging.WARNING
+
+
+def set_levels(levels: dict | None = None) -> None:
+    """Set per-subsystem levels; names or ints, missing keys use DEFAULT_LEVELS."""
+    levels = levels or {}
+    for name in SUBSYSTEMS:
+        logging.getLogger(name).setLevel(_level(levels.get(name) or DEFAULT_LEVELS[name]))
+
+
+def setup_logging(levels: dict | None = None, stream=None) -> None:
+    """
+    Route every subsystem logger through the shared queue (idempotent) and
+    apply `levels`. The listener thread (the caller's, from SYNC_LEVEL up)
+    delivers the records to the root logger's handlers; they do not
+    propagate as well, which would deliver them twice.
+    """
+    global _listener, _root, _installed
+    with _lock:
+        if _listener is None:
+            fallback = logging.StreamHandler(stream or sys.stderr)
+            fallback.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+            _root = _RootHandlers(fallback)
+            _listener = QueueListener(_queue, _root, respect_handler_level=True)
+            _listener.start()
+        if not _installed:
+            _installed = True
+            atexit.register(shutdown_logging)
+            for name in SUBSYSTEMS:
+                logger = logging.getLogger(name)
+                logger.addHandler(_LazyQueueHandler(_queue))
+                logger.propagate = False
+    set_levels(levels)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,149 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Per-request telemetry for FsSession.
+
+Requests are grouped by endpoint family: method plus URL path with the
+query dropped and id segments (FSIDs such as "KWCJ-RN4" or "KWCB-QZT",
+and numeric ids, e.g. of places) replaced by "{id}", so
+"GET /platform/tree/persons/{id}/notes" aggregates every person while
+versioned routes such as "/cis-web/oauth2/v3/token" stay as they are.
+"""
+
+from __future__ import annotations
+
+import re
+import bisect
+import threading
+from urllib.parse import urlsplit
+
+# Latency histogram bucket upper bounds (seconds); the last bucket is open.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# FamilySearch ids ("KWCJ-RN4", "KWCB-QZT", "9RG9-2HM5"): may have no digit
+FSID = re.compile(r"[A-Z0-9]{4}-[A-Z0-9]{3,4}")
+
+
+def _is_id(segment: str) -> bool:
+    return segment.isdigit() or FSID.fullmatch(segment) is not None
+
+
+def endpoint_family(method: str, url: str) -> str:
+    """Return the aggregation key for a request, e.g. 'GET /platform/tree/persons/{id}'."""
+    parts = urlsplit(url)
+    segments = [
+        "{id}" if _is_id(seg) else seg
+        for seg in parts.path.split("/")
+    ]
+    return "%s %s" % (method.upper(), "/".join(segments) or "/")
+
+
+class _Endpoint:
+    __slots__ = ("count", "errors", "total", "max", "buckets", "bytes_in", "bytes_out")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0  # connection errors / timeouts (no response)
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def as_dict(self) -> dict:
+        labels = ["<=%gs" % b for b in LATENCY_BUCKETS] + [">%gs" % LATENCY_BUCKETS[-1]]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_s": round(self.total, 3),
+            "avg_ms": round(1000 * self.total / self.count, 1) if self.count else 0.0,
+            "max_ms": round(1000 * self.max, 1),
+            "histogram": dict(zip(labels, self.buckets)),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+class Metrics:
+    """Thread-safe request counters shared by all threads of an FsSession."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints: dict[str, _Endpoint] = {}
+            self.status: dict[str, int] = {}
+            self.retries: dict[str, int] = {}
+            self.logins = 0
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int | None,
+        elapsed: float,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+    ) -> None:
+        """Account for one wire request; `status` None means no response."""
+        key = endpoint_family(method, url)
+        with self._lock:
+            ep = self.endpoints.get(key)
+            if ep is None:
+                ep = self.endpoints[key] = _Endpoint()
+            ep.count += 1
+            ep.total += elapsed
+            if elapsed > ep.max:
+                ep.max = elapsed
+            ep.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            ep.bytes_in += bytes_in
+            ep.bytes_out += bytes_out
+            if status is None:
+                ep.errors += 1
+                code = "error"
+            else:
+                code = str(status)
+            self.status[code] = self.status.get(code, 0) + 1
+
+    def retry(self, reason: str) -> None:
+        """Count a retried request ('timeout', 'connection', 'throttled', 'http', 'unauthorized')."""
+        with self._lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+
+    def login(self) -> None:
+        with self._lock:
+            self.logins += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            endpoints = {
+                k: ep.as_dict()
+                for k, ep in sorted(self.endpoints.items(), key=lambda kv: -kv[1].total)
+            }
+            return {
+                "requests": sum(ep.count for ep in self.endpoints.values()),
+                "bytes_in": sum(ep.bytes_in for ep in self.endpoints.values()),
+                "bytes_out": sum(ep.bytes_out for ep in self.endpoints.values()),
+                "status": dict(self.status),
+                "retries": dict(self.retries),
+                "logins": self.logins,
+                "endpoints": endpoints,
+            }
@@ -0,0 +1,252 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+FamilySearch request scheduler
+
+Every wire request of an FsSession takes one of a fixed number of slots.
+When all slots are busy, requests wait in one FIFO queue per priority class
+and freed slots go to the class with the lowest virtual time (stride
+scheduling): each class advances by 1/weight per granted slot, so under
+load classes share slots in proportion to their weights and an idle class
+that wakes up is served next instead of after the backlog.
+
+The class of a request comes from a context variable, so it follows the
+caller through threads started with copy_context() and through asyncio
+tasks:
+
+    with fs.priority(BATCH):
+        tree.crawl(...)
+
+Requests default to INTERACTIVE. A few slots are reserved for it, so a
+click on the active person never waits for a batch request to finish.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+import contextlib
+import contextvars
+from collections import deque
+
+INTERACTIVE = "interactive"
+PREFETCH = "prefetch"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, PREFETCH, BATCH)
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 16, PREFETCH: 4, BATCH: 1}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("fs_priority", default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    """Priority class of requests made from the current context."""
+    return _priority.get()
+
+
+def set_priority(cls: str) -> contextvars.Token:
+    """Set the priority class for the current context; see reset_priority()."""
+    if cls not in PRIORITIES:
+        raise ValueError("unknown priority class %r" % (cls,))
+    return _priority.set(cls)
+
+
+def reset_priority(token: contextvars.Token) -> None:
+    _priority.reset(token)
+
+
+@contextlib.contextmanager
+def priority(cls: str):
+    """Run the block's requests in priority class `cls`."""
+    token = set_priority(cls)
+    try:
+        yield
+    finally:
+        reset_priority(token)
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted", "since")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+        self.granted = False
+        self.since = time.monotonic()
+
+    def wake(self) -> None:
+        if self.future is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class Scheduler:
+    """
+    Priority slots shared by every thread and task of an FsSession.
+
+    Args:
+        slots (int): Requests allowed on the wire at once; None or 0 = no
+            limit (the scheduler only counts).
+        reserved (int): Slots only INTERACTIVE requests may take.
+        weights (dict): {class: weight} overrides of DEFAULT_WEIGHTS.
+    """
+
+    def __init__(self, slots: int | None = 32, reserved: int = 2, weights: dict[str, int] | None = None):
+        self._lock = threading.Lock()
+        self.slots = max(1, int(slots)) if slots else None
+        self._reserved = max(0, int(reserved))
+        self.reserved = min(self._reserved, (self.slots or 1) - 1)
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        self._queues: dict[str, deque[_Waiter]] = {c: deque() for c in PRIORITIES}
+        self._pass = {c: 0.0 for c in PRIORITIES}
+        self._vtime = 0.0
+        self.active = 0
+        self._init_stats()
+
+    def _init_stats(self) -> None:
+        self.granted = {c: 0 for c in PRIORITIES}
+        self.queued = {c: 0 for c in PRIORITIES}  # requests that had to wait
+        self.wait = {c: 0.0 for c in PRIORITIES}  # seconds spent waiting
+        self.max_depth = {c: 0 for c in PRIORITIES}
+
+    # ---- slot accounting (call with the lock held) ---------------------
+    def _can_run(self, cls: str) -> bool:
+        if self.slots is None:
+            return True
+        limit = self.slots if cls == INTERACTIVE else self.slots - self.reserved
+        return self.active < limit
+
+    def _take(self, cls: str) -> None:
+        self.active += 1
+        self.granted[cls] += 1
+        start = max(self._pass[cls], self._vtime)
+        self._vtime = start
+        self._pass[cls] = start + 1.0 / max(1, self.weights.get(cls, 1))
+
+    def _enqueue(self, cls: str, waiter: _Waiter) -> None:
+        q = self._queues[cls]
+        if not q:
+            # an idle class does not bank credit while nobody was asking
+            self._pass[cls] = max(self._pass[cls], self._vtime)
+        q.append(waiter)
+        self.queued[cls] += 1
+        self.max_depth[cls] = max(self.max_depth[cls], len(q))
+
+    def _dispatch(self) -> None:
+        while True:
+            ready = [c for c in PRIORITIES if self._queues[c] and self._can_run(c)]
+            if not ready:
+                return
+            cls = min(ready, key=lambda c: (self._pass[c], PRIORITIES.index(c)))
+            waiter = self._queues[cls].popleft()
+            self.wait[cls] += time.monotonic() - waiter.since
+            self._take(cls)
+            waiter.granted = True
+            waiter.wake()
+
+    def _admit(self, cls: str, loop=None) -> _Waiter | None:
+        """Take a slot now (None) or return the queued waiter."""
+        with self._lock:
+            if not self._queues[cls] and self._can_run(cls):
+                self._take(cls)
+                return None
+            waiter = _Waiter(loop)
+            self._enqueue(cls, waiter)
+            return waiter
+
+    def set_slots(self, slots: int) -> None:
+        """Change the slot count (e.g. from fs_concurrency.AdaptiveLimit)."""
+        slots = max(1, int(slots))
+        if slots == self.slots:
+            return
+        with self._lock:
+            self.slots = slots
+            self.reserved = max(0, min(self._reserved, slots - 1))
+            self._dispatch()
+
+    def _class(self, cls: str | None) -> str:
+        cls = cls or current_priority()
+        return cls if cls in self._queues else INTERACTIVE
+
+    # ---- public API ---------------------------------------------------
+    def acquire(self, cls: str | None = None) -> None:
+        """Block until a slot is free for `cls` (default: current_priority())."""
+        waiter = self._admit(self._class(cls))
+        if waiter is not None:
+            waiter.event.wait()
+
+    async def acquire_async(self, cls: str | None = None) -> None:
+        """Coroutine version of acquire()."""
+        cls = self._class(cls)
+        waiter = self._admit(cls, asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._queues[cls].remove(waiter)
+                    raise
+            self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+            self._dispatch()
+
+    @contextlib.contextmanager
+    def slot(self, cls: str | None = None):
+        self.acquire(cls)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def depths(self) -> dict[str, int]:
+        """Requests currently waiting, per priority class."""
+        with self._lock:
+            return {c: len(q) for c, q in self._queues.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._init_stats()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "slots": self.slots,
+                "reserved": self.reserved,
+                "active": self.active,
+                "depth": {c: len(q) for c, q in self._queues.items()},
+                "max_depth": dict(self.max_depth),
+                "granted": dict(self.granted),
+                "queued": dict(self.queued),
+                "wait": {c: round(w, 3) for c, w in self.wait.items()},
+            }
@@ -22,13 +22,34 @@ FamilySearch session
 
 Thin requests-based client for FamilySearch authentication and HTTP calls.
 HARDENED: gracefully handles 204 No Content and empty bodies in get_jsonurl().
+
+Thread safety: one FsSession may be shared by many threads (e.g. the executor
+threads of tree.Tree.add_persons). Connections come from per-host urllib3
+pools (see fs_transport), and login/counter updates are serialized by an
+internal lock.
 """
 
-import sys
+import json
+import logging
 import time
+import calendar
+import email.utils
+import threading
 import requests
 import urllib3
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .fs_transport import mount_pools, pool_stats, API_HOST, WWW_HOST, IDENT_HOST, ACCEPT_ENCODING
+from . import fs_json
+from .fs_cassette import Cassette, RECORD, REPLAY
+from .fs_breaker import CircuitBreaker, CircuitOpenError, is_outage
+from .fs_metrics import Metrics
+from .fs_throttle import Throttle, THROTTLE_STATUSES
+from .fs_concurrency import SingleFlight, AdaptiveLimit
+from .fs_scheduler import Scheduler, priority, PREFETCH
+from .fs_timeouts import AdaptiveTimeouts
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -39,9 +60,20 @@ STATUS_CONNECTED = 2
 STATUS_PASSWORD_ERROR = -1
 STATUS_ERROR = -2
 
-# Global verbosity (0 = quiet); some legacy code expects a global level
+# get_jsonurl() result when the supplied validators are still current (304)
+NOT_MODIFIED = "not-modified"
+
+# 429/503 retries allowed per call (on top of the normal attempts)
+MAX_THROTTLE_RETRIES = 8
+
+# Upper bound on pages followed by iter_pages() (guards against link loops)
+MAX_PAGES = 10000
+
+# Legacy global verbosity; when > 0 login flows log their raw responses
 VERBOSITY = 1
 
+logger = logging.getLogger(__name__)
+
 
 class FsSession:
     """
@@ -52,9 +84,20 @@ class FsSession:
         password (str): FamilySearch password.
         verbose (bool): If True, writes logs to stderr in addition to logfile.
         logfile (file-like): Optional file-like to write logs to.
-        timeout (int): Request timeout/backoff base (seconds).
+        timeout (int): Request timeout (seconds). With adaptive timeouts it
+            is only the read timeout of endpoints not measured yet; after
+            that each endpoint gets its own (see fs_timeouts).
         language (str): Preferred language (e.g., 'en'), used for Accept-Language.
         client_id (str): FamilySearch OAuth client id.
+        pool_sizes (dict): Optional {host prefix: max connections} overrides,
+            e.g. {"https://api.familysearch.org": 64}.
+        rate (float): Max requests per second across all threads (None = no limit).
+        burst (int): Token-bucket capacity for `rate`.
+        slots (int): Max requests on the wire at once, shared by priority
+            class (see fs_scheduler; None = unlimited).
+        adaptive (bool): Let AIMD (fs_concurrency.AdaptiveLimit) move the
+            slot count between 2 and `slots` as the server responds, and
+            derive per-endpoint timeouts from observed latency.
     """
 
     def __init__(
@@ -66,6 +109,11 @@ class FsSession:
         timeout: int = 60,
         language: str | None = None,
         client_id: str | None = None,
+        pool_sizes: dict[str, int] | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+        slots: int | None = 32,
+        adaptive: bool = True,
     ):
         self.username = username
         self.password = password
@@ -81,7 +129,22 @@ class FsSession:
         self.language = language
         self.status = STATUS_INIT
 
+        self._lock = threading.RLock()
+        # counter only: never held across I/O, unlike _lock (held by login())
+        self._counter_lock = threading.Lock()
         self.session = requests.session()
+        self._pool_sizes = pool_sizes
+        self._adapters = mount_pools(self.session, pool_sizes)
+        self.standin: str | None = None  # see use_standin()
+        self.throttle = Throttle(rate, burst)
+        self.flights = SingleFlight()  # coalesces identical concurrent GETs
+        self.concurrency = AdaptiveLimit(maximum=slots) if adaptive and slots else None
+        self.scheduler = Scheduler(self.concurrency.limit if self.concurrency else slots)
+        self.timeouts = AdaptiveTimeouts(initial=timeout) if adaptive else None
+        self.metrics = Metrics()
+        self._aio = None
+        # Opens after repeated failures; probes in the background for recovery
+        self.breaker = CircuitBreaker(probe=self._probe)
         try:
             from fake_useragent import UserAgent  # type: ignore
             self.session.headers = {"User-Agent": UserAgent().firefox}
@@ -92,6 +155,8 @@ class FsSession:
                     "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
                 )
             }
+        # replacing the headers dropped requests' default: ask for compression
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
 
         self.logged = False
         self.client_id = client_id
@@ -104,16 +169,42 @@ class FsSession:
         self.xsrf_token = None
         self.access_token = None
 
+        # Optional record/replay cassette (fs_cassette), see use_cassette()
+        self.cassette: Cassette | None = None
+
+        # Optional TokenStore (fs_token) used by resume()/save_token()
+        self.token_store = None
+        self._token_resumed = False
+        # resume() could not reach FamilySearch: the stored token is untried
+        self.resume_pending = False
+
     # --------------------------------------------------------------------- #
     # Logging
     # --------------------------------------------------------------------- #
-    def write_log(self, text: str) -> None:
-        """Write a line to log and, if verbose or VERBOSITY > 0, to stderr."""
-        line = "[%s]: %s\n" % (time.strftime("%Y-%m-%d %H:%M:%S"), text)
-        if self.verbose or VERBOSITY > 0:
-            sys.stderr.write(line)
+    @property
+    def verbose(self) -> bool:
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, value: bool) -> None:
+        self._verbose = bool(value)
+        package = logging.getLogger(__package__)
+        if value and package.getEffectiveLevel() > logging.INFO:
+            package.setLevel(logging.INFO)
+
+    def write_log(self, text: str, *args: Any, level: int = logging.DEBUG) -> None:
+        """
+        Log `text % args` on the gedcomx_v1 logger (formatted lazily, only if
+        the level is enabled; see fs_logging). `verbose` raises DEBUG lines
+        to INFO, and the gedcomx_v1 logger to INFO so they are emitted.
+        Lines are also copied to `logfile` when one is given.
+        """
+        if self.verbose and level < logging.INFO:
+            level = logging.INFO
+        logger.log(level, text, *args)
         if self.logfile:
-            self.logfile.write(line)
+            line = text % args if args else text
+            self.logfile.write("[%s]: %s\n" % (time.strftime("%Y-%m-%d %H:%M:%S"), line))
 
     # --------------------------------------------------------------------- #
     # Login flows (unchanged except minor robustness)
@@ -124,11 +215,11 @@ class FsSession:
         self.status = STATUS_LOGIN
 
         if not self.client_id:
-            print("client_id required for client_credentials authentication")
+            logger.error("client_id required for client_credentials authentication")
             self.status = STATUS_ERROR
             return False
         if not self.private_key:
-            print("private key required for client_credentials authentication")
+            logger.error("private key required for client_credentials authentication")
             self.status = STATUS_ERROR
             return False
 
@@ -144,35 +235,34 @@ class FsSession:
         url = "https://ident.familysearch.org/cis-web/oauth2/v3/token"
         r = self.post_url(url, data)
         if VERBOSITY:
-            print("client_credentials step, r=%s" % str(r))
+            logger.debug("client_credentials step, r=%s", r)
             if r is not None:
-                try:
-                    print("r.text=%s" % r.text)
-                except Exception:
-                    pass
+                logger.debug("r.text=%s", getattr(r, "text", ""))
         if not r:
-            print("login failed (no response)")
+            logger.warning("login failed (no response)")
             self.status = STATUS_ERROR
             return False
 
         j = r.json()
         if j and j.get("access_token"):
             self.access_token = j["access_token"]
-            print("FamilySearch token acquired")
+            self.save_token(j)
+            logger.info("FamilySearch token acquired")
             self.logged = True
             self.status = STATUS_CONNECTED
             return True
 
-        print("login failed")
+        logger.warning("login failed")
         self.status = STATUS_ERROR
         return False
 
     def login_password(self) -> bool:
         """OAuth password grant (requires client_id, username, password)."""
+        self.metrics.login()
         self.logged = False
         self.status = STATUS_LOGIN
         if not self.client_id:
-            print("client_id required for password authentication")
+            logger.error("client_id required for password authentication")
             self.status = STATUS_ERROR
             return False
 
@@ -189,12 +279,13 @@ class FsSession:
         }
         r = self.session.post(url, data, headers=headers, verify=False)
         if VERBOSITY:
-            print("password step, r=%s" % str(r))
-            print("r.text=%s" % r.text)
+            logger.debug("password step, r=%s", r)
+            logger.debug("r.text=%s", r.text)
         j = r.json()
         if j and j.get("access_token"):
             self.access_token = j["access_token"]
-            print("FamilySearch token acquired")
+            self.save_token(j)
+            logger.info("FamilySearch token acquired")
             self.logged = True
             self.status = STATUS_CONNECTED
             return True
@@ -205,8 +296,14 @@ class FsSession:
         Browser-like login to establish session cookies and xsrf token, then
         set current user info (fid, language, display_name).
         """
+        self.metrics.login()
+        with self._lock:
+            self._login_browser()
+
+    def _login_browser(self) -> None:
         self.logged = False
         self.status = STATUS_LOGIN
+        self.fid = None
 
         # Step 1: hit FS root to initialize cookies
         self.session.get("https://www.familysearch.org/", verify=False)
@@ -215,7 +312,7 @@ class FsSession:
         r = self.session.get("https://www.familysearch.org/auth/familysearch/login", verify=False)
         self.xsrf_token = self.session.cookies.get("XSRF-TOKEN")
         if self.xsrf_token:
-            self.write_log("xsrf=%s" % self.xsrf_token)
+            self.write_log("xsrf=%s", self.xsrf_token)
 
         # Step 3: credentials submit
         r = self.session.post(
@@ -228,10 +325,10 @@ class FsSession:
         try:
             data = r.json()
             if "loginError" in data:
-                self.write_log(str(data["loginError"]))
+                self.write_log("Login error: %s", data["loginError"], level=logging.WARNING)
                 return
             if "redirectUrl" not in data:
-                self.write_log(r.text)
+                self.write_log("No redirectUrl in auth response: %s", r.text, level=logging.WARNING)
                 return
             url = data["redirectUrl"]
             try:
@@ -239,18 +336,19 @@ class FsSession:
             except requests.exceptions.TooManyRedirects:
                 pass
         except ValueError:
-            self.write_log("Invalid auth response")
-            self.write_log("text=%s" % str(r.text))
+            self.write_log("Invalid auth response: %s", r.text, level=logging.WARNING)
 
         self.set_current()
-        if not self.fid:
-            self.logged = False
+        self.logged = bool(self.fid)
+        if self.logged:
+            self.status = STATUS_CONNECTED
 
     def login_openid(self, app_key: str, redirect: str) -> bool:
         """
         OpenID-like dance to exchange a code for a token.
         Returns True on success.
         """
+        self.metrics.login()
         self.logged = False
         self.status = STATUS_LOGIN
 
@@ -258,7 +356,7 @@ class FsSession:
         self.session.get("https://www.familysearch.org/auth/familysearch/login", verify=False)
         self.xsrf_token = self.session.cookies.get("XSRF-TOKEN")
         if self.xsrf_token:
-            self.write_log("xsrf=%s" % self.xsrf_token)
+            self.write_log("xsrf=%s", self.xsrf_token)
 
         # Step 2: post username/password
         self.session.post(
@@ -273,7 +371,7 @@ class FsSession:
             "?response_type=code&scope=profile%20email%20qualifies_for_affiliate_account%20country"
             f"&client_id={app_key}&redirect_uri={redirect}&username={self.username}"
         )
-        print(" url1 = " + url)
+        logger.debug("authorization url = %s", url)
         r = self.session.get(url, verify=False)
         loc = r.url
         code = None
@@ -281,7 +379,7 @@ class FsSession:
         if pos > 0:
             code = loc[pos + 5 :]
         else:
-            print("code not found…")
+            logger.warning("authorization code not found")
             return False
 
         # Step 4: exchange the code
@@ -295,24 +393,24 @@ class FsSession:
         url = "https://ident.familysearch.org/cis-web/oauth2/v3/token"
         r = self.post_url(url, data, headers=headers)
         if VERBOSITY and r:
-            print("client_credentials step, r=%s" % str(r))
-            print("r.text=%s" % (r.text if hasattr(r, "text") else ""))
+            logger.debug("authorization_code step, r=%s", r)
+            logger.debug("r.text=%s", getattr(r, "text", ""))
 
         if not r:
-            print("login failed")
+            logger.warning("login failed")
             self.status = STATUS_PASSWORD_ERROR
             return False
 
         j = r.json()
         if j and j.get("access_token"):
             self.access_token = j["access_token"]
-            print("FamilySearch token acquired")
+            self.save_token(j)
+            logger.info("FamilySearch token acquired")
             self.logged = True
             self.status = STATUS_CONNECTED
             return True
 
-        print("login failed")
-        print("r.text=%s" % (r.text if hasattr(r, "text") else ""))
+        logger.warning("login failed: %s", getattr(r, "text", ""))
         self.status = STATUS_PASSWORD_ERROR
         return False
 
@@ -329,17 +427,210 @@ class FsSession:
             h["Authorization"] = "Bearer " + self.access_token
         return h
 
+    def _reattach_headers(self, headers: dict) -> dict:
+        """Headers for a retry after re-login: the old bearer must not survive it."""
+        headers = {k: v for k, v in headers.items() if k != "Authorization"}
+        return self._attach_headers(headers)
+
+    def count_call(self) -> None:
+        with self._counter_lock:
+            self.counter += 1
+
+    def request_timeout(self, method: str, url: str):
+        """Timeout for one request: per-endpoint (connect, read) or `timeout`."""
+        if self.timeouts is None:
+            return self.timeout
+        return self.timeouts.timeout(method, url)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Single choke point for every wire request (pooled, keep-alive)."""
+        kwargs.setdefault("verify", False)
+        kwargs.setdefault("timeout", self.request_timeout(method, url))
+        if not self.breaker.allow():
+            raise CircuitOpenError(url)
+        self.throttle.wait_turn()
+        cassette = self.cassette
+        if cassette is not None and cassette.replaying:
+            start = time.monotonic()
+            r = cassette.play(method, url, kwargs.get("headers"))
+        else:
+            self.scheduler.acquire()
+            start = time.monotonic()  # wire time only, not the queue wait
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.metrics.record(method, url, None, time.monotonic() - start)
+                self.observe_load(method, url, None, time.monotonic() - start)
+                if isinstance(e, requests.exceptions.ReadTimeout) and self.timeouts is not None:
+                    self.timeouts.timed_out(method, url)
+                self.breaker.failure()
+                raise
+            finally:
+                self.scheduler.release()
+            self.observe_load(method, url, r.status_code, time.monotonic() - start)
+            if cassette is not None and not url.startswith(IDENT_HOST):
+                cassette.record(method, url, kwargs.get("headers"), r, time.monotonic() - start)
+        body = r.request.body
+        self.metrics.record(
+            method,
+            url,
+            r.status_code,
+            time.monotonic() - start,
+            len(body) if body else 0,
+            len(r.content),
+        )
+        if is_outage(r.status_code, r.headers):
+            self.breaker.failure()
+        elif r.status_code not in THROTTLE_STATUSES:
+            self.breaker.success()
+        if r.status_code not in THROTTLE_STATUSES:
+            self.throttle.ok()
+        return r
+
+    def observe_load(self, method: str, url: str, status: int | None, elapsed: float) -> None:
+        """
+        Feed a live response to the adaptive limit (resizing the scheduler)
+        and to the per-endpoint timeouts.
+        """
+        if self.concurrency is not None:
+            self.scheduler.set_slots(self.concurrency.observe(method, url, status, elapsed))
+        if self.timeouts is not None and status is not None:
+            self.timeouts.observe(method, url, elapsed)
+
+    def use_cassette(self, path: str, mode: str = REPLAY, latency: float | str | None = None) -> None:
+        """
+        Record every request to, or replay every request from, the cassette
+        at `path` (see fs_cassette). Replay needs no network and no login.
+        """
+        if self.cassette is not None:
+            self.cassette.close()
+        self.cassette = Cassette(path, mode, latency)
+        if self.cassette.replaying:
+            self.logged = True
+            self.status = STATUS_CONNECTED
+
+    def use_standin(self, base_url: str) -> None:
+        """
+        Send all FamilySearch traffic (api, www, ident) to `base_url`, e.g. a
+        local fs_standin.py server, instead of the production hosts.
+        """
+        self.standin = base_url
+        self._adapters = mount_pools(self.session, self._pool_sizes, redirect=base_url)
+
+    @staticmethod
+    def priority(cls: str):
+        """
+        Context manager: requests made inside run in priority class `cls`
+        (fs_scheduler.INTERACTIVE, PREFETCH or BATCH).
+        """
+        return priority(cls)
+
+    @property
+    def offline(self) -> bool:
+        """True while the circuit breaker is open (serve cached data instead)."""
+        return self.breaker.is_open
+
+    def _probe(self) -> bool:
+        """Background recovery probe for the circuit breaker."""
+        try:
+            r = self.session.head(API_HOST + "/platform/", timeout=10, verify=False, allow_redirects=False)
+        except requests.exceptions.RequestException:
+            return False
+        return not is_outage(r.status_code, r.headers)
+
+    def warm_up(self, hosts: tuple[str, ...] = (API_HOST, WWW_HOST)) -> dict[str, bool]:
+        """
+        Open a keep-alive connection to each host that has none yet (DNS,
+        TCP and TLS are paid here, in parallel, as PREFETCH requests), so
+        the first real request starts on a hot connection. Returns
+        {host: connected}.
+        """
+        idle = self.pool_stats()
+
+        def connect(host: str) -> bool:
+            if idle.get(host, {}).get("idle"):
+                return True
+            try:
+                with priority(PREFETCH):
+                    r = self._send("HEAD", host + "/platform/" if host == API_HOST else host + "/", allow_redirects=False)
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
+                self.write_log("Warm-up of %s failed: %s", host, e, level=logging.INFO)
+                return False
+            r.close()  # an empty HEAD response: the connection goes back to the pool
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, len(hosts))) as pool:
+            return dict(zip(hosts, pool.map(connect, hosts)))
+
+    @property
+    def aio(self):
+        """Asyncio front-end (AsyncFsSession) sharing this session's state."""
+        if self._aio is None:
+            from .fs_async import AsyncFsSession
+            self._aio = AsyncFsSession(self)
+        return self._aio
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Connection pool statistics per host (opened vs reused connections)."""
+        return pool_stats(self._adapters)
+
+    def stats(self) -> dict:
+        """
+        Request telemetry since the last reset_stats(): per-endpoint latency
+        histograms and bytes, status-code counts, retries (retries["timeout"]
+        are timeout-triggered), logins, plus time spent in the rate
+        limiter/backoff, coalesced GETs, pools, breaker, scheduler, adaptive
+        limit and per-endpoint timeouts.
+        """
+        stats = self.metrics.snapshot()
+        stats["calls"] = self.counter
+        stats["throttle"] = self.throttle.stats()
+        stats["coalesced"] = self.flights.coalesced
+        stats["scheduler"] = self.scheduler.stats()
+        if self.concurrency is not None:
+            stats["concurrency"] = self.concurrency.stats()
+        if self.timeouts is not None:
+            stats["timeouts"] = self.timeouts.stats()
+        stats["breaker"] = self.breaker.stats()
+        stats["pools"] = self.pool_stats()
+        if self.cassette is not None:
+            stats["cassette"] = self.cassette.stats()
+        return stats
+
+    def reset_stats(self) -> None:
+        """Start a new measurement window (e.g. at the start of an import)."""
+        self.metrics.reset()
+        self.throttle.reset_stats()
+        self.scheduler.reset_stats()
+        if self.concurrency is not None:
+            self.concurrency.reset_stats()
+        if self.timeouts is not None:
+            self.timeouts.reset_stats()
+
+    def dump_stats(self, path: str) -> bool:
+        """Write stats() as JSON to `path`; returns False on I/O errors."""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.stats(), f, indent=2)
+            return True
+        except OSError as e:
+            self.write_log("Could not write stats to %s: %s", path, e, level=logging.WARNING)
+            return False
+
     @staticmethod
     def _api_url(url: str) -> str:
         return url if url.startswith("http") else "https://api.familysearch.org" + url
 
     def post_url(self, url: str, data: dict | str, headers: dict | None = None):
+        if not self.breaker.allow():
+            return None
         if not self.logged and self.status == STATUS_INIT:
             self.login()
         headers = self._attach_headers(headers, wants_json=True)
         url = self._api_url(url)
 
         attempts = 1
+        throttled = 0
         while True:
             try:
                 if attempts > 3:
@@ -347,57 +638,72 @@ class FsSession:
                     self.logged = False
                     return None
                 attempts += 1
-                self.write_log("Downloading :" + url)
-                r = self.session.post(
-                    url, timeout=self.timeout, headers=headers, data=data, allow_redirects=False, verify=False
+                self.write_log("Downloading: %s", url)
+                r = self._send(
+                    "POST", url, headers=headers, data=data, allow_redirects=False
                 )
+            except CircuitOpenError:
+                return None
             except requests.exceptions.ReadTimeout:
-                self.write_log("Read timed out")
+                self.write_log("Read timed out: %s", url, level=logging.INFO)
+                self.metrics.retry("timeout")
                 continue
             except requests.exceptions.ConnectionError:
-                self.write_log("Connection aborted")
-                time.sleep(self.timeout)
+                self.write_log("Connection aborted: %s", url, level=logging.INFO)
+                self.metrics.retry("connection")
+                self.throttle.backoff(attempts)
                 continue
 
-            self.write_log("Status code: %s" % r.status_code)
+            self.write_log("Status code: %s", r.status_code)
             if r.status_code == 204:
-                self.write_log("headers=" + str(r.headers))
+                self.write_log("headers=%s", r.headers)
                 return r
+            if r.status_code in THROTTLE_STATUSES and throttled < MAX_THROTTLE_RETRIES:
+                throttled += 1
+                attempts -= 1  # throttling does not use up an attempt
+                self.write_log("Throttled (%s): %s", r.status_code, r.url, level=logging.INFO)
+                self.metrics.retry("throttled")
+                self.throttle.backoff(throttled, r.headers.get("Retry-After"), throttled=True)
+                continue
             if r.status_code == 401:
-                self.login()
+                self._on_unauthorized()
+                headers = self._reattach_headers(headers)
                 continue
             if r.status_code == 400:
-                self.write_log("WARNING 400: " + url)
+                self.write_log("Status 400: %s", url, level=logging.WARNING)
                 return None
             if r.status_code in {404, 405, 406, 410, 500}:
-                self.write_log("WARNING: " + url)
-                self.write_log(str(r))
+                self.write_log("Status %s: %s", r.status_code, url, level=logging.WARNING)
                 return r
             try:
                 r.raise_for_status()
             except requests.exceptions.HTTPError:
-                self.write_log("HTTPError")
+                self.write_log("HTTP error %s: %s", r.status_code, url, level=logging.WARNING)
                 if r.status_code == 403:
                     try:
                         msg = r.json()["errors"][0].get("message")
                     except Exception:
                         msg = None
                     if msg == "Unable to get ordinances.":
-                        self.write_log("Unable to get ordinances. Try LDS account or disable that option.")
+                        self.write_log("Unable to get ordinances. Try LDS account or disable that option.", level=logging.WARNING)
                         return "error"
-                    self.write_log("WARNING: code 403 from %s %s" % (url, msg or ""))
+                    self.write_log("Status 403 from %s %s", url, msg or "", level=logging.WARNING)
                     return r
-                time.sleep(self.timeout)
+                self.metrics.retry("http")
+                self.throttle.backoff(attempts, r.headers.get("Retry-After"))
                 continue
             return r
 
     def put_url(self, url: str, data: dict | str, headers: dict | None = None):
+        if not self.breaker.allow():
+            return None
         if not self.logged and self.status == STATUS_INIT:
             self.login()
         headers = self._attach_headers(headers, wants_json=True)
         url = self._api_url(url)
 
         attempts = 1
+        throttled = 0
         while True:
             try:
                 if attempts > 3:
@@ -405,57 +711,72 @@ class FsSession:
                     self.logged = False
                     return None
                 attempts += 1
-                self.write_log("Downloading :" + url)
-                r = self.session.put(
-                    url, timeout=self.timeout, headers=headers, data=data, allow_redirects=False, verify=False
+                self.write_log("Downloading: %s", url)
+                r = self._send(
+                    "PUT", url, headers=headers, data=data, allow_redirects=False
                 )
+            except CircuitOpenError:
+                return None
             except requests.exceptions.ReadTimeout:
-                self.write_log("Read timed out")
+                self.write_log("Read timed out: %s", url, level=logging.INFO)
+                self.metrics.retry("timeout")
                 continue
             except requests.exceptions.ConnectionError:
-                self.write_log("Connection aborted")
-                time.sleep(self.timeout)
+                self.write_log("Connection aborted: %s", url, level=logging.INFO)
+                self.metrics.retry("connection")
+                self.throttle.backoff(attempts)
                 continue
 
-            self.write_log("Status code: %s" % r.status_code)
+            self.write_log("Status code: %s", r.status_code)
             if r.status_code == 204:
-                self.write_log("headers=" + str(r.headers))
+                self.write_log("headers=%s", r.headers)
                 return r
+            if r.status_code in THROTTLE_STATUSES and throttled < MAX_THROTTLE_RETRIES:
+                throttled += 1
+                attempts -= 1  # throttling does not use up an attempt
+                self.write_log("Throttled (%s): %s", r.status_code, r.url, level=logging.INFO)
+                self.metrics.retry("throttled")
+                self.throttle.backoff(throttled, r.headers.get("Retry-After"), throttled=True)
+                continue
             if r.status_code == 401:
-                self.login()
+                self._on_unauthorized()
+                headers = self._reattach_headers(headers)
                 continue
             if r.status_code == 400:
-                self.write_log("WARNING 400: " + url)
+                self.write_log("Status 400: %s", url, level=logging.WARNING)
                 return None
             if r.status_code in {404, 405, 406, 410, 500}:
-                self.write_log("WARNING: " + url)
-                self.write_log(str(r))
+                self.write_log("Status %s: %s", r.status_code, url, level=logging.WARNING)
                 return r
             try:
                 r.raise_for_status()
             except requests.exceptions.HTTPError:
-                self.write_log("HTTPError")
+                self.write_log("HTTP error %s: %s", r.status_code, url, level=logging.WARNING)
                 if r.status_code == 403:
                     try:
                         msg = r.json()["errors"][0].get("message")
                     except Exception:
                         msg = None
                     if msg == "Unable to get ordinances.":
-                        self.write_log("Unable to get ordinances. Try LDS account or disable that option.")
+                        self.write_log("Unable to get ordinances. Try LDS account or disable that option.", level=logging.WARNING)
                         return "error"
-                    self.write_log("WARNING: code 403 from %s %s" % (url, msg or ""))
+                    self.write_log("Status 403 from %s %s", url, msg or "", level=logging.WARNING)
                     return r
-                time.sleep(self.timeout)
+                self.metrics.retry("http")
+                self.throttle.backoff(attempts, r.headers.get("Retry-After"))
                 continue
             return r
 
     def head_url(self, url: str, headers: dict | None = None):
+        if not self.breaker.allow():
+            return None
         if not self.logged:
             self.login()
-        self.counter += 1
+        self.count_call()
         headers = self._attach_headers(headers, wants_json=True)
 
         attempts = 1
+        throttled = 0
         while True:
             try:
                 if attempts > 3:
@@ -464,28 +785,75 @@ class FsSession:
                     return None
                 attempts += 1
                 full = "https://www.familysearch.org" + url
-                self.write_log("Downloading :" + full)
-                r = self.session.head(full, timeout=self.timeout, headers=headers, verify=False)
+                self.write_log("Downloading: %s", full)
+                r = self._send("HEAD", full, headers=headers)
+            except CircuitOpenError:
+                return None
             except requests.exceptions.ReadTimeout:
-                self.write_log("Read timed out")
+                self.write_log("Read timed out: %s", url, level=logging.INFO)
+                self.metrics.retry("timeout")
                 continue
             except requests.exceptions.ConnectionError:
-                self.write_log("Connection aborted")
-                time.sleep(self.timeout)
+                self.write_log("Connection aborted: %s", url, level=logging.INFO)
+                self.metrics.retry("connection")
+                self.throttle.backoff(attempts)
+                continue
+            if r.status_code in THROTTLE_STATUSES and throttled < MAX_THROTTLE_RETRIES:
+                throttled += 1
+                attempts -= 1  # throttling does not use up an attempt
+                self.write_log("Throttled (%s): %s", r.status_code, r.url, level=logging.INFO)
+                self.metrics.retry("throttled")
+                self.throttle.backoff(throttled, r.headers.get("Retry-After"), throttled=True)
                 continue
             if r.status_code == 401:
-                self.login()
+                self._on_unauthorized()
+                headers = self._reattach_headers(headers)
                 continue
             return r
 
-    def get_url(self, url: str, headers: dict | None = None):
+    @staticmethod
+    def _conditional_headers(
+        headers: dict, etag: str | None, last_modified: int | None
+    ) -> dict:
+        """Add If-None-Match / If-Modified-Since from stored cache validators."""
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            # callers store Last-Modified via time.mktime(parsedate(...)), i.e. the
+            # GMT fields read as local time; undo that before formatting.
+            ts = calendar.timegm(time.localtime(last_modified))
+            headers["If-Modified-Since"] = email.utils.formatdate(ts, usegmt=True)
+        return headers
+
+    def get_url(
+        self,
+        url: str,
+        headers: dict | None = None,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ):
+        """
+        GET `url`. When `etag`/`last_modified` (epoch seconds) are given the
+        request is conditional and a 304 response is returned as-is, so the
+        caller can serve its cached copy.
+        Returns None at once while the circuit breaker is open.
+        """
+        if not self.breaker.allow():
+            return None
         if not self.logged and self.status == STATUS_INIT:
             self.login()
-        self.counter += 1
+        self.count_call()
         headers = self._attach_headers(headers, wants_json=True)
+        headers = self._conditional_headers(headers, etag, last_modified)
         url = self._api_url(url)
 
+        # Threads asking for the same URL with the same headers share one request
+        key = (url, tuple(sorted(headers.items())))
+        return self.flights.do(key, lambda: self._get_url(url, headers))
+
+    def _get_url(self, url: str, headers: dict):
         attempts = 0
+        throttled = 0
         while True:
             attempts += 1
             if attempts > 3:
@@ -493,40 +861,55 @@ class FsSession:
                 self.logged = False
                 return None
             try:
-                self.write_log("Downloading :" + url)
-                r = self.session.get(
-                    url, timeout=self.timeout, headers=headers, allow_redirects=False, verify=False
+                self.write_log("Downloading: %s", url)
+                r = self._send(
+                    "GET", url, headers=headers, allow_redirects=False
                 )
+            except CircuitOpenError:
+                return None
             except requests.exceptions.ReadTimeout:
-                self.write_log("Read timed out")
+                self.write_log("Read timed out: %s", url, level=logging.INFO)
+                self.metrics.retry("timeout")
                 continue
             except requests.exceptions.ConnectionError:
-                self.write_log("Connection aborted")
-                time.sleep(self.timeout)
+                self.write_log("Connection aborted: %s", url, level=logging.INFO)
+                self.metrics.retry("connection")
+                self.throttle.backoff(attempts)
                 continue
 
             if r.status_code in (204, 301):
-                self.write_log("Status code: %s" % r.status_code)
-                self.write_log("headers=" + str(r.headers))
+                self.write_log("Status code: %s", r.status_code)
+                self.write_log("headers=%s", r.headers)
+                return r
+            if r.status_code == 304:
+                self.write_log("Not modified: %s", url)
                 return r
+            if r.status_code in THROTTLE_STATUSES and throttled < MAX_THROTTLE_RETRIES:
+                throttled += 1
+                attempts -= 1  # throttling does not use up an attempt
+                self.write_log("Throttled (%s): %s", r.status_code, r.url, level=logging.INFO)
+                self.metrics.retry("throttled")
+                self.throttle.backoff(throttled, r.headers.get("Retry-After"), throttled=True)
+                continue
             if r.status_code == 401:
+                # A resumed token may simply have expired: log in again and retry.
+                if self._token_resumed and self._on_unauthorized():
+                    headers = self._reattach_headers(headers)
+                    continue
                 # return the 401 response to caller.
                 return r
             if r.status_code == 400:
-                self.write_log("WARNING 400: " + url)
+                self.write_log("Status 400: %s", url, level=logging.WARNING)
                 return None
             if r.status_code in {404, 405, 406, 410, 500}:
-                self.write_log("WARNING: " + url)
-                try:
-                    self.write_log(r.text)
-                except Exception:
-                    pass
+                self.write_log("Status %s: %s", r.status_code, url, level=logging.WARNING)
+                self.write_log("Response body: %s", r.text)
                 return None
 
             try:
                 r.raise_for_status()
             except requests.exceptions.HTTPError:
-                self.write_log("HTTPError")
+                self.write_log("HTTP error %s: %s", r.status_code, url, level=logging.WARNING)
                 if r.status_code == 403:
                     try:
                         msg = r.json()["errors"][0].get("message")
@@ -534,12 +917,14 @@ class FsSession:
                         msg = None
                     if msg == "Unable to get ordinances.":
                         self.write_log(
-                            "Unable to get ordinances. Try with an LDS account or disable that option."
+                            "Unable to get ordinances. Try with an LDS account or disable that option.",
+                            level=logging.WARNING,
                         )
                         return "error"
-                    self.write_log("WARNING: code 403 from %s %s" % (url, msg or ""))
+                    self.write_log("Status 403 from %s %s", url, msg or "", level=logging.WARNING)
                     return None
-                time.sleep(self.timeout)
+                self.metrics.retry("http")
+                self.throttle.backoff(attempts, r.headers.get("Retry-After"))
                 continue
             return r
 
@@ -549,68 +934,176 @@ class FsSession:
         """
         Return True if response is a JSON-style request with no body:
         - HTTP 204 No Content, or
-        - Content-Length: 0, or
-        - r.content is empty / r.text is blank.
+        - the (decompressed) body is empty or blank.
+        Only looks at the bytes: no text decode, no charset detection.
         """
         try:
-            if r.status_code == 204:
-                return True
-            clen = r.headers.get("Content-Length")
-            if clen is not None and clen.strip() == "0":
-                return True
-            if not r.content:
-                return True
-            if hasattr(r, "text") and (r.text is None or r.text.strip() == ""):
-                return True
+            return r.status_code == 204 or fs_json.is_blank(r.content)
         except Exception:
-            pass
-        return False
+            return False
+
+    @staticmethod
+    def response_json(r: requests.Response):
+        """Parse the body of `r` once, straight from bytes (see fs_json)."""
+        return fs_json.loads(r.content)
 
-    def get_jsonurl(self, url: str, headers: dict | None = None):
+    def get_jsonurl(
+        self,
+        url: str,
+        headers: dict | None = None,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ):
         """
         Retrieve JSON from a FamilySearch URL.
         Returns:
             dict on success,
             {}   on 204/empty body (treated as "no content" without warnings),
             None on non-JSON/HTTP errors,
-            'error' for special ordinance 403 case.
+            'error' for special ordinance 403 case,
+            NOT_MODIFIED when `etag`/`last_modified` were sent and the server
+            answered 304 (serve the cached copy).
         """
-        r = self.get_url(url, headers)
+        r = self.get_url(url, headers, etag=etag, last_modified=last_modified)
         if r is None or r == "error":
             return r  # propagate None or 'error'
+        if r.status_code == 304:
+            return NOT_MODIFIED
         if isinstance(r, requests.Response) and self._response_is_empty_json(r):
             # empty responses (e.g., /notes, /sources) as empty dicts
             return {}
 
-        # try to parse JSON; warn only when there's actual content.
+        # parse JSON once; the body is known to be non-blank here
         try:
-            return r.json()
-        except Exception as e:
-            # Only warn if there was a non-empty body that failed to parse.
-            body_preview = ""
-            try:
-                if r.content and len(r.content) > 0:
-                    body_preview = (r.content[:200] if len(r.content) > 200 else r.content).decode(errors="ignore")
-            except Exception:
-                pass
+            return self.response_json(r)
+        except ValueError as e:
             self.write_log(
-                "WARNING: JSON decode failed from %s, error: %s%s"
-                % (
-                    url,
-                    e,
-                    ("; body preview: " + body_preview) if body_preview else ""
-                )
+                "JSON decode failed from %s, error: %s; body preview: %s",
+                url,
+                e,
+                r.content[:200].decode(errors="ignore"),
+                level=logging.WARNING,
             )
             return None
 
+    # --------------------------------------------------------------------- #
+    # Paging
+    # --------------------------------------------------------------------- #
+    @staticmethod
+    def _with_query(url: str, **params) -> str:
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.update({k: str(v) for k, v in params.items()})
+        return urlunsplit(parts._replace(query=urlencode(query, safe=",")))
+
+    @classmethod
+    def _next_page(cls, url: str, data: dict) -> str | None:
+        """
+        URL of the page after `data`: its "next" link, else the next offset
+        computed from the count/offset/results of its "self" link.
+        """
+        links = data.get("links") or {}
+        nxt = links.get("next") or {}
+        if nxt.get("href"):
+            return nxt["href"]
+        page = links.get("self") or {}
+        count, results = page.get("count"), page.get("results")
+        offset = page.get("offset") or 0
+        if count and results is not None and offset + count < results:
+            return cls._with_query(url, start=offset + count, count=count)
+        return None
+
+    def iter_pages(
+        self, url: str, page_size: int | None = None, headers: dict | None = None
+    ) -> Iterator[dict]:
+        """
+        Yield each page of a list endpoint (notes, sources, memories, change
+        history...) as parsed JSON, following "next" links or offset/count.
+        Only one page is held at a time, so callers that deserialize and drop
+        each page keep memory flat however long the list is.
+        `page_size` asks the server for that many items per page (count=).
+        Stops at the first empty, failed or repeated page.
+        """
+        if page_size:
+            url = self._with_query(url, count=page_size)
+        seen: set[str] = set()
+        while url and url not in seen and len(seen) < MAX_PAGES:
+            seen.add(url)
+            data = self.get_jsonurl(url, headers)
+            if not isinstance(data, dict) or not data:
+                return
+            nxt = self._next_page(url, data)
+            yield data
+            url = nxt
+
+    # --------------------------------------------------------------------- #
+    # Persisted token
+    # --------------------------------------------------------------------- #
+    def save_token(self, j: dict) -> None:
+        """Persist a token response ({"access_token", "expires_in"?})."""
+        if self.token_store and j.get("access_token"):
+            self.token_store.save(j["access_token"], j.get("expires_in"), self.username)
+
+    def resume(self) -> bool:
+        """
+        Reuse the token in `token_store`, checked with one cheap probe
+        (/platform/users/current). Returns True if the session is usable;
+        no login round-trips happen here.
+        """
+        if not self.token_store:
+            return False
+        token = self.token_store.load(self.username)
+        if not token:
+            return False
+        self.access_token = token
+        self.logged = True
+        self.status = STATUS_CONNECTED
+        r = self.get_url("/platform/users/current")
+        if r is not None and r != "error" and r.status_code == 200:
+            try:
+                self._set_current(self.response_json(r))
+            except ValueError:
+                pass
+        self.resume_pending = False
+        if self.fid:
+            self._token_resumed = True
+            self.write_log("Resumed FamilySearch session from stored token", level=logging.INFO)
+            return True
+        if r is not None and r != "error" and r.status_code == 401:
+            # the server rejected the token: it is of no further use
+            self.token_store.clear()
+        else:
+            # unreachable, breaker open, server trouble: the token may be
+            # fine, keep it for the next resume()
+            self.resume_pending = True
+            self.write_log("Stored token not checked (FamilySearch unreachable)", level=logging.INFO)
+        self.access_token = None
+        self.logged = False
+        self.status = STATUS_INIT
+        return False
+
+    def _on_unauthorized(self) -> bool:
+        """401: drop the stored token and log in again (lazily, on demand)."""
+        self.metrics.retry("unauthorized")
+        with self._lock:
+            if self._token_resumed:
+                self._token_resumed = False
+                self.access_token = None
+                if self.token_store:
+                    self.token_store.clear()
+        self.login()
+        return self.logged
+
     # --------------------------------------------------------------------- #
     # Current user info
     # --------------------------------------------------------------------- #
     def set_current(self) -> None:
         """Retrieve current user ID, name and preferred language."""
         url = "/platform/users/current"
-        data = self.get_jsonurl(url)
-        if data:
+        self._set_current(self.get_jsonurl(url))
+
+    def _set_current(self, data) -> None:
+        if isinstance(data, dict) and data.get("users"):
             self.fid = data["users"][0]["personId"]
             if not self.language:
                 self.language = data["users"][0]["preferredLanguage"]
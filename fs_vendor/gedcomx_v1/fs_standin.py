@@ -0,0 +1,744 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Local FamilySearch API stand-in for load and scale tests.
+
+Serves a synthetic tree of any size (persons are computed from their index,
+nothing is stored, so 1M persons cost no memory) on the endpoints the plugin
+uses:
+
+    GET/HEAD /platform/tree/persons/{id}       Etag/Last-Modified, 304, 301
+    GET      /platform/tree/persons?pids=...
+    GET      /platform/tree/persons/{id}/notes|sources|memories  (paged)
+    GET      /platform/tree/couple-relationships/{id}[/notes|/sources]
+    GET      /platform/tree/ancestry|descendancy?person=&generations=
+    GET      /platform/places/description/{id}
+    GET      /platform/sources/descriptions/{id}
+    GET      /service/tree/links/source/{id}
+    GET      /platform/users/current
+    POST     /cis-web/oauth2/v3/token, browser login pages
+
+The tree is a pedigree heap: person i has father 2i+1 and mother 2i+2, and
+each couple has `children` children (the pedigree child plus siblings that
+are leaves). A `merged` fraction of parent references point at an old,
+merged id that answers 301 with X-Entity-Forwarded-Id.
+Bodies of GZIP_MIN bytes or more are gzipped when the client accepts it.
+
+Latency, 429s (with Retry-After) and 5xx can be injected. Point a session
+at it with FsSession.use_standin(server.url), or run it standalone:
+
+    python fs_standin.py --persons 100000 --latency 0.05 --rate-429 0.01
+"""
+
+from __future__ import annotations
+
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+import email.utils
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# FamilySearch-style ids ("KWCB-7ZQ"): 7 base-32 digits
+_ALPHABET = "0123456789ABCDFGHJKLMNPQRSTVWXYZ"
+_BASE = len(_ALPHABET)
+
+# Id spaces (all below 32**7)
+_ALIAS = 1 << 30    # merged person ids
+_COUPLE = 1 << 31   # couple relationship of the parents of person i
+_PARENT = 1 << 32   # parent-child relationships (2 per child)
+_CAPR = 1 << 33     # child-and-parents relationships
+_SOURCE = 1 << 34   # source descriptions
+
+PLACES = 5000       # synthetic place descriptions (jurisdiction: id // 10)
+PAGE_SIZE = 25      # default page of the sources/memories lists
+GZIP_MIN = 1024     # bodies this large are gzipped when the client accepts it
+_EPOCH = 1704067200  # Last-Modified of every person (2024-01-01)
+
+_GIVEN_M = ("John", "William", "James", "Pierre", "Jan", "Carl", "José", "Thomas")
+_GIVEN_F = ("Mary", "Anna", "Elizabeth", "Marie", "Maria", "Johanna", "Sarah", "Ann")
+_SURNAMES = ("Smith", "Martin", "Müller", "Jansen", "García", "Brown", "Dubois", "Nilsson")
+
+
+def encode_id(n: int) -> str:
+    s = ""
+    for _ in range(7):
+        n, d = divmod(n, _BASE)
+        s = _ALPHABET[d] + s
+    return s[:4] + "-" + s[4:]
+
+
+def decode_id(fid: str) -> int | None:
+    s = fid.replace("-", "")
+    if len(s) != 7:
+        return None
+    n = 0
+    for c in s:
+        d = _ALPHABET.find(c)
+        if d < 0:
+            return None
+        n = n * _BASE + d
+    return n
+
+
+class SyntheticTree:
+    """
+    Deterministic synthetic tree of `persons` persons.
+
+    Args:
+        persons (int): Tree size.
+        children (int): Children per couple (>= 1).
+        sources (int): Sources attached to each person.
+        merged (float): Fraction of parent references using a merged id.
+        memories (int): Memories attached to each person.
+    """
+
+    def __init__(
+        self,
+        persons: int = 10000,
+        children: int = 3,
+        sources: int = 2,
+        merged: float = 0.01,
+        memories: int = 0,
+    ):
+        self.size = max(1, int(persons))
+        self.children = max(1, int(children))
+        self.sources = max(0, int(sources))
+        self.merged = merged
+        self.memories = max(0, int(memories))
+        # Pedigree persons; the rest of the range are siblings
+        extra = (self.children - 1) / 2
+        self.core = max(1, min(self.size, int(self.size / (1 + extra)) + 1))
+        # every sibling belongs to a couple of the pedigree
+        couples = (self.core - 1) // 2
+        self.size = min(self.size, self.core + couples * (self.children - 1))
+
+    # ---- structure ----------------------------------------------------
+    def exists(self, i: int) -> bool:
+        return 0 <= i < self.size
+
+    def parents(self, i: int) -> tuple[int, int] | None:
+        """(father, mother) of person i, or None."""
+        if i >= self.core:
+            couple = (i - self.core) // (self.children - 1)
+            return self.parents(couple)
+        f, m = 2 * i + 1, 2 * i + 2
+        return (f, m) if m < self.core else None
+
+    def kids(self, couple: int) -> list[int]:
+        """Children of the couple that are the parents of pedigree person `couple`."""
+        first = self.core + couple * (self.children - 1)
+        sibs = range(first, min(first + self.children - 1, self.size))
+        return [couple, *sibs]
+
+    def couple_of(self, i: int) -> int | None:
+        """The couple (by pedigree child) person i is a spouse in."""
+        if i == 0 or i >= self.core:
+            return None
+        return (i - 1) // 2
+
+    def spouse(self, i: int) -> int | None:
+        c = self.couple_of(i)
+        if c is None:
+            return None
+        return i + 1 if i % 2 else i - 1
+
+    def is_merged(self, i: int) -> bool:
+        return i > 0 and (i * 2654435761) % 10007 < self.merged * 10007
+
+    def ref_id(self, i: int) -> str:
+        """Id used when other records point at person i (may be a merged id)."""
+        return encode_id(i + _ALIAS if self.is_merged(i) else i)
+
+    def resolve(self, fid: str) -> tuple[int | None, bool]:
+        """Return (person index, merged) for a person id; index None if unknown."""
+        n = decode_id(fid)
+        if n is None:
+            return None, False
+        merged = _ALIAS <= n < _COUPLE
+        if merged:
+            n -= _ALIAS
+        return (n, merged) if self.exists(n) else (None, False)
+
+    # ---- documents ----------------------------------------------------
+    def etag(self, i: int) -> str:
+        return 'W/"%d"' % (1000 + i % 97)
+
+    def _year(self, i: int) -> int:
+        return 2000 - 28 * (i + 1).bit_length()
+
+    def _place_ref(self, n: int) -> dict:
+        pid = 1 + n % PLACES
+        return {"original": "Place %d" % pid, "description": "#%d" % pid}
+
+    def person(self, i: int) -> dict:
+        male = i % 2 == 1 or i == 0
+        given = (_GIVEN_M if male else _GIVEN_F)[i % 8]
+        # siblings take their dates and surname from the pedigree child
+        ped = i if i < self.core else (i - self.core) // (self.children - 1)
+        line = ped
+        while 2 * line + 1 < self.core:
+            line = 2 * line + 1  # paternal line up to the oldest known father
+        surname = _SURNAMES[line % 8]
+        born = self._year(ped) + i % 5
+        fid = encode_id(i)
+        return {
+            "id": fid,
+            "living": False,
+            "gender": {"type": "http://gedcomx.org/" + ("Male" if male else "Female")},
+            "names": [
+                {
+                    "id": fid + "-n",
+                    "type": "http://gedcomx.org/BirthName",
+                    "preferred": True,
+                    "nameForms": [
+                        {
+                            "fullText": "%s %s" % (given, surname),
+                            "parts": [
+                                {"type": "http://gedcomx.org/Given", "value": given},
+                                {"type": "http://gedcomx.org/Surname", "value": surname},
+                            ],
+                        }
+                    ],
+                }
+            ],
+            "facts": [
+                {
+                    "id": fid + "-b",
+                    "type": "http://gedcomx.org/Birth",
+                    "date": {"original": str(born), "formal": "+%d" % born},
+                    "place": self._place_ref(i),
+                },
+                {
+                    "id": fid + "-d",
+                    "type": "http://gedcomx.org/Death",
+                    "date": {"original": str(born + 60), "formal": "+%d" % (born + 60)},
+                    "place": self._place_ref(i * 7),
+                },
+            ],
+            "display": {
+                "name": "%s %s" % (given, surname),
+                "gender": "Male" if male else "Female",
+                "lifespan": "%d-%d" % (born, born + 60),
+            },
+        }
+
+    def _couple_rel(self, c: int, ref=None) -> dict:
+        ref = ref or self.ref_id
+        f, m = self.parents(c)
+        return {
+            "id": encode_id(_COUPLE + c),
+            "type": "http://gedcomx.org/Couple",
+            "person1": {"resourceId": ref(f)},
+            "person2": {"resourceId": ref(m)},
+            "facts": [
+                {
+                    "id": encode_id(_COUPLE + c) + "-m",
+                    "type": "http://gedcomx.org/Marriage",
+                    "date": {"original": str(self._year(f) + 25), "formal": "+%d" % (self._year(f) + 25)},
+                    "place": self._place_ref(c * 3),
+                }
+            ],
+        }
+
+    def _child_rels(self, child: int, ref=None) -> tuple[list[dict], dict | None]:
+        """ParentChild relationships and the CAPR linking `child` to its parents."""
+        ref = ref or self.ref_id
+        parents = self.parents(child)
+        if not parents:
+            return [], None
+        rels = [
+            {
+                "id": encode_id(_PARENT + 2 * child + k),
+                "type": "http://gedcomx.org/ParentChild",
+                "person1": {"resourceId": ref(p)},
+                "person2": {"resourceId": ref(child)},
+            }
+            for k, p in enumerate(parents)
+        ]
+        capr = {
+            "id": encode_id(_CAPR + child),
+            "parent1": {"resourceId": ref(parents[0])},
+            "parent2": {"resourceId": ref(parents[1])},
+            "child": {"resourceId": ref(child)},
+        }
+        return rels, capr
+
+    def person_doc(self, indices) -> dict:
+        """Persons with their parent, child and couple relationships."""
+        persons, rels, caprs, seen = [], [], [], set()
+        subjects = set(indices)
+
+        def ref(i: int) -> str:
+            # the documented persons themselves always carry their current id
+            return encode_id(i) if i in subjects else self.ref_id(i)
+
+        def add(rel_list, capr):
+            for r in rel_list:
+                if r["id"] not in seen:
+                    seen.add(r["id"])
+                    rels.append(r)
+            if capr and capr["id"] not in seen:
+                seen.add(capr["id"])
+                caprs.append(capr)
+
+        for i in indices:
+            persons.append(self.person(i))
+            add(*self._child_rels(i, ref))
+            c = self.couple_of(i)
+            if c is not None:
+                add([self._couple_rel(c, ref)], None)
+                for k in self.kids(c):
+                    add(*self._child_rels(k, ref))
+        return {"persons": persons, "relationships": rels, "childAndParentsRelationships": caprs}
+
+    def notes(self, fid: str, i: int) -> dict | None:
+        if i % 3:
+            return None  # most persons have no notes (204)
+        return {
+            "persons": [
+                {
+                    "id": fid,
+                    "notes": [{"id": fid + "-note", "subject": "Research", "text": "Synthetic note for %s" % fid}],
+                }
+            ]
+        }
+
+    def source_id(self, i: int, k: int) -> str:
+        return encode_id(_SOURCE + i * max(1, self.sources) + k)
+
+    def source_description(self, sid: str) -> dict:
+        return {
+            "id": sid,
+            "about": "https://www.familysearch.org/ark:/61903/1:1:%s" % sid.replace("-", ""),
+            "titles": [{"value": "Synthetic record %s" % sid}],
+            "citations": [{"value": "Synthetic collection, record %s" % sid}],
+        }
+
+    @staticmethod
+    def _links(path: str, start: int, count: int, total: int) -> dict:
+        """Paging links as the FS list endpoints send them."""
+        links = {"self": {"href": "%s?start=%d&count=%d" % (path, start, count), "offset": start, "count": count, "results": total}}
+        if start + count < total:
+            links["next"] = {"href": "%s?start=%d&count=%d" % (path, start + count, count)}
+        return links
+
+    def sources_doc(self, fid: str, i: int, start: int = 0, count: int = PAGE_SIZE) -> dict | None:
+        if start >= self.sources:
+            return None
+        sids = [self.source_id(i, k) for k in range(start, min(start + count, self.sources))]
+        return {
+            "links": self._links("/platform/tree/persons/%s/sources" % fid, start, count, self.sources),
+            "persons": [
+                {
+                    "id": fid,
+                    "sources": [
+                        {"id": sid + "-r", "description": "#" + sid, "descriptionId": sid}
+                        for sid in sids
+                    ],
+                }
+            ],
+            "sourceDescriptions": [self.source_description(sid) for sid in sids],
+        }
+
+    def memories_doc(self, fid: str, i: int, start: int = 0, count: int = PAGE_SIZE) -> dict | None:
+        if start >= self.memories:
+            return None
+        return {
+            "links": self._links("/platform/tree/persons/%s/memories" % fid, start, count, self.memories),
+            "sourceDescriptions": [
+                {
+                    "id": "%s-M%d" % (fid, k),
+                    "about": "https://familysearch.org/photos/artifacts/%d" % (i * self.memories + k),
+                    "mediaType": "image/jpeg",
+                    "resourceType": "http://gedcomx.org/DigitalArtifact",
+                    "titles": [{"value": "Memory %d of %s" % (k + 1, fid)}],
+                }
+                for k in range(start, min(start + count, self.memories))
+            ],
+        }
+
+    def source_links(self, sid: str) -> dict:
+        n = decode_id(sid) or 0
+        year = 1800 + n % 150
+        return {
+            "title": "Synthetic record %s" % sid,
+            "event": {"eventDate": "+%d" % year},
+            "fsCollectionUri": "https://www.familysearch.org/platform/records/collections/%d" % (1000000 + n % 500),
+            "uri": {"uri": "https://www.familysearch.org/ark:/61903/1:1:%s" % sid.replace("-", "")},
+            "notes": "Synthetic source note",
+        }
+
+    def place(self, pid: int) -> dict:
+        """Place description plus its jurisdiction chain (up to a one-digit country)."""
+        chain = [pid]
+        while chain[-1] >= 10:
+            chain.append(chain[-1] // 10)
+        places = []
+        for k, p in enumerate(chain):
+            d = {
+                "id": str(p),
+                "names": [{"value": "Place %d" % p}],
+                "latitude": round(-60 + (p * 37) % 120 + 0.5, 4),
+                "longitude": round(-170 + (p * 53) % 340 + 0.25, 4),
+                "display": {"name": "Place %d" % p, "fullName": ", ".join("Place %d" % q for q in chain[k:])},
+                "links": {"place": {"href": "https://www.familysearch.org/platform/places/%d?flag=fsh" % p}},
+            }
+            if k + 1 < len(chain):
+                d["jurisdiction"] = {"resourceId": str(chain[k + 1])}
+            places.append(d)
+        return {"places": places}
+
+    def ancestry(self, root: int, generations: int) -> dict:
+        """Ancestors up to `generations`, numbered like the FS ancestry endpoint."""
+        persons = []
+        level = [(1, root)]
+        for _gen in range(generations + 1):
+            nxt = []
+            for num, i in level:
+                p = self.person(i)
+                p["id"] = self.ref_id(i) if num > 1 else encode_id(i)
+                p["display"]["ascendancyNumber"] = str(num)
+                persons.append(p)
+                parents = self.parents(i)
+                if parents:
+                    nxt += [(2 * num, parents[0]), (2 * num + 1, parents[1])]
+            level = nxt
+        return {"persons": persons}
+
+    def descendancy(self, root: int, generations: int) -> dict:
+        """Descendants up to `generations` with their spouses ("1.2-S")."""
+        persons = []
+
+        def walk(i: int, num: str, gen: int) -> None:
+            p = self.person(i)
+            p["display"]["descendancyNumber"] = num
+            persons.append(p)
+            c = self.couple_of(i)
+            if c is None or gen >= generations:
+                return
+            s = self.person(self.spouse(i))
+            s["display"]["descendancyNumber"] = num + "-S"
+            persons.append(s)
+            for k, kid in enumerate(self.kids(c), 1):
+                walk(kid, "%s.%d" % (num, k), gen + 1)
+
+        walk(root, "1", 0)
+        return {"persons": persons}
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering FamilySearch requests from a SyntheticTree.
+
+    Args:
+        tree (SyntheticTree): Data to serve.
+        host/port: Bind address (port 0 picks a free port, see `url`).
+        latency (float): Seconds added to every API response.
+        jitter (float): Extra random latency, uniform in [0, jitter].
+        rate_429 (float): Fraction of API requests answered 429.
+        rate_5xx (float): Fraction answered 500/502/503.
+        retry_after (int): Retry-After seconds sent with 429/503.
+        seed (int): Seed for the fault injection.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        tree: SyntheticTree | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        rate_5xx: float = 0.0,
+        retry_after: int = 1,
+        seed: int | None = None,
+    ):
+        super().__init__((host, port), _Handler)
+        self.tree = tree or SyntheticTree()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.counts: dict[int, int] = {}
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return "http://%s:%d" % (host, port)
+
+    def start(self) -> "StandinServer":
+        """Serve from a background thread; returns self."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fs-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle_error(self, request, client_address):
+        # clients that time out and hang up are part of the test
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def fault(self) -> int | None:
+        """Status to inject for this request (429/5xx), or None."""
+        with self._lock:
+            x = self._rng.random()
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            status = None
+            if x < self.rate_429:
+                status = 429
+            elif x < self.rate_429 + self.rate_5xx:
+                status = self._rng.choice((500, 502, 503))
+        if delay > 0:
+            time.sleep(delay)
+        return status
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "status": dict(self.counts)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandinServer
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, fmt, *args):  # silence per-request stderr lines
+        pass
+
+    # ---- responses ----------------------------------------------------
+    def _reply(self, status: int, doc=None, headers: dict | None = None, ctype: str = "application/x-gedcomx-v1+json"):
+        body = b"" if doc is None else json.dumps(doc, ensure_ascii=False).encode("utf-8")
+        gzipped = len(body) >= GZIP_MIN and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if body:
+            self.send_header("Content-Type", ctype)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+        self.server.count(status)
+
+    def _not_found(self):
+        self._reply(404, {"errors": [{"code": 404, "message": "Not found"}]})
+
+    def _body(self) -> str:
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n).decode("utf-8", "replace") if n else ""
+
+    # ---- dispatch -----------------------------------------------------
+    def do_HEAD(self):
+        self._route()
+
+    def do_GET(self):
+        self._route()
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        self._body()
+        if path == "/cis-web/oauth2/v3/token":
+            token = "standin-%d" % int(time.time() * 1000)
+            self._reply(200, {"access_token": token, "token_type": "Bearer", "expires_in": 7200}, ctype="application/json")
+        elif path == "/login":
+            self._reply(200, {"redirectUrl": self.server.url + "/auth/familysearch/done"}, ctype="application/json")
+        else:
+            self._reply(405)
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path.rstrip("/"), parse_qs(parts.query)
+        seg = path.split("/")[1:]
+
+        # Login pages and the breaker probe are never faulted
+        if path in ("", "/platform", "/auth/familysearch/done"):
+            return self._reply(200)
+        if path == "/auth/familysearch/login":
+            return self._reply(200, headers={"Set-Cookie": "XSRF-TOKEN=standin; Path=/"})
+
+        status = self.server.fault()
+        if status:
+            headers = {"Retry-After": str(self.server.retry_after)} if status in (429, 503) else None
+            return self._reply(status, {"errors": [{"code": status, "message": "injected"}]}, headers)
+
+        tree = self.server.tree
+        if seg[:2] == ["platform", "tree"]:
+            return self._tree(tree, seg[2:], query)
+        if seg[:3] == ["platform", "places", "description"] and len(seg) == 4:
+            if not seg[3].isdigit() or not 0 < int(seg[3]) <= PLACES:
+                return self._not_found()
+            return self._reply(200, tree.place(int(seg[3])))
+        if seg[:3] == ["platform", "sources", "descriptions"] and len(seg) == 4:
+            return self._reply(200, {"sourceDescriptions": [tree.source_description(seg[3])]})
+        if seg[:4] == ["service", "tree", "links", "source"] and len(seg) == 5:
+            return self._reply(200, tree.source_links(seg[4]), ctype="application/json")
+        if path == "/platform/users/current":
+            user = {"personId": encode_id(0), "preferredLanguage": "en", "displayName": "Stand-in User"}
+            return self._reply(200, {"users": [user]}, ctype="application/json")
+        return self._not_found()
+
+    def _tree(self, tree: SyntheticTree, seg: list[str], query: dict):
+        if seg == ["persons"] and "pids" in query:
+            found = []
+            for fid in query["pids"][0].split(","):
+                i, merged = tree.resolve(fid)
+                if i is not None and not merged:
+                    found.append(i)
+            return self._reply(200, tree.person_doc(found)) if found else self._reply(204)
+
+        if seg and seg[0] in ("ancestry", "descendancy"):
+            i, _merged = tree.resolve((query.get("person") or [""])[0])
+            if i is None:
+                return self._not_found()
+            try:
+                gens = int((query.get("generations") or ["4"])[0])
+            except ValueError:
+                gens = 4
+            if seg[0] == "ancestry":
+                return self._reply(200, tree.ancestry(i, min(gens, 8)))
+            return self._reply(200, tree.descendancy(i, min(gens, 2)))
+
+        if len(seg) >= 2 and seg[0] == "persons":
+            fid = seg[1]
+            i, merged = tree.resolve(fid)
+            if i is None:
+                return self._not_found()
+            if merged:
+                survivor = encode_id(i)
+                return self._reply(
+                    301,
+                    headers={
+                        "X-Entity-Forwarded-Id": survivor,
+                        "Location": "/platform/tree/persons/" + survivor + "".join("/" + s for s in seg[2:]),
+                    },
+                )
+            sub = seg[2] if len(seg) > 2 else None
+            if sub is None:
+                return self._person(tree, i)
+            if sub == "notes":
+                doc = tree.notes(fid, i)
+                return self._reply(200, doc) if doc else self._reply(204)
+            if sub in ("sources", "memories"):
+                try:
+                    start = int((query.get("start") or ["0"])[0])
+                    count = max(1, int((query.get("count") or [str(PAGE_SIZE)])[0]))
+                except ValueError:
+                    return self._reply(400)
+                page = tree.sources_doc if sub == "sources" else tree.memories_doc
+                doc = page(fid, i, start, count)
+                return self._reply(200, doc) if doc else self._reply(204)
+            return self._not_found()
+
+        if len(seg) >= 2 and seg[0] == "couple-relationships":
+            n = decode_id(seg[1])
+            if n is None or not _COUPLE <= n < _PARENT or tree.parents(n - _COUPLE) is None:
+                return self._not_found()
+            c = n - _COUPLE
+            sub = seg[2] if len(seg) > 2 else None
+            if sub is None:
+                f, m = tree.parents(c)
+                doc = tree.person_doc([f, m])
+                doc["relationships"] = [tree._couple_rel(c, encode_id)]
+                return self._reply(200, doc)
+            if sub in ("notes", "sources"):
+                return self._reply(204)
+            return self._not_found()
+
+        return self._not_found()
+
+    def _person(self, tree: SyntheticTree, i: int):
+        etag = tree.etag(i)
+        headers = {
+            "Etag": etag,
+            "Last-Modified": email.utils.formatdate(_EPOCH, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304, headers=headers)
+        since = self.headers.get("If-Modified-Since")
+        if since and not self.headers.get("If-None-Match"):
+            t = email.utils.parsedate_to_datetime(since)
+            if t and t.timestamp() >= _EPOCH:
+                return self._reply(304, headers=headers)
+        return self._reply(200, tree.person_doc([i]), headers)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Local FamilySearch API stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8800)
+    ap.add_argument("--persons", type=int, default=10000)
+    ap.add_argument("--children", type=int, default=3)
+    ap.add_argument("--sources", type=int, default=2)
+    ap.add_argument("--merged", type=float, default=0.01, help="fraction of merged (301) person ids")
+    ap.add_argument("--memories", type=int, default=0, help="memories per person (paged)")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds per API request")
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-5xx", type=float, default=0.0)
+    ap.add_argument("--retry-after", type=int, default=1)
+    ap.add_argument("--seed", type=int)
+    a = ap.parse_args(argv)
+
+    tree = SyntheticTree(a.persons, a.children, a.sources, a.merged, a.memories)
+    server = StandinServer(
+        tree, a.host, a.port, a.latency, a.jitter, a.rate_429, a.rate_5xx, a.retry_after, a.seed
+    )
+    print("FamilySearch stand-in on %s (%d persons, root %s)" % (server.url, tree.size, encode_id(0)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
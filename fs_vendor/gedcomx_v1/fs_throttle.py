@@ -0,0 +1,173 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+FamilySearch request throttling
+
+Token-bucket rate limiter plus Retry-After aware backoff with jitter.
+One Throttle is shared by all threads of an FsSession.
+"""
+
+from __future__ import annotations
+
+import time
+import random
+import threading
+import email.utils
+
+# Responses that mean "slow down" rather than "broken"
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the Retry-After delay in seconds (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class Throttle:
+    """
+    Shared rate limiter / backoff state.
+
+    Args:
+        rate (float): Sustained requests per second; None or 0 = unlimited.
+        burst (int): Bucket capacity (defaults to max(1, rate)).
+        backoff_base (float): First backoff step (seconds).
+        backoff_cap (float): Upper bound of a single backoff sleep (seconds).
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int | None = None,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+    ):
+        self._lock = threading.Lock()
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.set_rate(rate, burst)
+        self._paused_until = 0.0
+        self._streak = 0  # consecutive throttled responses, session-wide
+
+        # counters
+        self.limiter_wait = 0.0   # seconds spent waiting for a token
+        self.backoff_sleep = 0.0  # seconds spent sleeping after errors/429
+        self.throttled = 0        # 429/503 responses seen
+
+    def set_rate(self, rate: float | None, burst: int | None = None) -> None:
+        with self._lock:
+            self.rate = float(rate) if rate else None
+            self.burst = float(burst or max(1.0, self.rate or 1.0))
+            self._tokens = self.burst
+            self._stamp = time.monotonic()
+
+    # ---- limiter ------------------------------------------------------
+    def reserve(self) -> float:
+        """Take a token if one is available; else return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._paused_until - now
+            if delay > 0:
+                return delay
+            if not self.rate:
+                return 0.0
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def wait_turn(self) -> float:
+        """Block until a request may be sent; return the time waited."""
+        waited = 0.0
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.limiter_wait += waited
+        return waited
+
+    # ---- backoff ------------------------------------------------------
+    def ok(self) -> None:
+        """A non-throttled response arrived: reset the adaptive streak."""
+        if self._streak:
+            with self._lock:
+                self._streak = 0
+
+    def backoff_delay(self, attempt: int, retry_after: str | None = None, throttled: bool = False) -> float:
+        """
+        Return (and account for) the delay before the next retry.
+
+        Retry-After wins when present (plus a little jitter so threads do not
+        wake up together). Otherwise "full jitter" exponential backoff on the
+        larger of `attempt` and the session-wide throttle streak.
+        A throttled response also pauses the limiter for every thread.
+        """
+        wait = parse_retry_after(retry_after)
+        with self._lock:
+            if throttled:
+                self.throttled += 1
+                self._streak += 1
+            step = max(attempt, self._streak)
+            if wait is None:
+                wait = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** step)))
+            else:
+                wait = min(wait, self.backoff_cap)
+                wait += random.uniform(0, 0.1 * max(wait, self.backoff_base))
+            if throttled:
+                self._paused_until = max(self._paused_until, time.monotonic() + wait)
+            self.backoff_sleep += wait
+        return wait
+
+    def backoff(self, attempt: int, retry_after: str | None = None, throttled: bool = False) -> float:
+        """Sleep for backoff_delay() and return the time slept."""
+        wait = self.backoff_delay(attempt, retry_after, throttled)
+        time.sleep(wait)
+        return wait
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.limiter_wait = 0.0
+            self.backoff_sleep = 0.0
+            self.throttled = 0
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "limiter_wait": round(self.limiter_wait, 3),
+            "backoff_sleep": round(self.backoff_sleep, 3),
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,135 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Per-endpoint request timeouts from observed latency.
+
+Each endpoint family (see fs_metrics.endpoint_family) keeps its last
+`window` response times. Its read timeout is `factor` times their p99,
+clamped to [floor, ceiling]; until `min_samples` responses were seen the
+`initial` timeout applies. A read timeout counts as a sample as long as
+the timeout itself, so the next attempt waits `factor` times longer
+instead of timing out again. The connect timeout is fixed and short:
+a dead host fails fast whatever the endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from .fs_metrics import endpoint_family
+
+
+class _Window:
+    __slots__ = ("samples", "timeouts", "timeout")
+
+    def __init__(self, size: int, initial: float):
+        self.samples: deque[float] = deque(maxlen=size)
+        self.timeouts = 0
+        self.timeout = initial
+
+    def quantile(self, q: float) -> float:
+        s = sorted(self.samples)
+        return s[min(len(s) - 1, int(q * len(s)))] if s else 0.0
+
+
+class AdaptiveTimeouts:
+    """
+    Args:
+        initial (float): Read timeout before an endpoint has enough samples.
+        floor (float): Smallest read timeout.
+        ceiling (float): Largest read timeout.
+        connect (float): Connect timeout (all endpoints).
+        factor (float): Multiplier applied to the p99 latency.
+        window (int): Samples kept per endpoint.
+        min_samples (int): Samples needed before the p99 is trusted.
+    """
+
+    def __init__(
+        self,
+        initial: float = 15.0,
+        floor: float = 2.0,
+        ceiling: float = 60.0,
+        connect: float = 5.0,
+        factor: float = 4.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        self._lock = threading.Lock()
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.initial = min(self.ceiling, max(floor, initial))
+        self.connect = connect
+        self.factor = factor
+        self.window = max(10, int(window))
+        self.min_samples = max(1, int(min_samples))
+        self._endpoints: dict[str, _Window] = {}
+
+    def _get(self, method: str, url: str) -> _Window:
+        key = endpoint_family(method, url)
+        w = self._endpoints.get(key)
+        if w is None:
+            w = self._endpoints[key] = _Window(self.window, self.initial)
+        return w
+
+    def _update(self, w: _Window) -> None:
+        if len(w.samples) >= self.min_samples:
+            w.timeout = min(self.ceiling, max(self.floor, self.factor * w.quantile(0.99)))
+
+    def read_timeout(self, method: str, url: str) -> float:
+        with self._lock:
+            return self._get(method, url).timeout
+
+    def timeout(self, method: str, url: str) -> tuple[float, float]:
+        """(connect, read) timeout for a request, as requests expects it."""
+        return (self.connect, self.read_timeout(method, url))
+
+    def observe(self, method: str, url: str, elapsed: float) -> None:
+        """Record the response time of a completed request."""
+        with self._lock:
+            w = self._get(method, url)
+            w.samples.append(elapsed)
+            self._update(w)
+
+    def timed_out(self, method: str, url: str) -> None:
+        """Record a read timeout: the endpoint's next timeout grows."""
+        with self._lock:
+            w = self._get(method, url)
+            w.timeouts += 1
+            w.samples.append(w.timeout)
+            # trust the timeout right away, even on a cold endpoint
+            w.timeout = min(self.ceiling, max(self.floor, self.factor * max(w.timeout, w.quantile(0.99))))
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for w in self._endpoints.values():
+                w.timeouts = 0
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                key: {
+                    "read_timeout_s": round(w.timeout, 2),
+                    "p50_ms": round(1000 * w.quantile(0.5), 1),
+                    "p99_ms": round(1000 * w.quantile(0.99), 1),
+                    "samples": len(w.samples),
+                    "timeouts": w.timeouts,
+                }
+                for key, w in sorted(self._endpoints.items())
+            }
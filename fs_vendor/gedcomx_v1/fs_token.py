@@ -0,0 +1,93 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+Persisted FamilySearch access token.
+
+The token is written atomically to a file readable by the owner only
+(mode 0600) together with its expiry and the account it belongs to.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# FamilySearch does not always send expires_in; sessions last at most a day.
+DEFAULT_TOKEN_LIFETIME = 24 * 3600
+# Treat a token as expired this many seconds early.
+EXPIRY_MARGIN = 300
+
+
+class TokenStore:
+    """Read/write one access token at `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, username: str | None = None) -> Optional[str]:
+        """Return the stored token if present, unexpired and for `username`."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                blob = json.load(f)
+        except (OSError, ValueError):
+            return None
+        token = blob.get("access_token")
+        if not token:
+            return None
+        if (blob.get("expires_at") or 0) - EXPIRY_MARGIN < time.time():
+            self.clear()
+            return None
+        if username and blob.get("username") and blob["username"] != username:
+            return None
+        return token
+
+    def save(self, token: str, expires_in: int | None = None, username: str | None = None) -> None:
+        blob = {
+            "access_token": token,
+            "expires_at": int(time.time() + (expires_in or DEFAULT_TOKEN_LIFETIME)),
+            "username": username or None,
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(blob, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o600)  # in case the file already existed
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("[FS Token] failed to save token: %s", e)
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
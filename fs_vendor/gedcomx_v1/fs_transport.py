@@ -0,0 +1,132 @@
+# Copyright © 2024 Gabriel Rios
+
+# License: GPL-3.0-or-later
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+"""
+FamilySearch transport
+
+Per-host connection pools for the requests session used by FsSession.
+
+Thread safety: urllib3 connection pools are thread-safe, so one mounted
+adapter can be shared by every executor thread. Each host gets its own
+bounded pool; with ``pool_block`` set, a thread waits for a free keep-alive
+connection instead of opening (and then discarding) an extra one.
+"""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# ---- Default pool sizes per host ---------------------------------
+API_HOST = "https://api.familysearch.org"
+WWW_HOST = "https://www.familysearch.org"
+IDENT_HOST = "https://ident.familysearch.org"
+
+# Every encoding urllib3 can decode here: gzip and deflate always, br when
+# brotli (or brotlicffi) is installed, zstd with zstandard
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+DEFAULT_POOL_SIZES = {
+    API_HOST: 32,   # person/relationship crawl traffic
+    WWW_HOST: 16,   # HEADs, /service/... endpoints
+    IDENT_HOST: 2,  # login/token only
+}
+
+
+class RedirectAdapter(HTTPAdapter):
+    """HTTPAdapter that sends requests for `prefix` to `target` instead."""
+
+    def __init__(self, prefix: str, target: str, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+        self.target = target.rstrip("/")
+
+    def send(self, request, **kwargs):
+        if request.url.startswith(self.prefix):
+            request.url = self.target + request.url[len(self.prefix):]
+        return super().send(request, **kwargs)
+
+
+def mount_pools(
+    session: requests.Session,
+    pool_sizes: dict[str, int] | None = None,
+    pool_block: bool = True,
+    redirect: str | None = None,
+) -> dict[str, HTTPAdapter]:
+    """
+    Mount one HTTPAdapter per host prefix on `session`.
+
+    `pool_sizes` overrides entries of DEFAULT_POOL_SIZES (keys are scheme+host
+    prefixes, values are the max number of kept-alive connections).
+    With `redirect` (a base URL such as "http://127.0.0.1:8800") every host
+    is served by that server instead, e.g. the fs_standin test server.
+    Returns the mounted adapters keyed by prefix.
+    """
+    sizes = dict(DEFAULT_POOL_SIZES)
+    sizes.update(pool_sizes or {})
+    adapters = {}
+    for prefix, size in sizes.items():
+        size = max(1, int(size))
+        kwargs = dict(
+            pool_connections=1,  # one host per adapter
+            pool_maxsize=size,
+            pool_block=pool_block,
+            max_retries=0,  # retries are handled by FsSession
+        )
+        if redirect:
+            adapter = RedirectAdapter(prefix, redirect, **kwargs)
+        else:
+            adapter = HTTPAdapter(**kwargs)
+        session.mount(prefix, adapter)
+        adapters[prefix] = adapter
+    return adapters
+
+
+def pool_stats(adapters: dict[str, HTTPAdapter]) -> dict[str, dict[str, int]]:
+    """
+    Return connection statistics per mounted host prefix:
+      requests — requests sent through the pool
+      opened   — new TCP/TLS connections opened
+      reused   — requests served on an already open keep-alive connection
+      idle     — connections currently parked in the pool
+      maxsize  — configured pool size
+    """
+    stats = {}
+    for prefix, adapter in adapters.items():
+        n_req = n_conn = idle = 0
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            n_req += pool.num_requests
+            n_conn += pool.num_connections
+            try:
+                # the queue is pre-filled with None placeholders
+                idle += sum(1 for c in list(pool.pool.queue) if c is not None)
+            except Exception:
+                pass
+        stats[prefix] = {
+            "requests": n_req,
+            "opened": n_conn,
+            "reused": max(0, n_req - n_conn),
+            "idle": idle,
+            "maxsize": adapter._pool_maxsize,
+        }
+    return stats
@@ -113,6 +113,9 @@ class TextValue:
     if isinstance(other,TextValue):
       return (self.lang == other.lang and self.value == other.value)
     return False
+  def merge_key(self):
+    """ hash key of iseq: equal keys <=> iseq """
+    return (self.lang, self.value)
 
 # https://www.familysearch.org/developers/docs/api/types/json_Agent
 class Agent(HypermediaEnabledData):
@@ -281,6 +284,9 @@ class NameForm(ExtensibleData):
     if isinstance(other,NameForm):
       return (self.lang == other.lang and self.fullText == other.fullText)
     return False
+  def merge_key(self):
+    """ hash key of iseq: equal keys <=> iseq """
+    return (self.lang, self.fullText)
 
 class Name(Conclusion):
   preferred: bool
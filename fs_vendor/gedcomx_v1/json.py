@@ -20,85 +20,337 @@
 from __future__ import annotations
 
 from .dateformal import DateFormal  # kept because other classes may use it
-from ._utilities import all_annotations
+from ._utilities import all_annotations, peek, LazyContainer
 
 
 # ---------------------------------------------------------------------------
 # Serializer
 # ---------------------------------------------------------------------------
+# Like the decoders below, the serializer of each class is compiled once:
+# _serializers[klass] = (handler, arg), called as handler(obj, arg).
+_serializers: dict = {}
+
+_EMPTY_SKIPPED = (set, list, str, dict)
+
+
 def serialize_json(obj):
     """
     Return a JSON-serializable representation of `obj`.
     """
+    ser = _serializers.get(obj.__class__) or _compile_serializer(obj.__class__)
+    return ser[0](obj, ser[1])
+
+
+def serialize_person(person) -> dict:
+    """
+    One-person GedcomX document {"persons": [<person>]} for `person`,
+    without serializing the tree it belongs to.
+    """
+    return {"persons": [serialize_json(person)]}
+
+
+def _ser_custom(obj, arg):
     # Object-provided custom serialization
-    if hasattr(obj, "serialize_json"):
-        return obj.serialize_json()
-    if hasattr(obj, "to_string"):
-        # Many types (e.g., DateFormal) expose a text form
-        return obj.to_string()
+    return obj.serialize_json()
 
-    ko = obj.__class__.__name__
 
-    # Primitive passthrough
-    if ko in ("bool", "str", "int", "float"):
-        return obj
+def _ser_text(obj, arg):
+    # Many types (e.g., DateFormal) expose a text form
+    return obj.to_string()
 
-    # Collections
-    if ko in ("set", "list"):
-        if len(obj) == 0:
-            return
-        return [serialize_json(o) for o in obj]
 
-    if ko == "dict":
-        if len(obj) == 0:
-            return
-        x = {}
-        for k, v in obj.items():
-            json_k = serialize_json(k)
-            json_v = serialize_json(v)
-            if json_v:
-                x[json_k] = json_v
-        return x
-
-    # Generic object: collect public attributes
+def _ser_primitive(obj, arg):
+    return obj
+
+
+def _ser_sequence(obj, arg):
+    if len(obj) == 0:
+        return
+    return [serialize_json(o) for o in obj]
+
+
+def _ser_dict(obj, arg):
+    if len(obj) == 0:
+        return
+    x = {}
+    for k, v in obj.items():
+        json_k = serialize_json(k)
+        json_v = serialize_json(v)
+        if json_v:
+            x[json_k] = json_v
+    return x
+
+
+def _ser_object(obj, fields):
+    # Generic object: its public attributes, in dir() order
+    names, table = fields
+    d = getattr(obj, "__dict__", None) or {}
+    extra = [a for a in d if a not in names and a[:1] != "_"]
+    if extra:
+        # attributes set on this instance only
+        table = sorted(table + tuple((a, a.replace("_", "-"), False) for a in extra))
     ser = {}
-    for a in dir(obj):
-        if a.startswith("_"):
-            continue
-        attr = getattr(obj, a)
-        if callable(attr):
-            continue
-        # normalize attribute name to JSON key
-        key = a.replace("_", "-")
-        ka = attr.__class__.__name__
-        if ka == "NoneType":
+    for a, key, unset in table:
+        if a in d:
+            attr = d[a]
+        elif unset:
+            continue  # class default: None or a container never created
+        else:
+            attr = getattr(obj, a)
+        if attr is None or callable(attr):
             continue
-        if ka in ("set", "list", "str", "dict") and len(attr) == 0:
+        if attr.__class__ in _EMPTY_SKIPPED and len(attr) == 0:
             continue
         ser[key] = serialize_json(attr)
     return ser
 
 
+def _compile_serializer(klass) -> tuple:
+    """Serializer of `klass`; for objects, its public fields and JSON keys."""
+    name = klass.__name__
+    if hasattr(klass, "serialize_json"):
+        ser = (_ser_custom, None)
+    elif hasattr(klass, "to_string"):
+        ser = (_ser_text, None)
+    elif name in ("bool", "str", "int", "float"):
+        ser = (_ser_primitive, None)
+    elif name in ("set", "list"):
+        ser = (_ser_sequence, None)
+    elif name == "dict":
+        ser = (_ser_dict, None)
+    else:
+        table = []
+        for a in dir(klass):
+            if a.startswith("_"):
+                continue
+            default = getattr(klass, a, None)
+            if callable(default):
+                continue
+            # normalize attribute name to JSON key
+            table.append((a, a.replace("_", "-"), default is None or isinstance(default, LazyContainer)))
+        table = tuple(table)
+        ser = (_ser_object, (frozenset(a for a, _, _ in table), table))
+    _serializers[klass] = ser
+    return ser
+
+
+# ---------------------------------------------------------------------------
+# Compiled decoders
+# ---------------------------------------------------------------------------
+# Annotations never change at run time, so what a JSON key means for a class
+# is worked out once: _decoders[klass][key] = (attribute, handler, arg), and
+# deserialize_json() only calls handler(obj, attribute, value, arg, key).
+_decoders: dict = {}
+# klass -> (has_id, has_index, parent set name) for _add_class
+_class_info: dict = {}
+
+_PRIMITIVES = ("bool", "str", "int", "float", "None")
+_XML_NS = "{http://www.w3.org/XML/1998/namespace}"
+
+
+def _set_bool(obj, name, v, arg, k):
+    if v == "true":
+        setattr(obj, name, True)
+    elif v == "false":
+        setattr(obj, name, False)
+    else:
+        setattr(obj, name, v)
+
+
+def _set_value(obj, name, v, arg, k):
+    setattr(obj, name, v)
+
+
+def _update_set(obj, name, v, arg, k):
+    attr = peek(obj, name) or set()
+    # v is expected to be an iterable of primitives
+    try:
+        attr.update(v)
+    except TypeError:
+        # be forgiving if a single primitive sneaks in
+        attr.add(v)
+    setattr(obj, name, attr)
+
+
+def _update_list(obj, name, v, arg, k):
+    attr = peek(obj, name) or list()
+    # preserve original behavior; some classes may override list semantics
+    attr.update(v)  # type: ignore[attr-defined]
+    setattr(obj, name, attr)
+
+
+def _update_dict(obj, name, v, arg, k):
+    attr = peek(obj, name) or dict()
+    attr.update(v)
+    setattr(obj, name, attr)
+
+
+def _set_object(obj, name, v, klass, k):
+    new_obj = _add_class(klass, v, obj)
+    if new_obj:
+        setattr(obj, name, new_obj)
+    else:
+        print("deserialize_json:error : k=" + k + "; d[k]=" + str(v))
+
+
+def _add_objects(obj, name, v, klass, k):
+    attr = peek(obj, name) or set()
+    # Merging into a set that already holds items (a re-fetch) goes through
+    # hash indexes built once per call, not a scan of the set per item:
+    # by merge_key() for classes with iseq, by id for _add_class reuse.
+    iseq = hasattr(klass, "iseq")
+    seen = _merge_index(attr) if iseq and hasattr(klass, "merge_key") else None
+    siblings, by_id = _id_index(klass, obj)
+    for x in v:
+        new_obj = _add_class(klass, x, obj, by_id)
+        if new_obj:
+            found = False
+            if seen is not None:
+                key = new_obj.merge_key()
+                found = key in seen
+                if not found:
+                    seen[key] = new_obj
+            elif iseq:
+                for y in attr:
+                    if y.iseq(new_obj):
+                        found = True
+                        break
+            if not found:
+                attr.add(new_obj)
+                # later items see it only if it went into the scanned set
+                if by_id is not None and attr is siblings:
+                    new_id = getattr(new_obj, "id", None)
+                    if new_id:
+                        by_id.setdefault(new_id, new_obj)
+        else:
+            print("deserialize_json:error :  k=" + k + "; x=" + str(x))
+    setattr(obj, name, attr)
+
+
+def _merge_index(items) -> dict:
+    """{merge_key(): item} of a set of iseq objects."""
+    index = {}
+    for y in items:
+        index.setdefault(y.merge_key(), y)
+    return index
+
+
+def _id_index(klass, parent):
+    """
+    (siblings, {id: item}) over the parent set _add_class searches for an
+    object of `klass` with the same id; (None, None) when it searches none.
+    """
+    has_id, has_index, set_name = _info(klass)
+    if not has_id or has_index:
+        return None, None
+    siblings = getattr(parent, set_name, None)
+    if not isinstance(siblings, (set, list)):
+        return None, None
+    by_id = {}
+    for f in siblings:
+        fid = getattr(f, "id", None)
+        if fid:
+            by_id.setdefault(fid, f)
+    return siblings, by_id
+
+
+def _map_objects(obj, name, v, klass, k):
+    attr = peek(obj, name) or dict()
+    for k2, v2 in v.items():
+        # Support dict[str, set] (e.g., identifiers)
+        if klass is set:
+            if isinstance(v2, (list, tuple, set)):
+                attr[k2] = set(v2)
+            else:
+                attr[k2] = {v2}
+            continue
+        # Normal object/value path
+        new_obj = _add_class(klass, v2, obj)
+        if new_obj is not None:
+            attr[k2] = new_obj
+        else:
+            print("deserialize_json:error :   k=" + k + ";k2=" + str(k2) + "; v=" + str(v2) + "; klass=" + str(klass))
+    setattr(obj, name, attr)
+
+
+def _unknown(obj, name, v, arg, k):
+    print("Unknown JSON Value: Error: " + obj.__class__.__name__ + ":" + k)
+
+
+def _compile_field(klass, k: str) -> tuple:
+    """Decoder of JSON key `k` for `klass`, from the class annotations."""
+    # attribute name in annotations uses underscores
+    if k[:38] == _XML_NS:
+        name = k[38:].replace("-", "_")
+    else:
+        name = k.replace("-", "_")
+
+    ann = all_annotations(klass).get(name)
+    kn = str(ann)
+
+    if kn == "<class 'bool'>":
+        field = (name, _set_bool, None)
+    elif kn in ("<class 'str'>", "<class 'int'>", "<class 'float'>", "<class 'None'>"):
+        field = (name, _set_value, None)
+    elif kn == "<class 'set'>":
+        field = (name, _update_set, None)
+    elif kn == "<class 'list'>":
+        field = (name, _update_list, None)
+    elif kn == "<class 'dict'>":
+        field = (name, _update_dict, None)
+    elif kn.startswith("<class '"):
+        field = (name, _set_object, ann)
+    elif kn.startswith("set["):
+        if kn[4 : len(kn) - 1] in _PRIMITIVES:
+            field = (name, _update_set, None)
+        else:
+            field = (name, _add_objects, ann.__args__[0])
+    elif kn.startswith("dict[str,"):
+        field = (name, _map_objects, ann.__args__[1])
+    else:
+        field = (name, _unknown, None)
+    _decoders.setdefault(klass, {})[k] = field
+    return field
+
+
+def decoder(klass) -> dict:
+    """The compiled {JSON key: (attribute, handler, arg)} table of `klass`."""
+    table = _decoders.get(klass)
+    if table is None:
+        table = _decoders.setdefault(klass, {})
+    return table
+
+
+def _info(klass) -> tuple:
+    info = _class_info.get(klass)
+    if info is None:
+        ann = all_annotations(klass)
+        if klass.__name__ == "SourceReference":
+            set_name = "sources"
+        else:
+            set_name = klass.__name__.lower() + "s"
+        info = _class_info[klass] = (bool(ann.get("id")), bool(ann.get("_index")), set_name)
+    return info
+
+
 # ---------------------------------------------------------------------------
 # Helpers for deserialization
 # ---------------------------------------------------------------------------
-def _add_class(klass, data, parent):
+def _add_class(klass, data, parent, by_id: dict | None = None):
     """
     Create or reuse an instance of `klass` from the JSON `data`,
-    using annotations to determine id/index behavior.
+    using annotations to determine id/index behavior. `by_id` is an
+    _id_index() of the parent set, saving a scan of it.
     """
-    has_id = all_annotations(klass).get("id")
-    has_index = all_annotations(klass).get("_index") 
-    if klass.__name__ == "str":
+    if klass is str:
         return str(data)
+    has_id, has_index, set_name = _info(klass)
 
     if has_id and not has_index:
         obj = None
-        if klass.__name__ == "SourceReference":
-            set_name = "sources"
-        else:
-            set_name = klass.__name__.lower() + "s"
-        if hasattr(parent, set_name) and data.get("id"):
+        if by_id is not None:
+            obj = by_id.get(data.get("id"))
+        elif hasattr(parent, set_name) and data.get("id"):
             wanted = data.get("id")
             for f in getattr(parent, set_name):
                 if getattr(f, "id", None) == wanted:
@@ -144,113 +396,19 @@ def deserialize_json(obj, data, required: bool = False):
     if not data:
         return
 
-    if obj.__class__.__name__ == "str":
-        obj = data
+    klass = obj.__class__
+    if klass is str:
         return
 
-    if obj.__class__.__name__ == "set":
+    if klass is set:
         for v in data:
             obj.add(v)
         return
 
+    fields = decoder(klass)
     for k in data:
-        # attribute name in annotations uses underscores
-        if k[:38] == "{http://www.w3.org/XML/1998/namespace}":
-            attr_name = k[38:].replace("-", "_")
-        else:
-            attr_name = k.replace("-", "_")
-
-        ann = all_annotations(obj.__class__).get(attr_name)
-        kn = str(ann)
-
-        if kn == "<class 'bool'>":
-            if data[k] == "true":
-                setattr(obj, attr_name, True)
-            elif data[k] == "false":
-                setattr(obj, attr_name, False)
-            else:
-                setattr(obj, attr_name, data[k])
-
-        elif kn in ("<class 'bool'>", "<class 'str'>", "<class 'int'>", "<class 'float'>", "<class 'None'>"):
-            setattr(obj, attr_name, data[k])
-
-        elif kn == "<class 'set'>":
-            attr = getattr(obj, attr_name, None) or set()
-            # data[k] is expected to be an iterable of primitives
-            try:
-                attr.update(data[k])
-            except TypeError:
-                # be forgiving if a single primitive sneaks in
-                attr.add(data[k])
-            setattr(obj, attr_name, attr)
-
-        elif kn == "<class 'list'>":
-            attr = getattr(obj, attr_name, None) or list()
-            # preserve original behavior; some classes may override list semantics
-            attr.update(data[k])  # type: ignore[attr-defined]
-            setattr(obj, attr_name, attr)
-
-        elif kn == "<class 'dict'>":
-            attr = getattr(obj, attr_name, None) or dict()
-            attr.update(data[k])
-            setattr(obj, attr_name, attr)
-
-        elif kn.startswith("<class '"):
-            klass = ann
-            new_obj = _add_class(klass, data[k], obj)
-            if new_obj:
-                setattr(obj, attr_name, new_obj)
-            else:
-                print("deserialize_json:error : k=" + k + "; d[k]=" + str(data[k]))
-
-        elif kn.startswith("set["):
-            kn2 = kn[4 : len(kn) - 1]
-            if kn2 in ("bool", "str", "int", "float", "None"):
-                attr = getattr(obj, attr_name, None) or set()
-                try:
-                    attr.update(data[k])
-                except TypeError:
-                    attr.add(data[k])                
-                setattr(obj, attr_name, attr)
-            else:
-                attr = getattr(obj, attr_name, None) or set()
-                klass = ann.__args__[0]
-                for x in data[k]:
-                    new_obj = _add_class(klass, x, obj)
-                    if new_obj:
-                        found = False
-                        if hasattr(klass, "iseq"):
-                            for y in attr:
-                                if y.iseq(new_obj):
-                                    found = True
-                                    break
-                        if not found:
-                            attr.add(new_obj)
-                    else:
-                        print("deserialize_json:error :  k=" + k + "; x=" + str(x))
-                setattr(obj, attr_name, attr)
-
-        elif kn.startswith("dict[str,"):
-            klass = ann.__args__[1]
-            attr = getattr(obj, attr_name, None) or dict()
-            for k2, v in data[k].items():
-                # Support dict[str, set] (e.g., identifiers)
-                if klass is set:
-                    if isinstance(v, (list, tuple, set)):
-                        attr[k2] = set(v)
-                    else:
-                        attr[k2] = {v}
-                    continue
-                # Normal object/value path
-                new_obj = _add_class(klass, v, obj)
-                if new_obj is not None:
-                    attr[k2] = new_obj
-                else:
-                    print("deserialize_json:error :   k=" + k + ";k2=" + str(k2) + "; v=" + str(v) + "; klass=" + str(klass))
-            setattr(obj, attr_name, attr)        
-
-        else:
-            print("Unknown JSON Value: Error: " + obj.__class__.__name__ + ":" + k)
+        field = fields.get(k) or _compile_field(klass, k)
+        field[1](obj, field[0], data[k], field[2], k)
 
     # Post-process hook
     if not required:
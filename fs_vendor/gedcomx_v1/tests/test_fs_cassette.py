@@ -0,0 +1,45 @@
+import requests
+
+from gedcomx_v1.fs_cassette import Cassette, RECORD, REPLAY
+
+URL = "https://api.familysearch.org/platform/tree/persons/KWCB-QZT"
+ACCEPT = {"Accept": "application/x-gedcomx-v1+json"}
+
+
+def response(status, body=b"", **headers):
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers)
+    r._content = body
+    return r
+
+
+def test_recorded_304_only_answers_conditional_requests(tmp_path):
+    path = str(tmp_path / "c.jsonl.gz")
+    c = Cassette(path, RECORD)
+    c.record("GET", URL, dict(ACCEPT, **{"If-None-Match": '"1"'}), response(304), 0.01)
+    c.record(
+        "GET",
+        URL,
+        ACCEPT,
+        response(200, b'{"persons": []}', **{"Content-Encoding": "gzip", "Content-Length": "20"}),
+        0.01,
+    )
+    c.close()
+
+    c = Cassette(path, REPLAY)
+    r = c.play("GET", URL, ACCEPT)
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers and "Content-Length" not in r.headers
+    assert c.play("GET", URL, dict(ACCEPT, **{"If-None-Match": '"1"'})).status_code == 304
+    # any conditional GET of the URL gets the recorded 304
+    assert c.play("GET", URL, dict(ACCEPT, **{"If-Modified-Since": "x"})).status_code == 304
+
+
+def test_conditional_request_falls_back_to_full_response(tmp_path):
+    path = str(tmp_path / "c.jsonl.gz")
+    c = Cassette(path, RECORD)
+    c.record("GET", URL, ACCEPT, response(200, b"{}"), 0.01)
+    c.close()
+    c = Cassette(path, REPLAY)
+    assert c.play("GET", URL, dict(ACCEPT, **{"If-None-Match": '"1"'})).status_code == 200
@@ -0,0 +1,23 @@
+from gedcomx_v1.fs_metrics import endpoint_family
+
+
+def test_fsid_without_digit_is_an_id():
+    assert endpoint_family("GET", "https://api.familysearch.org/platform/tree/persons/KWCB-QZT") == (
+        "GET /platform/tree/persons/{id}"
+    )
+    assert endpoint_family("get", "/platform/tree/persons/KWCB-QZT/notes?x=1") == endpoint_family(
+        "GET", "/platform/tree/persons/KWCJ-RN4/notes"
+    )
+
+
+def test_path_words_are_kept():
+    assert endpoint_family("GET", "/platform/tree/child-and-parents-relationships/MMMM-MMM") == (
+        "GET /platform/tree/child-and-parents-relationships/{id}"
+    )
+    assert endpoint_family("HEAD", "/platform/places/description/12345") == "HEAD /platform/places/description/{id}"
+
+
+def test_versioned_routes_are_kept():
+    assert endpoint_family("POST", "https://ident.familysearch.org/cis-web/oauth2/v3/token") == (
+        "POST /cis-web/oauth2/v3/token"
+    )
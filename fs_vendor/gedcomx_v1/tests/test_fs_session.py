@@ -0,0 +1,152 @@
+import logging
+
+import requests
+from requests.adapters import BaseAdapter
+
+from gedcomx_v1.fs_session import FsSession
+from gedcomx_v1.fs_token import TokenStore
+from gedcomx_v1.fs_transport import API_HOST
+
+
+class ExpiringTokenAdapter(BaseAdapter):
+    """Answers 401 to the expired bearer, 200 to anything else; keeps every request."""
+
+    def __init__(self, expired: str):
+        super().__init__()
+        self.expired = expired
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        r = requests.Response()
+        r.request = request
+        r.url = request.url
+        if request.headers.get("Authorization") == "Bearer " + self.expired:
+            r.status_code = 401
+            r._content = b""
+        else:
+            r.status_code = 200
+            r._content = b'{"persons": []}'
+            r.headers["Content-Type"] = "application/x-gedcomx-v1+json"
+        return r
+
+    def close(self):
+        pass
+
+
+def resumed_session(tmp_path, new_token):
+    fs = FsSession("user", "secret", adaptive=False)
+    fs.token_store = TokenStore(str(tmp_path / "token.json"))
+    fs.token_store.save("expired", 3600, "user")
+    fs.access_token = "expired"
+    fs.logged = True
+    fs._token_resumed = True
+
+    def login():
+        fs.access_token = new_token
+        fs.logged = True
+
+    fs.login = login
+    adapter = ExpiringTokenAdapter("expired")
+    fs.session.mount(API_HOST, adapter)
+    return fs, adapter
+
+
+def test_401_retry_carries_new_token(tmp_path):
+    fs, adapter = resumed_session(tmp_path, "fresh")
+    r = fs.get_url("/platform/tree/persons/KWCB-QZT")
+    assert r.status_code == 200
+    assert [q.headers.get("Authorization") for q in adapter.sent] == ["Bearer expired", "Bearer fresh"]
+    assert fs.token_store.load("user") is None
+
+
+def test_401_retry_drops_stale_bearer(tmp_path):
+    # a browser login authenticates with cookies: the retry has no bearer at all
+    fs, adapter = resumed_session(tmp_path, None)
+    r = fs.get_url("/platform/tree/persons/KWCB-QZT")
+    assert r.status_code == 200
+    assert "Authorization" not in adapter.sent[-1].headers
+
+
+def test_401_post_retry_carries_new_token(tmp_path):
+    fs, adapter = resumed_session(tmp_path, "fresh")
+    r = fs.post_url("/platform/tree/persons/KWCB-QZT", {"persons": []})
+    assert r.status_code == 200
+    assert adapter.sent[-1].headers["Authorization"] == "Bearer fresh"
+
+
+class UnreachableAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        raise requests.exceptions.ConnectionError("unreachable")
+
+    def close(self):
+        pass
+
+
+def test_resume_offline_keeps_token(tmp_path, monkeypatch):
+    monkeypatch.setattr("gedcomx_v1.fs_session.Throttle.backoff", lambda *a, **k: None)
+    fs = FsSession("user", "secret", adaptive=False)
+    fs.token_store = TokenStore(str(tmp_path / "token.json"))
+    fs.token_store.save("stored", 3600, "user")
+    fs.session.mount(API_HOST, UnreachableAdapter())
+    assert not fs.resume()
+    assert fs.resume_pending
+    assert fs.token_store.load("user") == "stored"
+
+
+def test_resume_rejected_token_is_cleared(tmp_path):
+    fs = FsSession("user", "secret", adaptive=False)
+    fs.token_store = TokenStore(str(tmp_path / "token.json"))
+    fs.token_store.save("expired", 3600, "user")
+    fs.session.mount(API_HOST, ExpiringTokenAdapter("expired"))
+    assert not fs.resume()
+    assert not fs.resume_pending
+    assert fs.token_store.load("user") is None
+
+
+class ThrottlingAdapter(BaseAdapter):
+    """503 with Retry-After `throttled` times, then 200."""
+
+    def __init__(self, throttled: int):
+        super().__init__()
+        self.throttled = throttled
+
+    def send(self, request, **kwargs):
+        r = requests.Response()
+        r.request = request
+        r.url = request.url
+        if self.throttled:
+            self.throttled -= 1
+            r.status_code = 503
+            r.headers["Retry-After"] = "0"
+            r._content = b""
+        else:
+            r.status_code = 200
+            r._content = b"{}"
+        return r
+
+    def close(self):
+        pass
+
+
+def test_throttling_503_does_not_open_breaker(monkeypatch):
+    monkeypatch.setattr("gedcomx_v1.fs_session.Throttle.backoff", lambda *a, **k: None)
+    fs = FsSession(adaptive=False)
+    fs.logged = True
+    fs.session.mount(API_HOST, ThrottlingAdapter(fs.breaker.threshold + 1))
+    r = fs.get_url("/platform/tree/persons/KWCB-QZT")
+    assert r.status_code == 200
+    assert not fs.offline
+
+
+def test_verbose_lines_are_emitted(caplog):
+    package = logging.getLogger("gedcomx_v1")
+    level = package.level
+    package.setLevel(logging.WARNING)
+    try:
+        fs = FsSession(verbose=True)
+        with caplog.at_level(logging.NOTSET):
+            fs.write_log("Downloading: %s", "/platform/tree/persons/KWCB-QZT")
+        assert "Downloading: /platform/tree/persons/KWCB-QZT" in caplog.text
+    finally:
+        package.setLevel(level)
@@ -26,7 +26,7 @@ import xml.etree.ElementTree as ET
 
 from gedcomx_v1.gedcomx import Gedcomx
 from gedcomx_v1.json import deserialize_json, _add_class
-from gedcomx_v1._utilities import all_annotations
+from gedcomx_v1._utilities import all_annotations, peek
 from gedcomx_v1.dateformal import SimpleDate
 
 VERBOSE = False
@@ -311,7 +311,7 @@ def _emit_xml(el, obj):
     for a in dir(obj):
         if a.startswith("_"):
             continue
-        attr = getattr(obj, a)
+        attr = peek(obj, a)
         if callable(attr):
             continue
 
@@ -4,17 +4,34 @@ from __future__ import annotations
 from typing import Iterable, Set
 
 import asyncio
+import logging
 import email.utils
 import time
 
 import gedcomx_v1
 from gedcomx_v1.dateformal import DateFormal
+from gedcomx_v1.fs_async import run_sync
 
 from constants import MAX_PERSONS  
 
+logger = logging.getLogger(__name__)
+
 # Single session shared by all Tree instances
 _fs_session = None 
 
+# Persons per /platform/tree/persons?pids=... request (1 disables batching)
+PERSONS_BATCH_SIZE = 50
+
+# Server-side limits of the pedigree endpoints (generations per call)
+ANCESTRY_MAX_GENERATIONS = 8
+DESCENDANCY_MAX_GENERATIONS = 2
+
+# Person requests kept in flight by Tree.crawl()
+CRAWL_WINDOW = 32
+
+# Items per page asked of the memories endpoint (others use the server default)
+MEMORIES_PAGE_SIZE = 50
+
 
 class Tree(gedcomx_v1.Gedcomx):
     """
@@ -29,34 +46,81 @@ class Tree(gedcomx_v1.Gedcomx):
         self._getsources = True
         self._sources = dict()
         self._notes = []
+        self._forwarded: dict[str, str] = {}  # merged FSID -> surviving FSID
 
     # ---- Person loading ----------------------------------------------------
 
-    def add_person(self, fsid: str) -> None:
+    def add_person(
+        self,
+        fsid: str,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ) -> int | None:
         """
         Load a single person from FamilySearch into this Tree, cache headers.
+
+        If `etag`/`last_modified` are given the GET is conditional; a 304 means
+        the caller's cached copy is current and nothing is loaded.
+        A 301 (merged person) is followed to the surviving FSID, recorded in
+        `self._forwarded`.
+        Returns the HTTP status code, or None when nothing was fetched.
         """
         global _fs_session
         if not _fs_session:
-            return
+            return None
 
         url = f"/platform/tree/persons/{fsid}"
-        r = _fs_session.get_url(url)
-        if not r:
-            return
+        r = _fs_session.get_url(url, etag=etag, last_modified=last_modified)
+        status = self._ingest_person(fsid, url, r)
+        if status == 301:
+            new_fsid = self._note_forward(fsid, r)
+            if new_fsid:
+                return self.add_person(new_fsid)
+        return status
+
+    async def add_person_async(
+        self,
+        fsid: str,
+        etag: str | None = None,
+        last_modified: int | None = None,
+    ) -> int | None:
+        """Coroutine version of add_person() using the session's asyncio API."""
+        if not _fs_session:
+            return None
+
+        url = f"/platform/tree/persons/{fsid}"
+        r = await _fs_session.aio.get(url, etag=etag, last_modified=last_modified)
+        status = self._ingest_person(fsid, url, r)
+        if status == 301:
+            new_fsid = self._note_forward(fsid, r)
+            if new_fsid:
+                return await self.add_person_async(new_fsid)
+        return status
+
+    def _note_forward(self, fsid: str, r) -> str | None:
+        """Record a merged person's surviving FSID from a 301 response."""
+        new_fsid = r.headers.get("X-Entity-Forwarded-Id")
+        if not new_fsid or new_fsid == fsid:
+            return None
+        self._forwarded[fsid] = new_fsid
+        return new_fsid
+
+    def _ingest_person(self, fsid: str, url: str, r) -> int | None:
+        """Deserialize a person GET response into this Tree; return its status."""
+        if not r or r == "error":
+            return None
+        if r.status_code in (301, 304):
+            return r.status_code
 
         try:
-            data = r.json()
-        except Exception as e:
-            print("WARNING: corrupted response from %s, error: %s" % (url, e))
-            try:
-                print(r.content)
-            except Exception:
-                pass
+            data = gedcomx_v1.FsSession.response_json(r)
+        except ValueError as e:
+            logger.warning("corrupted response from %s, error: %s", url, e)
+            logger.debug("response body: %r", r.content)
             data = None
 
         if not data:
-            return
+            return r.status_code
 
         # Materialize into gedcomx_v1's global indices
         gedcomx_v1.deserialize_json(self, data)
@@ -64,7 +128,7 @@ class Tree(gedcomx_v1.Gedcomx):
         try:
             fs_person = gedcomx_v1.Person._index[fsid]
         except KeyError:
-            return
+            return r.status_code
 
         # Preserve server cache validators for smarter reloads downstream
         if "Last-Modified" in r.headers:
@@ -78,28 +142,315 @@ class Tree(gedcomx_v1.Gedcomx):
             fs_person._etag = r.headers["Etag"]
 
         self._persons[fsid] = fs_person
+        return r.status_code
 
-    def add_persons(self, fids: Iterable[str]) -> None:
+    def add_persons(self, fids: Iterable[str], validators: bool = False) -> None:
         """
         Concurrently add multiple individuals by FSID.
-        """
-
-        async def _load_many(loop, ids: Iterable[str]):
-            tasks = set()
-            for fid in ids:
-                if fid not in self._persons:
-                    tasks.add(loop.run_in_executor(None, self.add_person, fid))
-            for t in tasks:
-                await t
 
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(_load_many(loop, fids))
+        Requests are scheduled on the shared FS event loop (bounded by the
+        session's asyncio concurrency), so this works from any thread.
+        Persons loaded in batches get no `_etag`/`_last_modified` (see
+        add_persons_async); pass `validators=True` to fetch them one by one.
+        """
+        fids = set(fids)
+        todo = [fid for fid in fids if fid and fid not in self._persons]
+        if todo and _fs_session:
+            run_sync(self.add_persons_async(todo, validators))
 
         # Ensure local dict mirrors gedcomx_v1 index for these ids
         for fid in fids:
             if fid in gedcomx_v1.Person._index:
                 self._persons[fid] = gedcomx_v1.Person._index[fid]
 
+    async def add_persons_async(self, fids: Iterable[str], validators: bool = False) -> None:
+        """
+        Coroutine: load all `fids` not yet in this Tree.
+
+        Ids are fetched PERSONS_BATCH_SIZE at a time through the multi-person
+        endpoint; anything a batch did not return (errors, merged persons)
+        falls back to single concurrent requests.
+
+        The multi-person endpoint has one Etag/Last-Modified for the whole
+        batch, so batched persons carry no cache validators: conditional
+        refreshes of them start with a HEAD (see fs_compare). With
+        `validators=True` every person is fetched by a single GET instead.
+        """
+        todo = [fid for fid in set(fids) if fid and fid not in self._persons]
+        size = 1 if validators else max(1, PERSONS_BATCH_SIZE)
+        batches = [todo[i : i + size] for i in range(0, len(todo), size)]
+        singles = [b[0] for b in batches if len(b) == 1]
+        missing = await asyncio.gather(
+            *(self._add_batch_async(b) for b in batches if len(b) > 1)
+        )
+        for m in missing:
+            singles.extend(m)
+        await asyncio.gather(*(self.add_person_async(fid) for fid in singles))
+
+    async def _add_batch_async(self, fids: list[str]) -> list[str]:
+        """
+        Load `fids` with one ?pids= request; return the ids still missing.
+        The persons loaded here have no `_etag`/`_last_modified`.
+        """
+        url = "/platform/tree/persons?pids=" + ",".join(fids)
+        r = await _fs_session.aio.get(url)
+        data = None
+        if r and r != "error" and r.status_code == 200:
+            try:
+                data = gedcomx_v1.FsSession.response_json(r)
+            except ValueError as e:
+                logger.warning("corrupted response from %s, error: %s", url, e)
+        if not data:
+            return list(fids)
+
+        gedcomx_v1.deserialize_json(self, data)
+        returned = {p.get("id") for p in (data.get("persons") or [])}
+        for fid in fids:
+            # The batch Etag/Last-Modified are not per person: leave them unset.
+            if fid in returned and fid in gedcomx_v1.Person._index:
+                self._persons[fid] = gedcomx_v1.Person._index[fid]
+        return [fid for fid in fids if fid not in self._persons]
+
+    # ---- List endpoints (notes, sources, memories) --------------------------
+
+    def add_list(self, url: str, page_size: int | None = None, prepare=None) -> int:
+        """
+        Deserialize every page of a list endpoint into this Tree, one page at
+        a time (see FsSession.iter_pages). `prepare(data)` may clean each page
+        first. Returns the number of pages read.
+        """
+        if not _fs_session:
+            return 0
+        pages = 0
+        for data in _fs_session.iter_pages(url, page_size):
+            if prepare:
+                prepare(data)
+            gedcomx_v1.deserialize_json(self, data)
+            pages += 1
+        return pages
+
+    # ---- Pedigree crawls (ancestry / descendancy endpoints) -----------------
+
+    def add_ancestry(
+        self, fids: Set[str], generations: int, max_persons: int | None = None
+    ) -> Set[str]:
+        """
+        Load `generations` of ancestors of `fids` using the ancestry endpoint
+        (up to ANCESTRY_MAX_GENERATIONS per call), then fetch full details of
+        the new persons in batches. Return the set of new IDs.
+        With `max_persons`, the Tree stops growing at that many persons
+        (nearest generations first).
+        """
+        return self._add_pedigree("ancestry", fids, generations, max_persons)
+
+    def add_descendancy(
+        self, fids: Set[str], generations: int, max_persons: int | None = None
+    ) -> Set[str]:
+        """
+        Load `generations` of descendants of `fids` (plus the co-parents of
+        every non-leaf generation) using the descendancy endpoint, then fetch
+        full details of the new persons. Return the set of new IDs.
+        `max_persons` works as in add_ancestry().
+        """
+        return self._add_pedigree("descendancy", fids, generations, max_persons)
+
+    def _add_pedigree(
+        self, kind: str, fids: Set[str], generations: int, max_persons: int | None
+    ) -> Set[str]:
+        fids = set(filter(None, fids))
+        if not fids or generations < 1 or not _fs_session:
+            return set()
+        found, failed = run_sync(self._pedigree_async(kind, fids, generations))
+
+        # Roots the endpoint could not serve: walk them a generation at a time
+        expand = self.add_parents if kind == "ancestry" else self.add_children
+        for fid, left in failed:
+            self.add_persons({fid})
+            todo, done = {fid}, set()
+            for i in range(left):
+                if not todo:
+                    break
+                done |= todo
+                new = expand(todo) - done
+                for n in new:
+                    found.setdefault(n, generations - left + i + 1)
+                todo = new
+
+        new = [fid for fid in sorted(found, key=found.get) if fid not in fids]
+        if max_persons:
+            new = new[: max(0, max_persons - len(self._persons))]
+        self.add_persons(new)
+        return {fid for fid in new if fid in self._persons}
+
+    async def _pedigree_async(self, kind: str, roots: Set[str], generations: int):
+        """Return ({id: generation}, [(root, generations left)] for failed calls)."""
+        step_max = ANCESTRY_MAX_GENERATIONS if kind == "ancestry" else DESCENDANCY_MAX_GENERATIONS
+        found: dict[str, int] = {}
+        failed: list[tuple[str, int]] = []
+        frontier = set(roots)
+        depth = 0
+        while frontier and depth < generations:
+            step = min(step_max, generations - depth)
+            results = await asyncio.gather(
+                *(self._pedigree_call(kind, fid, step, depth, generations) for fid in frontier)
+            )
+            next_frontier: Set[str] = set()
+            for fid, res in zip(frontier, results):
+                if res is None:
+                    failed.append((fid, generations - depth))
+                    continue
+                members, edge = res
+                next_frontier |= edge - found.keys()
+                for pid, gen in members.items():
+                    if depth + gen < found.get(pid, generations + 1):
+                        found[pid] = depth + gen
+            frontier = next_frontier
+            depth += step
+        return found, failed
+
+    async def _pedigree_call(self, kind: str, fid: str, step: int, depth: int, total: int):
+        """
+        One ancestry/descendancy request rooted at `fid` (at absolute `depth`).
+        Returns ({member id: generation}, ids on the last generation) or None
+        on failure.
+        """
+        url = f"/platform/tree/{kind}?person={fid}&generations={step}"
+        data = await _fs_session.aio.get_json(url)
+        if not isinstance(data, dict) or not data.get("persons"):
+            return None
+        members: dict[str, int] = {}
+        edge: Set[str] = set()
+        for p in data["persons"]:
+            pid = p.get("id")
+            display = p.get("display") or {}
+            if not pid:
+                continue
+            if kind == "ancestry":
+                try:
+                    gen = int(str(display.get("ascendancyNumber")).split("-")[0]).bit_length() - 1
+                except ValueError:
+                    continue
+                members[pid] = gen
+                if gen == step:
+                    edge.add(pid)
+            else:
+                num = str(display.get("descendancyNumber") or "")
+                if not num:
+                    continue
+                gen = num.count(".")
+                if "-S" in num:
+                    # spouse: keep co-parents of generations that have children
+                    if depth + gen < total:
+                        members[pid] = gen + 1
+                    continue
+                members[pid] = gen
+                if gen == step:
+                    edge.add(pid)
+        return members, edge
+
+    # ---- Streaming crawl ----------------------------------------------------
+
+    def crawl(
+        self,
+        roots: Iterable[str],
+        asc: int = 0,
+        desc: int = 0,
+        max_persons: int | None = MAX_PERSONS,
+        window: int = CRAWL_WINDOW,
+    ) -> Set[str]:
+        """
+        Pipelined BFS over parents/children, see crawl_async().
+        Return the set of FSIDs loaded (roots included).
+        """
+        return run_sync(self.crawl_async(roots, asc, desc, max_persons, window))
+
+    async def crawl_async(
+        self,
+        roots: Iterable[str],
+        asc: int = 0,
+        desc: int = 0,
+        max_persons: int | None = MAX_PERSONS,
+        window: int = CRAWL_WINDOW,
+    ) -> Set[str]:
+        """
+        Load up to `asc` generations of ancestors and `desc` generations of
+        descendants (of the roots and of every ancestor), scheduling each
+        person's relatives as soon as that person arrives instead of waiting
+        for the whole generation.
+
+        At most `window` person requests are in flight, and no more than
+        `max_persons` persons are scheduled in total (None/0 = no budget).
+        """
+        sem = asyncio.Semaphore(max(1, window))
+        seen: Set[str] = set()
+        loaded: Set[str] = set()
+        tasks: Set[asyncio.Future] = set()
+
+        def schedule(fid: str, up: int, down: int) -> None:
+            if not fid or fid in seen:
+                return
+            if max_persons and len(seen) >= max_persons:
+                return
+            seen.add(fid)
+            tasks.add(asyncio.ensure_future(visit(fid, up, down)))
+
+        async def visit(fid: str, up: int, down: int) -> None:
+            if fid not in self._persons:
+                async with sem:
+                    await self.add_person_async(fid)
+            fid = self._forwarded.get(fid, fid)
+            p = self._persons.get(fid)
+            if p is None:
+                return
+            loaded.add(fid)
+            # ancestors keep climbing; anyone may branch down (old step 5
+            # also started from every ancestor)
+            if down == 0 and up < asc:
+                for pid in self._parent_ids(p):
+                    schedule(pid, up + 1, 0)
+            if down < desc:
+                for cid in self._child_ids(p):
+                    schedule(cid, up, down + 1)
+
+        for fid in roots:
+            schedule(fid, 0, 0)
+        while tasks:
+            done, _pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            tasks.difference_update(done)
+            for t in done:
+                t.result()
+        return loaded
+
+    @staticmethod
+    def _parent_ids(p: gedcomx_v1.Person) -> Set[str]:
+        ids: Set[str] = set()
+        for rel in getattr(p, "_parents", []) or []:
+            if rel.person1:
+                ids.add(rel.person1.resourceId)
+            if rel.person2:
+                ids.add(rel.person2.resourceId)
+        for cp in getattr(p, "_parentsCP", []) or []:
+            if cp.parent1:
+                ids.add(cp.parent1.resourceId)
+            if cp.parent2:
+                ids.add(cp.parent2.resourceId)
+        ids.discard(p.id)
+        ids.discard(None)
+        return ids
+
+    @staticmethod
+    def _child_ids(p: gedcomx_v1.Person) -> Set[str]:
+        """Children of `p` plus their other parent (as add_children loads)."""
+        ids: Set[str] = set()
+        for rel in getattr(p, "_children", []) or []:
+            if getattr(rel, "person1", None):
+                ids.add(rel.person1.resourceId)
+            if getattr(rel, "person2", None):
+                ids.add(rel.person2.resourceId)
+        ids.discard(p.id)
+        ids.discard(None)
+        return ids
+
     # ---- Relationship expansion -------------------------------------------
 
     def add_parents(self, fids: Set[str]) -> Set[str]:
@@ -108,17 +459,7 @@ class Tree(gedcomx_v1.Gedcomx):
         """
         rels: Set[str] = set()
         for fid in (fids & set(self._persons.keys())):
-            p = self._persons[fid]
-            for rel in getattr(p, "_parents", []) or []:
-                if rel.person1:
-                    rels.add(rel.person1.resourceId)
-                if rel.person2:
-                    rels.add(rel.person2.resourceId)
-            for cp in getattr(p, "_parentsCP", []) or []:
-                if cp.parent1:
-                    rels.add(cp.parent1.resourceId)
-                if cp.parent2:
-                    rels.add(cp.parent2.resourceId)
+            rels |= self._parent_ids(self._persons[fid])
 
         rels.difference_update(fids)
         self.add_persons(rels)
@@ -148,13 +489,7 @@ class Tree(gedcomx_v1.Gedcomx):
         """
         rels: Set[str] = set()
         for fid in (fids & set(self._persons.keys())):
-            p = self._persons[fid]
-            if getattr(p, "_children", None):
-                for rel in p._children:
-                    if getattr(rel, "person1", None):
-                        rels.add(rel.person1.resourceId)
-                    if getattr(rel, "person2", None):
-                        rels.add(rel.person2.resourceId)
+            rels |= self._child_ids(self._persons[fid])
 
         rels.difference_update(fids)
         self.add_persons(rels)